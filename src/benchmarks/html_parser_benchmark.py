@@ -0,0 +1,95 @@
+"""HTML 解析后端和按范围解析的基准测试
+
+对保存的页面分别测量每种提取需要的解析时间：
+- 整页 html.parser（原来的写法）
+- 整页 lxml（html_parser 的默认后端）
+- 按范围解析：标题（TITLE_SCOPE / selectolax）、特性描述单元格、技能描述表格、道具描述小节
+
+页面来自 debug/fixtures.json 中登记的 wiki 页面（debug/wiki/ 中的物种页面和录制的页面，见 utils.mock_server）
+和 cache/pages 中已下载的 wiki 页面（运行过任意爬虫后才有）；debug/*_response.html 是 Showdown 图鉴页的外壳，
+不是爬虫解析的页面，不参与测试。按来源分组输出每页平均耗时和相对原来写法的加速比。
+
+运行方式（项目根目录）:
+    PYTHONPATH=src python src/benchmarks/html_parser_benchmark.py
+"""
+import time
+
+from utils.html_parser import DEFAULT_BACKEND, TITLE_SCOPE, extract_title, parse_html, parse_section
+from utils.mock_server import FIXTURE_DIR, FixtureSet
+from utils.page_store import PageStore
+from scrapers.ability.ability_description_scraper import DESCRIPTION_SCOPE as ABILITY_SCOPE
+from scrapers.item.item_description_scraper import END_HEADLINES, START_HEADLINES
+from scrapers.move.move_description_scraper import DESCRIPTION_SCOPE as MOVE_SCOPE
+
+REPEAT = 5
+MAX_STORED_PAGES = 50
+
+
+def load_pages() -> dict:
+    """返回 {来源: [页面文本]}"""
+    groups = {}
+    fixtures = FixtureSet(FIXTURE_DIR)
+    wiki_pages = []
+    for key in sorted(fixtures.entries):
+        if not key.startswith('/wiki/'):
+            continue
+        entry, body = fixtures.get(key)
+        if entry.get('status', 200) == 200:
+            wiki_pages.append(body.decode('utf-8', errors='replace'))
+    if wiki_pages:
+        groups['debug/fixtures.json'] = wiki_pages
+    store = PageStore()
+    stored = []
+    for url in store.urls():
+        page = store.get(url)
+        if page is not None:
+            stored.append(page.text)
+        if len(stored) >= MAX_STORED_PAGES:
+            break
+    if stored:
+        groups['cache/pages'] = stored
+    return groups
+
+
+def best_time(func, pages) -> float:
+    """REPEAT 次中最快一次的每页平均耗时（秒）"""
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for text in pages:
+            func(text)
+        elapsed = (time.perf_counter() - start) / len(pages)
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+TASKS = [
+    ('整页 html.parser', lambda text: parse_html(text, backend='html.parser')),
+    (f'整页 {DEFAULT_BACKEND}', lambda text: parse_html(text)),
+    ('标题 (h1#firstHeading)', lambda text: parse_html(text, TITLE_SCOPE)),
+    ('标题 extract_title()', extract_title),
+    ('特性描述单元格', lambda text: parse_html(text, ABILITY_SCOPE)),
+    ('技能描述表格', lambda text: parse_html(text, MOVE_SCOPE)),
+    ('道具描述小节', lambda text: parse_section(text, START_HEADLINES, END_HEADLINES)),
+]
+
+
+def main():
+    groups = load_pages()
+    if not groups:
+        print("没有可用的页面：debug/fixtures.json 中没有 wiki 页面，cache/pages 为空")
+        return
+    print(f"默认后端: {DEFAULT_BACKEND}，每组取 {REPEAT} 次中最快的一次")
+    for source, pages in groups.items():
+        size_kb = sum(len(text.encode('utf-8')) for text in pages) / len(pages) / 1024
+        print(f"\n{source}: {len(pages)} 个页面，平均 {size_kb:.1f}KB")
+        print(f"{'提取':<24} {'每页耗时(ms)':>12} {'加速比':>8}")
+        baseline = None
+        for name, func in TASKS:
+            elapsed = best_time(func, pages)
+            baseline = baseline or elapsed
+            print(f"{name:<24} {elapsed * 1000:>12.2f} {baseline / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
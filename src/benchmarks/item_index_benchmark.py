@@ -0,0 +1,64 @@
+"""道具世代/编号索引的规模基准测试
+
+把 data/items.ts 的记录复制若干倍（改写ID和名称避免重复）生成合成数据，
+测量 解析 + 建立索引 的耗时，检查耗时是否随数据量线性增长。
+
+运行方式（项目根目录）:
+    PYTHONPATH=src python src/benchmarks/item_index_benchmark.py
+"""
+import re
+import time
+from pathlib import Path
+from utils import parse_ts_export
+from processors.item.item_gen_extractor import build_item_index
+
+SCALES = [1, 2, 5, 10]
+REPEAT = 3
+
+
+def make_synthetic_items(content: str, scale: int) -> str:
+    """把 export const Items = {...} 中的记录复制 scale 份"""
+    header_end = content.index('{') + 1
+    body_end = content.rindex('}')
+    header, body, footer = content[:header_end], content[header_end:body_end], content[body_end:]
+
+    copies = [body]
+    for i in range(1, scale):
+        copy = re.sub(r'^\t(\w+): \{', rf'\t\1x{i}: {{', body, flags=re.M)
+        copy = re.sub(r'^(\t\tname: "[^"]+)"', rf'\1 {i}"', copy, flags=re.M)
+        copies.append(copy)
+    return header + ''.join(copies) + footer
+
+
+def time_build(content: str) -> tuple:
+    """返回最快一次的耗时和索引条目数"""
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        gen_info, num_info = build_item_index(parse_ts_export(content))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(gen_info), len(num_info)
+
+
+def main():
+    content = Path('data/items.ts').read_text(encoding='utf-8')
+
+    print(f"{'倍数':>4} {'大小(KB)':>10} {'世代条目':>8} {'编号条目':>8} {'耗时(ms)':>10} {'每KB耗时(us)':>12}")
+    per_kb = {}
+    for scale in SCALES:
+        synthetic = make_synthetic_items(content, scale)
+        size_kb = len(synthetic.encode('utf-8')) / 1024
+        elapsed, gen_count, num_count = time_build(synthetic)
+        per_kb[scale] = elapsed / size_kb
+        print(f"{scale:>4} {size_kb:>10.0f} {gen_count:>8} {num_count:>8} "
+              f"{elapsed * 1000:>10.1f} {per_kb[scale] * 1e6:>12.1f}")
+
+    # 线性算法的每KB耗时应基本不变；二次算法在10倍数据下会接近10倍
+    growth = per_kb[SCALES[-1]] / per_kb[SCALES[0]]
+    print(f"\n{SCALES[-1]}倍数据的每KB耗时是1倍数据的 {growth:.2f} 倍")
+    print("结论: " + ("线性增长" if growth < 1.5 else "超线性增长，请检查算法"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""宝可梦记录字段提取的正则微基准
+
+先把 data/pokedex.ts 切分成记录块，再对每条记录提取编号、名称、属性、种族值、
+身高体重和特性，只统计字段提取的耗时，比较:
+
+- 内联: 原 parse_pokemon_data 的写法，循环内用字符串字面量调用 re.search，
+  每个能力值用 rf'{stat}:...' 重新构造模式
+- 注册表: 同样的模式在 PATTERNS 中预编译一次，循环内直接调用；
+  另外开启计时再跑一次，给出计时本身的开销和每个模式的统计
+- 解析器: 现在处理器使用的 parse_ts_export + build_models（含切分，仅供参考）
+
+运行方式（项目根目录）:
+    PYTHONPATH=src python src/benchmarks/pattern_benchmark.py
+"""
+import re
+import time
+from pathlib import Path
+from utils import parse_ts_export
+from utils.models import STAT_NAMES, Species, build_models
+from utils.patterns import PATTERNS
+
+REPEAT = 5
+
+RECORD_BLOCK = PATTERNS.register('bench.record_block', r'(\w+):\s*{((?:[^{}]|{[^{}]*})*)}')
+NUM = PATTERNS.register('bench.num', r'num:\s*([-\d]+)')
+NAME = PATTERNS.register('bench.name', r'name:\s*"([^"]+)"')
+TYPES = PATTERNS.register('bench.types', r'types:\s*\[(.*?)\]')
+BASE_STATS = PATTERNS.register('bench.base_stats', r'baseStats:\s*{([^}]+)}')
+STATS = {stat: PATTERNS.register(f'bench.stat.{stat}', rf'{stat}:\s*(\d+)') for stat in STAT_NAMES}
+HEIGHT = PATTERNS.register('bench.height', r'heightm:\s*([\d.]+)')
+WEIGHT = PATTERNS.register('bench.weight', r'weightkg:\s*([\d.]+)')
+ABILITIES = PATTERNS.register('bench.abilities', r'abilities:\s*{([^}]+)}')
+ABILITY_PAIR = PATTERNS.register('bench.ability_pair', r'(\w+):\s*"([^"]+)"')
+
+
+def split_blocks(content: str) -> list:
+    """按原 parse_pokemon_data 的方式切分记录块"""
+    return [match.group(2) for match in RECORD_BLOCK.finditer(content)]
+
+
+def extract_inline(blocks: list) -> list:
+    """原写法：字符串字面量和 f-string 模式"""
+    rows = []
+    for block in blocks:
+        num_match = re.search(r'num:\s*([-\d]+)', block)
+        if not num_match:
+            continue
+        row = {'id': num_match.group(1)}
+        name_match = re.search(r'name:\s*"([^"]+)"', block)
+        if name_match:
+            row['name_en'] = name_match.group(1)
+        types_match = re.search(r'types:\s*\[(.*?)\]', block)
+        if types_match:
+            row['types_en'] = ', '.join(t.strip(' "\'') for t in types_match.group(1).split(','))
+        stats_match = re.search(r'baseStats:\s*{([^}]+)}', block)
+        if stats_match:
+            for stat in STAT_NAMES:
+                stat_match = re.search(rf'{stat}:\s*(\d+)', stats_match.group(1))
+                if stat_match:
+                    row[stat] = int(stat_match.group(1))
+        height_match = re.search(r'heightm:\s*([\d.]+)', block)
+        if height_match:
+            row['height'] = float(height_match.group(1))
+        weight_match = re.search(r'weightkg:\s*([\d.]+)', block)
+        if weight_match:
+            row['weight'] = float(weight_match.group(1))
+        abilities_match = re.search(r'abilities:\s*{([^}]+)}', block)
+        if abilities_match:
+            pairs = re.findall(r'(\w+):\s*"([^"]+)"', abilities_match.group(1))
+            row['abilities_en'] = ', '.join(f"{k}:{v}" for k, v in pairs)
+        rows.append(row)
+    return rows
+
+
+def extract_registry(blocks: list) -> list:
+    """注册表写法：同样的模式，预编译一次"""
+    rows = []
+    for block in blocks:
+        num_match = NUM.search(block)
+        if not num_match:
+            continue
+        row = {'id': num_match.group(1)}
+        name_match = NAME.search(block)
+        if name_match:
+            row['name_en'] = name_match.group(1)
+        types_match = TYPES.search(block)
+        if types_match:
+            row['types_en'] = ', '.join(t.strip(' "\'') for t in types_match.group(1).split(','))
+        stats_match = BASE_STATS.search(block)
+        if stats_match:
+            for stat, pattern in STATS.items():
+                stat_match = pattern.search(stats_match.group(1))
+                if stat_match:
+                    row[stat] = int(stat_match.group(1))
+        height_match = HEIGHT.search(block)
+        if height_match:
+            row['height'] = float(height_match.group(1))
+        weight_match = WEIGHT.search(block)
+        if weight_match:
+            row['weight'] = float(weight_match.group(1))
+        abilities_match = ABILITIES.search(block)
+        if abilities_match:
+            pairs = ABILITY_PAIR.findall(abilities_match.group(1))
+            row['abilities_en'] = ', '.join(f"{k}:{v}" for k, v in pairs)
+        rows.append(row)
+    return rows
+
+
+def extract_parser(content: str) -> list:
+    """现在的写法：解析器 + Species 模型"""
+    return build_models(Species, parse_ts_export(content))
+
+
+def best_time(func, data) -> tuple:
+    """返回最快一次的耗时和记录数"""
+    best, count = None, 0
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        count = len(func(data))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, count
+
+
+def main():
+    content = Path('data/pokedex.ts').read_text(encoding='utf-8')
+    blocks = split_blocks(content)
+
+    print(f"{'写法':<10} {'记录数':>8} {'总耗时(ms)':>12} {'每条记录(us)':>14}")
+    results = {}
+    PATTERNS.set_timing(False)
+    cases = (('内联', extract_inline, blocks), ('注册表', extract_registry, blocks),
+             ('解析器', extract_parser, content))
+    for label, func, data in cases:
+        elapsed, count = best_time(func, data)
+        results[label] = elapsed / count
+        print(f"{label:<10} {count:>8} {elapsed * 1000:>12.1f} {results[label] * 1e6:>14.2f}")
+
+    # 开启计时再跑一次注册表写法，得到每个模式的统计
+    PATTERNS.reset()
+    PATTERNS.set_timing(True)
+    elapsed, count = best_time(extract_registry, blocks)
+    PATTERNS.set_timing(False)
+    print(f"{'注册表+计时':<10} {count:>8} {elapsed * 1000:>12.1f} {elapsed / count * 1e6:>14.2f}")
+
+    print(f"\n注册表相对内联: 每条记录耗时为 {results['注册表'] / results['内联']:.2f} 倍")
+    print()
+    PATTERNS.report()
+
+
+if __name__ == "__main__":
+    main()
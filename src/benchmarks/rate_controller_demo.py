@@ -0,0 +1,142 @@
+"""自适应限速演示
+
+在本地启动一个承载能力有限的 HTTP 服务（workers 个处理线程，每个请求耗时 service_time，
+排队超过 max_queue 时直接返回 503），然后用多个线程通过 HttpClient 持续请求:
+
+- 固定间隔: 原来爬虫的写法，每个请求之后 time.sleep(1)
+- 自适应: HttpClient + AdaptiveHostLimiter，从 1 个请求/秒开始
+
+每秒输出一次控制器的速率和实际吞吐量，最后与服务器的理论承载能力比较。
+
+运行方式（项目根目录）:
+    PYTHONPATH=src python src/benchmarks/rate_controller_demo.py
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils import AdaptiveHostLimiter, HttpClient
+
+WORKERS = 4
+SERVICE_TIME = 0.05
+MAX_QUEUE = 16
+CLIENT_THREADS = 16
+DURATION = 15
+FIXED_DURATION = 5
+
+
+class LimitedCapacityServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), LimitedCapacityHandler)
+        self.slots = threading.Semaphore(WORKERS)
+        self.in_system = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/"
+
+
+class LimitedCapacityHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            overloaded = server.in_system >= WORKERS + MAX_QUEUE
+            if not overloaded:
+                server.in_system += 1
+        if overloaded:
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        try:
+            with server.slots:
+                time.sleep(SERVICE_TIME)
+        finally:
+            with server.lock:
+                server.in_system -= 1
+        body = b'ok'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run_clients(url: str, duration: float, request_once) -> dict:
+    """多个线程在 duration 秒内循环调用 request_once，返回每秒完成数和状态码统计"""
+    deadline = time.monotonic() + duration
+    start = time.monotonic()
+    per_second = [0] * (int(duration) + 1)
+    statuses = {}
+    lock = threading.Lock()
+
+    def worker():
+        while time.monotonic() < deadline:
+            status = request_once(url)
+            with lock:
+                statuses[status] = statuses.get(status, 0) + 1
+                if status == 200:
+                    per_second[min(int(time.monotonic() - start), len(per_second) - 1)] += 1
+
+    threads = [threading.Thread(target=worker) for _ in range(CLIENT_THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {'per_second': per_second[:int(duration)], 'statuses': statuses}
+
+
+def main():
+    server = LimitedCapacityServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    capacity = WORKERS / SERVICE_TIME
+    print(f"服务器: {WORKERS} 个处理线程，每个请求 {SERVICE_TIME * 1000:.0f}ms，理论承载 {capacity:.0f} 请求/秒")
+
+    # 固定间隔: 不限速的客户端 + 每次请求后 sleep(1)
+    fixed_client = HttpClient(pool_size=CLIENT_THREADS, limiter=None, max_retries=0)
+
+    def fixed_request(url):
+        status = fixed_client.get(url).status_code
+        time.sleep(1)
+        return status
+
+    fixed = run_clients(server.base_url, FIXED_DURATION, fixed_request)
+    fixed_rate = sum(fixed['per_second']) / FIXED_DURATION
+    print(f"\n固定间隔 sleep(1)，{CLIENT_THREADS} 个线程: {fixed_rate:.1f} 请求/秒")
+
+    limiter = AdaptiveHostLimiter(initial_rate=1.0, max_rate=capacity * 4)
+    adaptive_client = HttpClient(pool_size=CLIENT_THREADS, limiter=limiter, max_retries=0)
+    host = server.base_url.split('/')[2]
+    rates = []
+    stop = threading.Event()
+
+    def sample_rate():
+        while not stop.wait(1.0):
+            rates.append(limiter.metrics()[host]['rate'])
+
+    sampler = threading.Thread(target=sample_rate, daemon=True)
+    sampler.start()
+    adaptive = run_clients(server.base_url, DURATION, lambda url: adaptive_client.get(url).status_code)
+    stop.set()
+
+    print(f"\n自适应（从 1 请求/秒开始），{CLIENT_THREADS} 个线程:")
+    print(f"{'秒':>4} {'控制器速率':>10} {'完成数':>8}")
+    for second, done in enumerate(adaptive['per_second']):
+        rate = rates[second] if second < len(rates) else rates[-1]
+        print(f"{second + 1:>4} {rate:>10.1f} {done:>8}")
+    tail = adaptive['per_second'][DURATION // 3:]
+    steady = sum(tail) / len(tail)
+    print(f"\n状态码: {adaptive['statuses']}")
+    print(f"稳定后吞吐量 {steady:.1f} 请求/秒，为理论承载的 {steady / capacity:.0%}，"
+          f"是固定间隔的 {steady / fixed_rate:.1f} 倍")
+    print(f"控制器指标: {limiter.metrics()[host]}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,77 +1,67 @@
-import re
-import json
-import time
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
 from pathlib import Path
 from tqdm import tqdm
-from typing import Dict, List
+from typing import Dict, Iterable, List
 from openpyxl import Workbook
 from openpyxl.utils import get_column_letter
+from utils import HttpClient, load_ts_dataset
+from utils.models import Ability, build_models
+from utils.page_fetcher import shared_page_fetcher
+from utils.tiered_cache import open_tiered_cache
+from utils.wiki_title_resolver import WikiTitleResolver, fetch_page_titles
 
 class AbilityProcessor:
     def __init__(self):
-        self.ability_cache_file = Path('json/ability_translations.json')
-        self.ability_cache = self._load_cache()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-
-    def _load_cache(self) -> dict:
-        """加载特性翻译缓存"""
-        if self.ability_cache_file.exists():
-            return json.loads(self.ability_cache_file.read_text(encoding='utf-8'))
-        return {}
+        self.ability_cache = open_tiered_cache('ability_translations')
+        self.session = HttpClient()
+        self.title_resolver = WikiTitleResolver(session=self.session)
+        self.pages = shared_page_fetcher()
 
     def _save_cache(self):
-        """保存特性翻译缓存"""
-        self.ability_cache_file.write_text(
-            json.dumps(self.ability_cache, ensure_ascii=False, indent=2),
-            encoding='utf-8'
-        )
+        """提交特性翻译缓存，并导出到 json/ability_translations.json"""
+        self.ability_cache.export_json()
+        print(self.ability_cache.report())
 
     def _get_ability_translation(self, ability_en: str) -> str:
         """获取特性的中文翻译"""
-        if ability_en in self.ability_cache:
-            return self.ability_cache[ability_en]
+        found, ability_cn = self.ability_cache.lookup(ability_en)
+        if found:
+            return ability_cn or ability_en
 
         try:
-            url = f"https://wiki.52poke.com/wiki/{ability_en}"
-            response = self.session.get(url, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            title = soup.find('h1', {'id': 'firstHeading'})
+            # 与描述爬虫读取的是同一个页面，经 cache/pages 共用
+            title = self.pages.wiki_page(ability_en).title
             if title:
-                ability_cn = title.text.split('（')[0].strip()
+                ability_cn = title.split('（')[0].strip()
                 self.ability_cache[ability_en] = ability_cn
-                self._save_cache()
                 return ability_cn
-            time.sleep(1)
+            # 页面不存在或没有标题，写入负缓存
+            self.ability_cache.mark_missing(ability_en)
         except Exception as e:
             print(f"获取特性翻译失败 {ability_en}: {e}")
         return ability_en
 
-    def parse_ability_data(self, content: str) -> List[Dict]:
+    def prefetch_translations(self, names: Iterable[str]):
+        """用 MediaWiki API 批量获取缓存中没有的特性翻译，剩下的用流水线逐页查询"""
+        names = list(names)
+        self.title_resolver.fill_cache(self.ability_cache, names)
+        fetch_page_titles(self.ability_cache, self.pages, names,
+                          clean=lambda title: title.split('（')[0].strip(), desc="查询特性翻译")
+
+    def parse_ability_data(self, records: Dict[str, Dict]) -> List[Dict]:
         """解析特性数据"""
         abilities = []
-        
-        # 匹配 flags 后面的简单数据部分
-        pattern = r'flags:\s*{[^}]*},\s*name:\s*"([^"]+)",\s*rating:\s*([\d.]+),\s*num:\s*([-\d]+)'
-        matches = list(re.finditer(pattern, content))
 
         print("解析特性数据...")
-        for match in tqdm(matches, desc="处理特性"):
+        ability_models = build_models(Ability, records)
+        self.prefetch_translations(ability.name for ability in ability_models)
+        for ability in tqdm(ability_models, desc="处理特性"):
             try:
-                name = match.group(1)
-                rating = float(match.group(2))
-                num = int(match.group(3))
-                
                 ability_data = {
-                    'name_en': name,
-                    'name_cn': self._get_ability_translation(name),
-                    'rating': rating,
-                    'num': num
+                    'name_en': ability.name,
+                    'name_cn': self._get_ability_translation(ability.name),
+                    'rating': ability.rating,
+                    'num': ability.num
                 }
                 abilities.append(ability_data)
 
@@ -79,16 +69,16 @@ class AbilityProcessor:
                 print(f"解析错误: {e}")
                 continue
 
+        self._save_cache()
         return abilities
 
     def process_data(self, input_file: str, output_file: str):
         """处理数据主函数"""
         print("读取数据文件...")
-        with open(input_file, 'r', encoding='utf-8') as file:
-            content = file.read()
+        records = load_ts_dataset(input_file)
 
         # 解析数据
-        abilities = self.parse_ability_data(content)
+        abilities = self.parse_ability_data(records)
         df = pd.DataFrame(abilities)
 
         # 重命名列
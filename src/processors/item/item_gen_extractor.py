@@ -1,91 +1,67 @@
-import re
+import sys
 import pandas as pd
-from tqdm import tqdm
 from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
 from openpyxl import load_workbook
 from openpyxl.utils import get_column_letter
+from utils import load_ts_dataset
+from utils.dataset_diff import load_changed_names
+
+
+def build_item_index(records: Dict[str, Dict]) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """一次顺序遍历道具记录，同时建立 名称->世代 和 名称->编号 索引"""
+    gen_info = {}
+    num_info = {}
+    for record in records.values():
+        item_name = record.get('name')
+        if not item_name:
+            continue
+        gen = record.get('gen')
+        if gen is not None:
+            gen_info[item_name] = int(gen)
+        num = record.get('num')
+        if num is not None:
+            num_info[item_name] = int(num)
+    return gen_info, num_info
+
 
 class ItemGenExtractor:
     def __init__(self):
         self.data_file = Path('data/items.ts')
         self.excel_file = Path('output/item_data.xlsx')
         
-    def _extract_gen_info(self) -> dict:
-        """从items.ts文件中提取道具的世代信息"""
-        gen_info = {}
+    def _extract_gen_info(self) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """从items.ts文件中提取道具的世代信息和编号"""
         try:
             print("读取数据文件...")
-            with open(self.data_file, 'r', encoding='utf-8') as file:
-                content = file.read()
+            records = load_ts_dataset(self.data_file)
             
-            # 移除 export const Items 声明
-            content = re.sub(r'^export\s+const\s+Items\s*:\s*[^=]+=\s*', '', content.strip())
-            content = content.rstrip(';')
+            print(f"找到 {len(records)} 个可能的道具数据")
+            gen_info, num_info = build_item_index(records)
             
-            # 从后往前匹配
-            # 先找到每个道具的结尾部分（包含gen和num的部分）
-            end_pattern = r'gen:\s*(\d+)[^}]*?},'
-            end_matches = list(re.finditer(end_pattern, content))
-            
-            print(f"找到 {len(end_matches)} 个可能的道具数据")
-            
-            for match in tqdm(end_matches, desc="处理道具"):
-                # 从这个位置向前查找最近的name字段
-                end_pos = match.end()
-                gen = match.group(1)
-                
-                # 在当前位置之前的内容中查找最近的name字段
-                prev_content = content[:end_pos]
-                name_match = list(re.finditer(r'name:\s*"([^"]+)"', prev_content))
-                
-                if name_match:
-                    # 取最后一个匹配（最近的name）
-                    last_name_match = name_match[-1]
-                    item_name = last_name_match.group(1)
-                    # if len(name_match) > 1:
-                    #     print(f"警告: 找到多个name字段 ({len(name_match)}个)")
-                    #     for i, m in enumerate(name_match):
-                    #         print(f"  {i+1}: {m.group(1)}")
-                    
-                    # 查找道具ID
-                    id_section = prev_content[max(0, last_name_match.start() - 100):last_name_match.start()]
-                    id_match = re.search(r'(\w+):\s*{[^{]*$', id_section)
-                    item_id = id_match.group(1) if id_match else "unknown"
-                    
-                    # 查找编号
-                    num_match = re.search(r'num:\s*(\d+)', match.group(0))
-                    
-                    gen_info[item_name] = int(gen)
-                    print(f"成功: {item_name} (ID: {item_id}) - 世代 {gen}")
-                    if num_match:
-                        print(f"道具编号: {num_match.group(1)}")
-            
-            print(f"\n成功提取了 {len(gen_info)} 个道具的世代信息")
+            print(f"\n成功提取了 {len(gen_info)} 个道具的世代信息, {len(num_info)} 个道具的编号")
             if gen_info:
                 print("\n示例数据:")
                 sample_items = list(gen_info.items())[:5]
                 for item, gen in sample_items:
-                    print(f"{item}: 世代 {gen}")
+                    print(f"{item}: 世代 {gen}, 编号 {num_info.get(item)}")
                     
-            return gen_info
+            return gen_info, num_info
             
         except Exception as e:
             print(f"提取世代信息失败: {e}")
             import traceback
             print(traceback.format_exc())
-            return {}
+            return {}, {}
     
-    def update_excel_with_gen(self):
-        """更新Excel文件，添加世代信息和编号"""
+    def update_excel_with_gen(self, only_names: Optional[Set[str]] = None):
+        """更新Excel文件，添加世代信息和编号
+
+        only_names 不为空时只更新这些名称的行（如数据文件更新后新增或变化的道具），其他行保持不变。
+        """
         try:
-            print("读取世代信息...")
-            gen_info = self._extract_gen_info()
-            
-            # 创建编号信息字典
-            num_info = {}
-            for match in re.finditer(r'name:\s*"([^"]+)".*?(?<!sprite)num:\s*(\d+)', self.data_file.read_text(encoding='utf-8'), re.DOTALL):
-                item_name, num = match.groups()
-                num_info[item_name] = int(num)
+            print("读取世代信息和编号...")
+            gen_info, num_info = self._extract_gen_info()
             
             print("读取Excel文件...")
             wb = load_workbook(self.excel_file)
@@ -128,7 +104,7 @@ class ItemGenExtractor:
             print("更新世代信息和编号...")
             for row in range(2, ws.max_row + 1):
                 item_name = ws.cell(row=row, column=name_en_col).value
-                if item_name:
+                if item_name and (only_names is None or item_name in only_names):
                     # 更新世代
                     if item_name in gen_info:
                         ws.cell(row=row, column=gen_col, value=gen_info[item_name])
@@ -146,7 +122,11 @@ class ItemGenExtractor:
 
 def main():
     extractor = ItemGenExtractor()
-    extractor.update_excel_with_gen()
+    # --changed-only: 只处理 utils.dataset_diff 记录的新增和变化的道具
+    only_names = load_changed_names('items') if '--changed-only' in sys.argv else None
+    if only_names is not None:
+        print(f"只更新 {len(only_names)} 个新增或变化的道具")
+    extractor.update_excel_with_gen(only_names)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
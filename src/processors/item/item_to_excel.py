@@ -1,103 +1,85 @@
-import re
-import json
-import time
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
 from pathlib import Path
 from tqdm import tqdm
-from typing import Dict, List
+from typing import Dict, Iterable, List
 from openpyxl import Workbook
 from openpyxl.utils import get_column_letter
+from utils import HttpClient, load_ts_dataset
+from utils.models import Item, build_models
+from utils.page_fetcher import shared_page_fetcher
+from utils.tiered_cache import open_tiered_cache
+from utils.wiki_title_resolver import WikiTitleResolver, fetch_page_titles
 
 class ItemProcessor:
     def __init__(self):
-        self.item_cache_file = Path('json/item_translations.json')
-        self.item_cache = self._load_cache()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-
-    def _load_cache(self) -> dict:
-        """加载道具翻译缓存"""
-        if self.item_cache_file.exists():
-            return json.loads(self.item_cache_file.read_text(encoding='utf-8'))
-        return {}
+        self.item_cache = open_tiered_cache('item_translations')
+        self.session = HttpClient()
+        self.title_resolver = WikiTitleResolver(session=self.session)
+        self.pages = shared_page_fetcher()
 
     def _save_cache(self):
-        """保存道具翻译缓存"""
-        self.item_cache_file.parent.mkdir(exist_ok=True)
-        self.item_cache_file.write_text(
-            json.dumps(self.item_cache, ensure_ascii=False, indent=2),
-            encoding='utf-8'
-        )
+        """提交道具翻译缓存，并导出到 json/item_translations.json"""
+        self.item_cache.export_json()
+        print(self.item_cache.report())
 
     def _get_item_translation(self, item_en: str) -> str:
         """获取道具的中文翻译"""
-        if item_en in self.item_cache:
-            return self.item_cache[item_en]
+        found, item_cn = self.item_cache.lookup(item_en)
+        if found:
+            return item_cn or item_en
 
         try:
-            url = f"https://wiki.52poke.com/wiki/{item_en}"
-            response = self.session.get(url, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            title = soup.find('h1', {'id': 'firstHeading'})
+            # 与描述爬虫读取的是同一个页面，经 cache/pages 共用
+            title = self.pages.wiki_page(item_en).title
             if title:
-                item_cn = title.text.split('（')[0].strip()
+                item_cn = title.split('（')[0].strip()
                 self.item_cache[item_en] = item_cn
-                self._save_cache()
                 return item_cn
-            time.sleep(1)
+            # 页面不存在或没有标题，写入负缓存
+            self.item_cache.mark_missing(item_en)
         except Exception as e:
             print(f"获取道具翻译失败 {item_en}: {e}")
         return item_en
 
-    def parse_item_data(self, content: str) -> List[Dict]:
+    def prefetch_translations(self, names: Iterable[str]):
+        """用 MediaWiki API 批量获取缓存中没有的道具翻译，剩下的用流水线逐页查询"""
+        names = list(names)
+        self.title_resolver.fill_cache(self.item_cache, names)
+        fetch_page_titles(self.item_cache, self.pages, names,
+                          clean=lambda title: title.split('（')[0].strip(), desc="查询道具翻译")
+
+    def parse_item_data(self, records: Dict[str, Dict]) -> List[Dict]:
         """解析道具数据"""
         items = []
-        
-        # 使用正则表达式匹配每个道具对象
-        pattern = r'(\w+):\s*{([^}]+)}'
-        matches = list(re.finditer(pattern, content))
 
         print("解析道具数据...")
-        for match in tqdm(matches, desc="处理道具"):
+        # 只处理有名称的道具
+        item_models = build_models(Item, records)
+        self.prefetch_translations(item.name for item in item_models)
+        for item in tqdm(item_models, desc="处理道具"):
             try:
-                item_id = match.group(1)
-                data_block = match.group(2)
-                
-                # 提取所需字段
-                name_match = re.search(r'name:\s*"([^"]+)"', data_block)
-                num_match = re.search(r'num:\s*(\d+)', data_block)
-                spritenum_match = re.search(r'spritenum:\s*(\d+)', data_block)
-                
-                if name_match:  # 只处理有名称的道具
-                    item_data = {
-                        'name_en': name_match.group(1),
-                        'name_cn': self._get_item_translation(name_match.group(1)),
-                        'num': int(num_match.group(1)) if num_match else None,
-                        'spritenum': int(spritenum_match.group(1)) if spritenum_match else None
-                    }
-                    
-                    # 获取中文翻译
-
-                    items.append(item_data)
+                item_data = {
+                    'name_en': item.name,
+                    'name_cn': self._get_item_translation(item.name),
+                    'num': item.num,
+                    'spritenum': item.spritenum
+                }
+                items.append(item_data)
 
             except Exception as e:
                 print(f"解析错误: {e}")
                 continue
 
+        self._save_cache()
         return items
 
     def process_data(self, input_file: str, output_file: str):
         """处理数据主函数"""
         print("读取数据文件...")
-        with open(input_file, 'r', encoding='utf-8') as file:
-            content = file.read()
+        records = load_ts_dataset(input_file)
 
         # 解析数据
-        items = self.parse_item_data(content)
+        items = self.parse_item_data(records)
         df = pd.DataFrame(items)
 
         # 重命名列
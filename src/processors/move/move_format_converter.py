@@ -1,8 +1,8 @@
 import pandas as pd
 import json
-import re
 from pathlib import Path
 from tqdm import tqdm
+from utils.patterns import BRACKETED, PARENTHESIZED
 
 class MoveFormatConverter:
     def __init__(self):
@@ -47,8 +47,7 @@ class MoveFormatConverter:
             result = {"init": [], "levels": {}}
             
             # 使用正则表达式匹配括号内的内容
-            initial_moves = re.search(r'\((.*?)\)', move_text)
-            level_pattern = r'\[(.*?)\]'  # 匹配 [L3:Vine Whip]
+            initial_moves = PARENTHESIZED.search(move_text)
             
             # 处理初始技能
             if initial_moves:
@@ -56,7 +55,7 @@ class MoveFormatConverter:
                 result["init"] = [move.strip() for move in init_moves]
             
             # 处理等级技能
-            level_matches = re.findall(level_pattern, move_text)
+            level_matches = BRACKETED.findall(move_text)  # 匹配 [L3:Vine Whip]
             for level_move in level_matches:
                 level_move = level_move.strip()
                 if ':' in level_move:
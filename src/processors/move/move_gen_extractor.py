@@ -1,9 +1,12 @@
 import json
+import sys
 import pandas as pd
 from tqdm import tqdm
 from pathlib import Path
 from openpyxl import load_workbook
 from openpyxl.utils import get_column_letter
+from typing import Optional, Set
+from utils.dataset_diff import load_changed_names
 
 class MoveGenExtractor:
     def __init__(self):
@@ -21,8 +24,11 @@ class MoveGenExtractor:
                 return int(gen)  # 返回世代数字
 
         return None  # 如果没有找到，返回 None
-    def update_excel_with_gen(self):
-        """更新Excel文件，添加世代信息和编号"""
+    def update_excel_with_gen(self, only_names: Optional[Set[str]] = None):
+        """更新Excel文件，添加世代信息和编号
+
+        only_names 不为空时只更新这些名称的行（如数据文件更新后新增或变化的技能），其他行保持不变。
+        """
         try:
             print("读取Excel文件...")
             wb = load_workbook(self.excel_file)
@@ -58,7 +64,7 @@ class MoveGenExtractor:
             # 遍历所有特性
             for row in tqdm(range(2, ws.max_row + 1)):
                 move_en = ws.cell(row=row, column=name_en_col).value
-                if move_en:
+                if move_en and (only_names is None or move_en in only_names):
                     tmp_gen_index = self.get_generation_by_move(move_en)
                     if not tmp_gen_index:
                         tmp_gen_index = -99
@@ -72,7 +78,11 @@ class MoveGenExtractor:
 
 def main():
     extractor = MoveGenExtractor()
-    extractor.update_excel_with_gen()
+    # --changed-only: 只处理 utils.dataset_diff 记录的新增和变化的技能
+    only_names = load_changed_names('moves') if '--changed-only' in sys.argv else None
+    if only_names is not None:
+        print(f"只更新 {len(only_names)} 个新增或变化的技能")
+    extractor.update_excel_with_gen(only_names)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
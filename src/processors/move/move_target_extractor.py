@@ -1,84 +1,108 @@
-import re
+import json
+import sys
 import pandas as pd
 from tqdm import tqdm
 from pathlib import Path
+from typing import Any, Optional, Set
 from openpyxl import load_workbook
 from openpyxl.utils import get_column_letter
+from utils import RecordIndex
+from utils.dataset_diff import load_changed_names
+
+
+def to_cell_value(value: Any) -> Any:
+    """转换成单元格可以保存的值：字符串去掉首尾空白，字典和列表（如 flags）转成 JSON 文本"""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (dict, list, tuple)):
+        return json.dumps(value, ensure_ascii=False, sort_keys=isinstance(value, dict))
+    return value
 
 
 class MoveTargetExtractor:
     def __init__(self):
         self.excel_file = "output/move_data.xlsx"
         self.data_file = "data/moves.ts"
+        self._move_index = None
+
+    @property
+    def move_index(self) -> RecordIndex:
+        """按技能ID索引的 moves.ts 记录，首次使用时加载"""
+        if self._move_index is None:
+            print("读取数据文件...")
+            self._move_index = RecordIndex.load(self.data_file)
+        return self._move_index
+
+    def get_move_attribute(self, move_en: str, field: str) -> Optional[Any]:
+        """按英文名称查询技能的单个字段，如 target、type、flags"""
+        return self.move_index.field(move_en, field)
 
     def extract_move_target(self) -> dict[str, str]:
-        print("读取数据文件...")
-        with open(self.data_file, 'r', encoding='utf-8') as file:
-            content = file.read()
-        
-        # 移除 export const Items 声明
-        content = re.sub(r'^export\s+const\s+Items\s*:\s*[^=]+=\s*', '', content.strip())
-        content = content.rstrip(';')
-        
-        # 创建编号信息字典
-        target_info = {}
-        matches = list(re.finditer(r'name:\s*"([^"]+)".*?target:\s*"([^"]+)"', content, re.DOTALL))
-        for match in tqdm (matches, desc="处理数据"):
-            target_name, target = match.groups()
-            target_info[target_name] = target.strip()
-        return target_info
-
-    def update_excel_with_target(self):
-        """更新Excel文件，添加世代信息和编号"""
+        """生成 英文名称 -> 技能目标 的字典"""
+        return {name: target.strip() for name, target in self.move_index.column('target').items()}
+
+    def update_excel_with_field(self, field: str, column_name: str, after_column: str,
+                                only_names: Optional[Set[str]] = None):
+        """把 moves.ts 中的某个字段写入Excel，列不存在时插入到 after_column 之后
+
+        only_names 不为空时只更新这些名称的行（如数据文件更新后新增或变化的技能），其他行保持不变。
+        """
         try:
-            target_info = self.extract_move_target()
             print("读取Excel文件...")
             wb = load_workbook(self.excel_file)
             ws = wb.active
-            
+
             # 找到需要的列
             header_row = list(ws.iter_rows(min_row=1, max_row=1))[0]
             name_en_col = None
-            priority_col = None
-            target_col = None
-            
+            after_col = None
+            field_col = None
+
             for idx, cell in enumerate(header_row, 1):
                 if cell.value == '技能名称（英文）':
                     name_en_col = idx
-                elif cell.value == '优先度':
-                    priority_col = idx
-                elif cell.value == '技能目标':
-                    target_col = idx
-            
-            if not name_en_col or not priority_col:
+                elif cell.value == after_column:
+                    after_col = idx
+                elif cell.value == column_name:
+                    field_col = idx
+
+            if not name_en_col or not after_col:
                 print("找不到必要的列")
                 return
-            
-            if not target_col:
-                target_col = priority_col + 1
-                ws.insert_cols(target_col)
-                ws.cell(row=1, column=target_col, value='技能目标')
-                print("找不到技能目标列，已插入")
-
-            print("更新世代信息和编号...")
-            for row in range(2, ws.max_row + 1):
-                target_name = ws.cell(row=row, column=name_en_col).value
-                if target_name:
-                    # 更新技能目标
-                    if target_name in target_info and target_col:
-                        ws.cell(row=row, column=target_col, value=target_info[target_name])
-            
+
+            if not field_col:
+                field_col = after_col + 1
+                ws.insert_cols(field_col)
+                ws.cell(row=1, column=field_col, value=column_name)
+                print(f"找不到{column_name}列，已插入")
+
+            print(f"更新{column_name}...")
+            for row in tqdm(range(2, ws.max_row + 1), desc="处理数据"):
+                move_en = ws.cell(row=row, column=name_en_col).value
+                if move_en and (only_names is None or move_en in only_names):
+                    value = self.get_move_attribute(move_en, field)
+                    if value is not None:
+                        ws.cell(row=row, column=field_col, value=to_cell_value(value))
+
             # 保存文件
             print("保存更新后的Excel文件...")
             wb.save(self.excel_file)
             print("完成!")
-            
+
         except Exception as e:
             print(f"更新Excel文件失败: {e}")
+
+    def update_excel_with_target(self, only_names: Optional[Set[str]] = None):
+        """更新Excel文件，添加技能目标"""
+        self.update_excel_with_field('target', '技能目标', '优先度', only_names)
+
 def main():
     extractor = MoveTargetExtractor()
-    extractor.update_excel_with_target()
+    # --changed-only: 只处理 utils.dataset_diff 记录的新增和变化的技能
+    only_names = load_changed_names('moves') if '--changed-only' in sys.argv else None
+    if only_names is not None:
+        print(f"只更新 {len(only_names)} 个新增或变化的技能")
+    extractor.update_excel_with_target(only_names)
 
 if __name__ == "__main__":
     main()
-
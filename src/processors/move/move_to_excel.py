@@ -1,108 +1,89 @@
-import re
-import json
-import time
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
 from pathlib import Path
 from tqdm import tqdm
-from typing import Dict, List
+from typing import Dict, Iterable, List
 from openpyxl import Workbook
 from openpyxl.utils import get_column_letter
+from utils import HttpClient, load_ts_dataset
+from utils.models import Move, build_models
+from utils.page_fetcher import shared_page_fetcher
+from utils.tiered_cache import open_tiered_cache
+from utils.wiki_title_resolver import WikiTitleResolver, fetch_page_titles
 
 class MoveProcessor:
     def __init__(self):
-        self.move_cache_file = Path('json/move_translations.json')
-        self.move_cache = self._load_cache()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-
-    def _load_cache(self) -> dict:
-        """加载技能翻译缓存"""
-        if self.move_cache_file.exists():
-            return json.loads(self.move_cache_file.read_text(encoding='utf-8'))
-        return {}
+        self.move_cache = open_tiered_cache('move_translations')
+        self.session = HttpClient()
+        self.title_resolver = WikiTitleResolver(session=self.session)
+        self.pages = shared_page_fetcher()
 
     def _save_cache(self):
-        """保存技能翻译缓存"""
-        self.move_cache_file.parent.mkdir(exist_ok=True)
-        self.move_cache_file.write_text(
-            json.dumps(self.move_cache, ensure_ascii=False, indent=2),
-            encoding='utf-8'
-        )
+        """提交技能翻译缓存，并导出到 json/move_translations.json"""
+        self.move_cache.export_json()
+        print(self.move_cache.report())
 
     def _get_move_translation(self, move_en: str) -> str:
         """获取技能的中文翻译"""
-        if move_en in self.move_cache:
-            return self.move_cache[move_en]
+        found, move_cn = self.move_cache.lookup(move_en)
+        if found:
+            return move_cn or move_en
 
         try:
-            url = f"https://wiki.52poke.com/wiki/{move_en}"
-            response = self.session.get(url, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            title = soup.find('h1', {'id': 'firstHeading'})
+            # 与描述爬虫读取的是同一个页面，经 cache/pages 共用
+            title = self.pages.wiki_page(move_en).title
             if title:
-                move_cn = title.text.split('（')[0].strip()
+                move_cn = title.split('（')[0].strip()
                 self.move_cache[move_en] = move_cn
-                self._save_cache()
                 return move_cn
-            time.sleep(1)
+            # 页面不存在或没有标题，写入负缓存
+            self.move_cache.mark_missing(move_en)
         except Exception as e:
             print(f"获取技能翻译失败 {move_en}: {e}")
         return move_en
 
-    def parse_move_data(self, content: str) -> List[Dict]:
+    def prefetch_translations(self, names: Iterable[str]):
+        """用 MediaWiki API 批量获取缓存中没有的技能翻译，剩下的用流水线逐页查询"""
+        names = list(names)
+        self.title_resolver.fill_cache(self.move_cache, names)
+        fetch_page_titles(self.move_cache, self.pages, names,
+                          clean=lambda title: title.split('（')[0].strip(), desc="查询技能翻译")
+
+    def parse_move_data(self, records: Dict[str, Dict]) -> List[Dict]:
         """解析技能数据"""
         moves = []
-        
-        # 使用正则表达式匹配每个技能对象
-        pattern = r'(\w+):\s*{([^}]+)}'
-        matches = list(re.finditer(pattern, content))
 
         print("解析技能数据...")
-        for match in tqdm(matches, desc="处理技能"):
+        # 只处理有名称的技能
+        move_models = build_models(Move, records)
+        self.prefetch_translations(move.name for move in move_models)
+        for move in tqdm(move_models, desc="处理技能"):
             try:
-                move_id = match.group(1)
-                data_block = match.group(2)
-                
-                # 提取所需字段
-                name_match = re.search(r'name:\s*"([^"]+)"', data_block)
-                num_match = re.search(r'num:\s*(\d+)', data_block)
-                accuracy_match = re.search(r'accuracy:\s*(\d+)', data_block)
-                base_power_match = re.search(r'basePower:\s*(\d+)', data_block)
-                pp_match = re.search(r'pp:\s*(\d+)', data_block)
-                priority_match = re.search(r'priority:\s*(-?\d+)', data_block)
-                category_match = re.search(r'category:\s*"([^"]+)"', data_block)
-                
-                if name_match:  # 只处理有名称的技能
-                    move_data = {
-                        'name_en': name_match.group(1),
-                        'name_cn': self._get_move_translation(name_match.group(1)),
-                        'num': int(num_match.group(1)) if num_match else None,
-                        'accuracy': int(accuracy_match.group(1)) if accuracy_match else 'true',
-                        'base_power': int(base_power_match.group(1)) if base_power_match else None,
-                        'pp': int(pp_match.group(1)) if pp_match else None,
-                        'priority': int(priority_match.group(1)) if priority_match else None,
-                        'category': category_match.group(1) if category_match else None
-                    }
-                    moves.append(move_data)
+                move_data = {
+                    'name_en': move.name,
+                    'name_cn': self._get_move_translation(move.name),
+                    'num': move.num,
+                    'accuracy': 'true' if move.always_hits else move.accuracy,
+                    'base_power': move.base_power,
+                    'pp': move.pp,
+                    'priority': move.priority,
+                    'category': move.category
+                }
+                moves.append(move_data)
 
             except Exception as e:
                 print(f"解析错误: {e}")
                 continue
 
+        self._save_cache()
         return moves
 
     def process_data(self, input_file: str, output_file: str):
         """处理数据主函数"""
         print("读取数据文件...")
-        with open(input_file, 'r', encoding='utf-8') as file:
-            content = file.read()
+        records = load_ts_dataset(input_file)
 
         # 解析数据
-        moves = self.parse_move_data(content)
+        moves = self.parse_move_data(records)
         df = pd.DataFrame(moves)
 
         # 重命名列
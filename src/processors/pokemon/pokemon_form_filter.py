@@ -1,7 +1,7 @@
 import pandas as pd
-import re
 from pathlib import Path
 from openpyxl import load_workbook
+from utils.patterns import PARENTHESIZED
 
 class PokemonFormFilter:
     def __init__(self):
@@ -37,7 +37,7 @@ class PokemonFormFilter:
                         # 统一括号格式
                         name = name.replace('（', '(').replace('）', ')')
                         # 提取括号中的内容
-                        form = re.search(r'\((.*?)\)', name)
+                        form = PARENTHESIZED.search(name)
                         if form:
                             form_name = form.group(1)
                             # 如果不是"超级"形态，则标记为删除
@@ -1,9 +1,12 @@
 import json
+import sys
 import pandas as pd
 from tqdm import tqdm
 from pathlib import Path
 from openpyxl import load_workbook
 from openpyxl.utils import get_column_letter
+from typing import Optional, Set
+from utils.dataset_diff import load_changed_names
 
 class PokemonGenExtractor:
     def __init__(self):
@@ -34,8 +37,11 @@ class PokemonGenExtractor:
             print(f"获取世代信息时出错: {e}")
             return None
 
-    def update_excel_with_gen(self):
-        """更新Excel文件，添加世代信息"""
+    def update_excel_with_gen(self, only_names: Optional[Set[str]] = None):
+        """更新Excel文件，添加世代信息
+
+        only_names 不为空时只更新这些名称的行（如数据文件更新后新增或变化的宝可梦），其他行保持不变。
+        """
         try:
             print("读取Excel文件...")
             wb = load_workbook(self.excel_file)
@@ -75,7 +81,7 @@ class PokemonGenExtractor:
             print("更新世代信息...")
             for row in tqdm(range(2, ws.max_row + 1)):
                 pokemon_en = ws.cell(row=row, column=name_en_col).value
-                if pokemon_en:
+                if pokemon_en and (only_names is None or pokemon_en in only_names):
                     gen = self.get_generation_by_pokemon(pokemon_en)
                     if gen is None:
                         gen = -99  # 使用-99表示未找到世代信息
@@ -93,7 +99,11 @@ class PokemonGenExtractor:
 
 def main():
     extractor = PokemonGenExtractor()
-    extractor.update_excel_with_gen()
+    # --changed-only: 只处理 utils.dataset_diff 记录的新增和变化的宝可梦
+    only_names = load_changed_names('pokedex') if '--changed-only' in sys.argv else None
+    if only_names is not None:
+        print(f"只更新 {len(only_names)} 个新增或变化的宝可梦")
+    extractor.update_excel_with_gen(only_names)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,89 +1,85 @@
-import re
-import time
-import json
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
-from typing import Dict, Any
+from typing import Any, Dict, Iterable, Optional
 from tqdm import tqdm
 from pathlib import Path
-from utils import FORM_TRANSLATIONS, SPECIAL_FORM_NAMES
+from utils import FORM_TRANSLATIONS, SPECIAL_FORM_NAMES, TYPE_TRANSLATIONS, HttpClient, load_ts_dataset
+from utils.models import STAT_NAMES, Species, build_models
+from utils.page_fetcher import shared_page_fetcher
+from utils.tiered_cache import open_tiered_cache
+from utils.wiki_title_resolver import WikiTitleResolver, fetch_page_titles
 from openpyxl import Workbook
 
-# 属性中英文对照
-TYPE_TRANSLATIONS = {
-    'Normal': '一般', 'Fire': '火', 'Water': '水', 'Electric': '电',
-    'Grass': '草', 'Ice': '冰', 'Fighting': '格斗', 'Poison': '毒',
-    'Ground': '地面', 'Flying': '飞行', 'Psychic': '超能力', 'Bug': '虫',
-    'Rock': '岩石', 'Ghost': '幽灵', 'Dragon': '龙', 'Dark': '恶',
-    'Steel': '钢', 'Fairy': '妖精'
-}
-
 class PokemonDataProcessor:
     def __init__(self):
-        self.cache_file = Path('json/pokemon_name_cache.json')
-        self.name_cache = self._load_cache()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        # 内存 LRU + SQLite，确认查不到的名称会在负缓存中保留一段时间
+        self.name_cache = open_tiered_cache('pokemon_names')
+        self.session = HttpClient()
+        self.title_resolver = WikiTitleResolver(session=self.session)
+        self.pages = shared_page_fetcher()
         self.form_translations = FORM_TRANSLATIONS
         self.special_form_names = SPECIAL_FORM_NAMES
-        self.ability_cache_file = Path('json/ability_translations.json')
-        self.ability_cache = self._load_ability_cache()
-
-    def _load_cache(self) -> dict:
-        """加载名称缓存"""
-        if self.cache_file.exists():
-            return json.loads(self.cache_file.read_text(encoding='utf-8'))
-        return {}
+        self.ability_cache = open_tiered_cache('ability_translations')
 
     def _save_cache(self):
-        """保存名称缓存"""
-        self.cache_file.write_text(json.dumps(self.name_cache, ensure_ascii=False, indent=2), 
-                                 encoding='utf-8')
-
-    def _load_ability_cache(self) -> dict:
-        """加载特性翻译缓存"""
-        if self.ability_cache_file.exists():
-            return json.loads(self.ability_cache_file.read_text(encoding='utf-8'))
-        return {}
-
-    def _save_ability_cache(self):
-        """保存特性翻译缓存"""
-        self.ability_cache_file.write_text(
-            json.dumps(self.ability_cache, ensure_ascii=False, indent=2),
-            encoding='utf-8'
-        )
+        """提交缓存写入，并导出 json/ 下的名称和特性翻译缓存"""
+        for cache in (self.name_cache, self.ability_cache):
+            cache.export_json()
+            print(cache.report())
 
-    def _get_ability_translation(self, ability_en: str) -> str:
-        """获取特性的中文翻译"""
-        if ability_en in self.ability_cache:
-            return self.ability_cache[ability_en]
+    def _fetch_ability_translation(self, ability_en: str) -> Optional[str]:
+        """从特性页面标题获取中文翻译，失败时返回 None
 
+        页面不存在或没有标题时写入负缓存；网络错误只返回 None，下次运行再试。
+        """
         try:
-            url = f"https://wiki.52poke.com/wiki/{ability_en}"
-            response = self.session.get(url, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            title = soup.find('h1', {'id': 'firstHeading'})
+            title = self.pages.wiki_page(ability_en).title
             if title:
-                ability_cn = title.text.split('（')[0].strip()
-                self.ability_cache[ability_en] = ability_cn
-                self._save_ability_cache()
-                return ability_cn
-            time.sleep(1)
+                return title.split('（')[0].strip()
+            self.ability_cache.mark_missing(ability_en)
         except Exception as e:
             print(f"获取特性翻译失败 {ability_en}: {e}")
-        return ability_en
+        return None
 
-    def parse_pokemon_data(self, content: str) -> list[Dict[str, Any]]:
+    def _get_ability_translation(self, ability_en: str) -> str:
+        """获取特性的中文翻译，查不到时返回英文名称"""
+        found, ability_cn = self.ability_cache.lookup(ability_en)
+        if not found:
+            ability_cn = self._fetch_ability_translation(ability_en)
+            if ability_cn:
+                self.ability_cache[ability_en] = ability_cn
+        return ability_cn or ability_en
+
+    def prefetch_ability_translations(self, ability_names: Iterable[str], max_workers: int = 8) -> Dict[str, str]:
+        """一次性获取所有特性的翻译，返回 英文 -> 中文 的字典
+
+        先用 MediaWiki API 批量查询，剩下的用流水线逐页查询（并发下载，进程池提取标题），最后统一提交缓存写入。
+        负缓存中的特性不再查询。
+        """
+        unique = sorted(set(ability_names))
+        missing = [name for name in unique if name not in self.ability_cache]
+        if missing:
+            print(f"共 {len(unique)} 个特性，缓存中缺少 {len(missing)} 个")
+            self.title_resolver.fill_cache(self.ability_cache, missing)
+            missing = [name for name in missing if name not in self.ability_cache]
+        if missing:
+            fetch_page_titles(self.ability_cache, self.pages, missing, clean=lambda title: title.split('（')[0].strip(),
+                              fetch_concurrency=max_workers, desc="查询特性翻译")
+        # 查不到的特性保留英文名称
+        return {name: self.ability_cache.peek(name) or name for name in unique}
+
+    def parse_pokemon_data(self, records: Dict[str, Dict[str, Any]]) -> list[Dict[str, Any]]:
         """解析宝可梦数据文件"""
         pokemon_list = []
-        pattern = r'(\w+):\s*{((?:[^{}]|{[^{}]*})*)}'
-        matches = list(re.finditer(pattern, content))  # 转换为列表以便使用tqdm
-        
-        print("解析宝可梦数据和翻译特性...")
-        for match in tqdm(matches, desc="处理宝可梦"):
+        species_list = build_models(Species, records)
+
+        # 先收集所有特性并一次性获取翻译，解析过程中不再访问网络
+        print("获取特性翻译...")
+        ability_translations = self.prefetch_ability_translations(
+            ability_en for species in species_list for ability_en in species.ability_names
+        )
+
+        print("解析宝可梦数据...")
+        for species in tqdm(species_list, desc="处理宝可梦"):
             try:
                 # 初始化所有必需的字段
                 pokemon_data = {
@@ -104,77 +100,63 @@ class PokemonDataProcessor:
                     'abilities_cn': None
                 }
                 
-                data_block = match.group(2)
-                
-                # 提取数字ID
-                num_match = re.search(r'num:\s*([-\d]+)', data_block)
-                if not num_match:
-                    continue
-                pokemon_data['id'] = num_match.group(1)
-                
-                # 提取名称
-                name_match = re.search(r'name:\s*"([^"]+)"', data_block)
-                if name_match:
-                    pokemon_data['name_en'] = name_match.group(1)
+                # 编号和名称
+                pokemon_data['id'] = str(species.num)
+                pokemon_data['name_en'] = species.name
                 
-                # 提取类型
-                types_match = re.search(r'types:\s*\[(.*?)\]', data_block)
-                if types_match:
-                    types = types_match.group(1)
-                    types_list = [t.strip(' "\'') for t in types.split(',')]
-                    pokemon_data['types_en'] = ', '.join(types_list)
-                    pokemon_data['types_cn'] = ', '.join(TYPE_TRANSLATIONS.get(t, t) for t in types_list)
+                # 类型
+                if species.types:
+                    pokemon_data['types_en'] = species.types_en
+                    pokemon_data['types_cn'] = ', '.join(TYPE_TRANSLATIONS.get(t, t) for t in species.types)
                 
-                # 提取基础属性
-                stats_match = re.search(r'baseStats:\s*{([^}]+)}', data_block)
-                if stats_match:
-                    stats_text = stats_match.group(1)
-                    # 使用正则表达式分别匹配每个属性
-                    for stat in ['hp', 'atk', 'def', 'spa', 'spd', 'spe']:
-                        stat_match = re.search(rf'{stat}:\s*(\d+)', stats_text)
-                        if stat_match:
-                            pokemon_data[stat] = int(stat_match.group(1))
+                # 基础属性
+                if species.stats is not None:
+                    for stat, value in zip(STAT_NAMES, species.stats):
+                        pokemon_data[stat] = value
                 
-                # 提取身高体重
-                height_match = re.search(r'heightm:\s*([\d.]+)', data_block)
-                if height_match:
-                    pokemon_data['height'] = float(height_match.group(1))
+                # 身高体重
+                pokemon_data['height'] = species.height
+                pokemon_data['weight'] = species.weight
                 
-                weight_match = re.search(r'weightkg:\s*([\d.]+)', data_block)
-                if weight_match:
-                    pokemon_data['weight'] = float(weight_match.group(1))
-                
-                # 提取特性
-                abilities_match = re.search(r'abilities:\s*{([^}]+)}', data_block)
-                if abilities_match:
-                    abilities_text = abilities_match.group(1)
-                    # 使用正则表达式匹配键值对
-                    ability_pairs = re.findall(r'(\w+):\s*"([^"]+)"', abilities_text)
-                    
-                    # 翻译特性（不使用列表推导式，以便显示进度）
-                    abilities_en = []
-                    abilities_cn = []
-                    for k, v in ability_pairs:
-                        abilities_en.append(f"{k}:{v}")
-                        cn_ability = self._get_ability_translation(v)
-                        abilities_cn.append(f"{k}:{cn_ability}")
-                    
-                    pokemon_data['abilities_en'] = ', '.join(abilities_en)
-                    pokemon_data['abilities_cn'] = ', '.join(abilities_cn)
+                # 特性
+                if species.abilities:
+                    pokemon_data['abilities_en'] = species.abilities_en
+                    pokemon_data['abilities_cn'] = ', '.join(
+                        f"{slot}:{ability_translations[ability_en]}" for slot, ability_en in species.abilities
+                    )
                 
                 pokemon_list.append(pokemon_data)
                 
             except Exception as e:
                 print(f"解析错误: {e}")
-                print(f"出错的数据块: {data_block[:100]}...")
+                print(f"出错的数据: {species.id}")
                 continue
         
         return pokemon_list
 
+    def prefetch_chinese_names(self, names: Iterable[str]):
+        """用 MediaWiki API 批量获取缓存中没有的宝可梦中文名
+
+        带形态的名称（如 Mewtwo-Mega-X）由基础名称和形态翻译拼接，只需要查询基础名称。
+        API 查不到的基础名称用流水线逐页查询。
+        """
+        base_names = []
+        for name_en in names:
+            if name_en in self.special_form_names:
+                continue
+            base_names.append(name_en.split('-')[0])
+        self.title_resolver.fill_cache(self.name_cache, base_names)
+        fetch_page_titles(self.name_cache, self.pages, base_names,
+                          clean=lambda title: title.split('(')[0].strip(), desc="查询宝可梦中文名")
+
     def get_chinese_name(self, name_en: str, max_retries: int = 3) -> str:
-        """获取中文名称（带重试机制）"""
-        if name_en in self.name_cache:
-            return self.name_cache[name_en]
+        """获取中文名称（带重试机制），查不到时返回"未知"
+
+        确认查不到的名称写入负缓存，有效期内直接返回"未知"，不再请求和等待。
+        """
+        found, chinese_name = self.name_cache.lookup(name_en)
+        if found:
+            return chinese_name or "未知"
         # 特殊形态的中文翻译对照
         form_translations = self.form_translations
         
@@ -208,43 +190,40 @@ class PokemonDataProcessor:
             
             # 组合完整的中文名称，将形态用括号括起来
             chinese_name = f"{base_chinese}（{''.join(translated_forms)}）"
-            self.name_cache[name_en] = chinese_name
+            # 基础名称没查到时不缓存，下次基础名称查到后重新组合
+            if base_chinese != "未知":
+                self.name_cache[name_en] = chinese_name
             return chinese_name
         
-        # 原有的网页查询逻辑
-        url = f"https://wiki.52poke.com/wiki/{name_en}"
-        
+        # 网页查询，页面与 PokemonWebScraper 共用 cache/pages
         for attempt in range(max_retries):
             try:
-                response = self.session.get(url, timeout=10)
-                soup = BeautifulSoup(response.text, 'html.parser')
-                title = soup.find('h1', {'id': 'firstHeading'})
-                
+                title = self.pages.wiki_page(name_en).title
                 if title:
-                    chinese_name = title.text.split('(')[0].strip()
+                    chinese_name = title.split('(')[0].strip()
                     self.name_cache[name_en] = chinese_name
                     return chinese_name
-                    
-                time.sleep(1)  # 请求间隔
-                
+                # 页面不存在或没有标题才写入负缓存，网络错误下次运行再试
+                self.name_cache.mark_missing(name_en)
+                break
             except Exception as e:
+                # HttpClient 已按退避重试过，这里只在最后一次失败时提示
                 if attempt == max_retries - 1:
                     print(f"获取{name_en}的中文名称失败: {e}")
-                time.sleep(2)  # 失败后等待更长时间
-                
+
         return "未知"
 
     def process_data(self, input_file: str, output_file: str):
         """处理数据主函数"""
         print("读取数据文件...")
-        with open(input_file, 'r', encoding='utf-8') as file:
-            content = file.read()
+        records = load_ts_dataset(input_file)
         
         print("解析宝可梦数据...")
-        pokemon_list = self.parse_pokemon_data(content)
+        pokemon_list = self.parse_pokemon_data(records)
         df = pd.DataFrame(pokemon_list)
         
         print("获取中文名称...")
+        self.prefetch_chinese_names(df['name_en'])
         tqdm.pandas()
         df['name_cn'] = df['name_en'].progress_apply(self.get_chinese_name)
         
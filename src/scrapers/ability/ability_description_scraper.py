@@ -1,58 +1,96 @@
-import json
-import time
-import requests
-from bs4 import BeautifulSoup
-from pathlib import Path
-from tqdm import tqdm
+import sys
+from bs4 import BeautifulSoup, SoupStrainer
 from openpyxl import load_workbook
 from openpyxl.utils import get_column_letter
+from typing import Iterable, Optional, Set
+from utils.dataset_diff import load_changed_names
+from utils import HttpClient
+from utils.batch_journal import BatchJournal, run_batch
+from utils.html_parser import parse_html
+from utils.page_fetcher import PageFetchService, shared_page_fetcher
+from utils.pipeline import DEFAULT_FETCH_CONCURRENCY, FetchExtractPipeline
+from utils.tiered_cache import open_tiered_cache
+
+# 特性描述所在的单元格，只解析这一部分
+DESCRIPTION_ATTRS = {'class': 'roundybottom-6 bgwhite', 'colspan': '2'}
+DESCRIPTION_SCOPE = SoupStrainer('td', attrs=DESCRIPTION_ATTRS)
+
+
+def find_ability_description(soup: BeautifulSoup) -> Optional[str]:
+    """从页面中读取特性描述，页面上没有时返回 None"""
+    description_cell = soup.find('td', DESCRIPTION_ATTRS)
+    return description_cell.text.strip() if description_cell else None
+
+
+def extract_ability_description(text: str) -> Optional[str]:
+    """从页面原文提取特性描述（流水线在子进程中调用）"""
+    return find_ability_description(parse_html(text, DESCRIPTION_SCOPE))
+
 
 class AbilityDescriptionScraper:
-    def __init__(self):
-        self.description_cache_file = Path('json/ability_descriptions.json')
-        self.description_cache = self._load_cache()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-
-    def _load_cache(self) -> dict:
-        """加载特性描述缓存"""
-        if self.description_cache_file.exists():
-            return json.loads(self.description_cache_file.read_text(encoding='utf-8'))
-        return {}
+    def __init__(self, reparse: bool = False):
+        self.description_cache = open_tiered_cache('ability_descriptions')
+        self.session = HttpClient()
+        # reparse: 不使用已提取的描述，只从本地保存的页面重新提取
+        self.reparse = reparse
+        # 与翻译处理器共用页面，reparse 时只读本地保存的页面
+        self.pages = PageFetchService(self.session, mode='offline') if reparse else shared_page_fetcher()
 
     def _save_cache(self):
-        """保存特性描述缓存"""
-        self.description_cache_file.write_text(
-            json.dumps(self.description_cache, ensure_ascii=False, indent=2),
-            encoding='utf-8'
-        )
+        """提交特性描述缓存，并导出到 json/ability_descriptions.json"""
+        self.description_cache.export_json()
+        print(self.description_cache.report())
 
     def get_ability_description(self, ability_en: str) -> str:
         """获取特性的中文描述"""
-        if ability_en in self.description_cache:
-            return self.description_cache[ability_en]
+        found, description = (False, None) if self.reparse else self.description_cache.lookup(ability_en)
+        if found:
+            return description or ""
 
         try:
-            url = f"https://wiki.52poke.com/wiki/{ability_en}"
-            response = self.session.get(url, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = self.pages.wiki_page(ability_en).scoped(DESCRIPTION_SCOPE)
             
             # 查找描述文本
-            description_cell = soup.find('td', {'class': 'roundybottom-6 bgwhite', 'colspan': '2'})
-            if description_cell:
-                description = description_cell.text.strip()
+            description = find_ability_description(soup)
+            if description is not None:
                 self.description_cache[ability_en] = description
-                self._save_cache()
                 return description
-            time.sleep(1)
+            # 页面上没有描述，写入负缓存
+            self.description_cache.mark_missing(ability_en)
         except Exception as e:
             print(f"获取特性描述失败 {ability_en}: {e}")
-        return ""
+        # 获取失败时沿用已过期的旧描述
+        return self.description_cache.peek(ability_en) or ""
+
+    def run_pipeline(self, journal: BatchJournal, names: Iterable[str],
+                     fetch_concurrency: int = DEFAULT_FETCH_CONCURRENCY, processes: Optional[int] = None):
+        """用流水线获取日志中还没有的描述：并发下载页面，进程池提取描述，写入阶段更新缓存和日志
+
+        缓存中已有的描述不经过流水线；下载失败的特性之后由 get_ability_description 逐个重试。
+        """
+        names = [name for name in journal.pending(names) if self.reparse or name not in self.description_cache]
+
+        def write(ability_en: str, description: Optional[str]):
+            if description is None:
+                self.description_cache.mark_missing(ability_en)
+                return
+            self.description_cache[ability_en] = description
+            if description:
+                journal.record(ability_en, description)
 
-    def update_excel_with_descriptions(self, excel_file: str):
-        """更新Excel文件，添加描述列"""
+        pipeline = FetchExtractPipeline(lambda name: self.pages.wiki_page(name).text, extract_ability_description,
+                                        write, fetch_concurrency=fetch_concurrency, processes=processes,
+                                        desc="获取特性描述", batch=self.description_cache.batch)
+        pipeline.run(names)
+
+    def update_excel_with_descriptions(self, excel_file: str, only_names: Optional[Set[str]] = None,
+                                       restart: bool = False, pipeline: bool = False):
+        """更新Excel文件，添加描述列
+
+        only_names 不为空时只更新这些名称的行（如数据文件更新后新增或变化的记录），其他行保持不变。
+        获取到的描述逐条写入 cache/journals 下的日志，中断后重新运行只处理剩下的特性；
+        restart 为 True 时丢弃上次中断留下的日志；pipeline 为 True 时先用 run_pipeline 并发获取。
+        """
         print("读取Excel文件...")
         wb = load_workbook(excel_file)
         ws = wb.active
@@ -69,28 +107,52 @@ class AbilityDescriptionScraper:
             print("找不到特性英文名称列")
             return
 
-        # 添加描述列标题
-        desc_col = len(list(ws.columns)) + 1
-        ws.cell(row=1, column=desc_col, value='特性描述')
+        desc_col = None
+        for idx, cell in enumerate(header_row, 1):
+            if cell.value == '特性描述':
+                desc_col = idx
+                break
+
+        if not desc_col:
+            # 添加描述列标题
+            desc_col = len(list(ws.columns)) + 1
+            ws.cell(row=1, column=desc_col, value='特性描述')
 
         # 设置描述列宽度
         ws.column_dimensions[get_column_letter(desc_col)].width = 50
 
-        print("获取特性描述...")
-        # 遍历所有特性
-        for row in tqdm(range(2, ws.max_row + 1)):
+        # 需要更新的行
+        rows = {}
+        for row in range(2, ws.max_row + 1):
             ability_en = ws.cell(row=row, column=name_en_col).value
-            if ability_en:
-                description = self.get_ability_description(ability_en)
-                ws.cell(row=row, column=desc_col, value=description)
+            if ability_en and (only_names is None or ability_en in only_names):
+                rows[row] = ability_en
+
+        print("获取特性描述...")
+        journal = BatchJournal('ability_descriptions_reparse' if self.reparse else 'ability_descriptions', restart=restart)
+        if pipeline:
+            self.run_pipeline(journal, rows.values())
+        descriptions = run_batch(journal, rows.values(), self.get_ability_description)
+        for row, ability_en in rows.items():
+            ws.cell(row=row, column=desc_col, value=descriptions.get(ability_en, ""))
 
         # 保存更新后的文件
         print("保存更新后的Excel文件...")
         wb.save(excel_file)
+        self._save_cache()
+        journal.complete()
 
 def main():
-    scraper = AbilityDescriptionScraper()
-    scraper.update_excel_with_descriptions('output/ability_data.xlsx')
+    # --reparse: 从 cache/pages 中保存的页面重新提取描述，不发网络请求
+    scraper = AbilityDescriptionScraper(reparse='--reparse' in sys.argv)
+    # --changed-only: 只处理 utils.dataset_diff 记录的新增和变化的特性
+    only_names = load_changed_names('abilities') if '--changed-only' in sys.argv else None
+    if only_names is not None:
+        print(f"只更新 {len(only_names)} 个新增或变化的特性")
+    # --restart: 不从上次中断的位置继续
+    # --pipeline: 并发下载页面，在多个进程中提取描述
+    scraper.update_excel_with_descriptions('output/ability_data.xlsx', only_names, restart='--restart' in sys.argv,
+                                           pipeline='--pipeline' in sys.argv)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,114 +1,155 @@
-import json
-import time
-import requests
+import sys
 from bs4 import BeautifulSoup, Tag
-from pathlib import Path
-from tqdm import tqdm
-from typing import Optional, Tuple
+from typing import Iterable, Optional, Set, Tuple
 from openpyxl import load_workbook
 from openpyxl.utils import get_column_letter
+from utils.dataset_diff import load_changed_names
+from utils import HttpClient
+from utils.batch_journal import BatchJournal, run_batch
+from utils.html_parser import parse_html, parse_section
+from utils.page_fetcher import PageFetchService, shared_page_fetcher
+from utils.pipeline import DEFAULT_FETCH_CONCURRENCY, FetchExtractPipeline
+from utils.tiered_cache import open_tiered_cache
+
+# 描述从这些小标题开始，到这些小标题之前结束（按顺序取第一个存在的）
+START_HEADLINES = ["效果", "游戏中", "使用效果"]
+END_HEADLINES = ["效果变更", "获得方式", "包包信息"]
+
+
+def find_boundary_tags(soup: BeautifulSoup) -> Tuple[Optional[Tag], Optional[Tag]]:
+    """找到描述的开始和结束标签"""
+    # 尝试找开始标签
+    start_tag = None
+    for headline_id in START_HEADLINES:
+        start_tag = soup.find('span', {'class': 'mw-headline', 'id': headline_id})
+        if start_tag:
+            start_tag = start_tag.find_parent(['h2', 'h3'])  # 同时支持h2和h3标签
+            break
+
+    if not start_tag:
+        return None, None
+
+    # 尝试找结束标签
+    end_tag = None
+    for headline_id in END_HEADLINES:
+        end_tag = soup.find('span', {'class': 'mw-headline', 'id': headline_id})
+        if end_tag:
+            end_tag = end_tag.find_parent(['h2', 'h3'])  # 同时支持h2和h3标签
+            break
+
+    return start_tag, end_tag
+
+
+def find_item_description(soup: BeautifulSoup) -> Optional[str]:
+    """收集开始和结束小标题之间的文本，找不到开始小标题时返回 None"""
+    start_tag, end_tag = find_boundary_tags(soup)
+    if not start_tag:
+        return None
+
+    # 收集描述文本
+    description_parts = []
+    current = start_tag.find_next_sibling()
+    
+    while current:
+        # 检查是否到达结束标签
+        if current.name in ['h2', 'h3']:
+            headline = current.find('span', {'class': 'mw-headline'})
+            if headline and headline.get('id') in END_HEADLINES:
+                break
+        
+        text = current.get_text(strip=True)
+        if text:
+            description_parts.append(text)
+        current = current.find_next_sibling()
 
-class ItemDescriptionScraper:
-    def __init__(self):
-        self.description_cache_file = Path('json/item_descriptions.json')
-        self.description_cache = self._load_cache()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-
-    def _load_cache(self) -> dict:
-        """加载道具描述缓存"""
-        if self.description_cache_file.exists():
-            return json.loads(self.description_cache_file.read_text(encoding='utf-8'))
-        return {}
+    description = ' '.join(description_parts)
+    
+    # 去除"获得方式"及其后面的内容
+    if "获得方式" in description:
+        description = description.split("获得方式")[0].strip()
+    return description
 
-    def _save_cache(self):
-        """保存道具描述缓存"""
-        self.description_cache_file.parent.mkdir(exist_ok=True)
-        self.description_cache_file.write_text(
-            json.dumps(self.description_cache, ensure_ascii=False, indent=2),
-            encoding='utf-8'
-        )
-
-    def _find_boundary_tags(self, soup: BeautifulSoup) -> Tuple[Optional[Tag], Optional[Tag]]:
-        """找到描述的开始和结束标签"""
-        # 尝试找开始标签
-        start_tag = None
-        for headline_id in ["效果", "游戏中", "使用效果"]:
-            start_tag = soup.find('span', {'class': 'mw-headline', 'id': headline_id})
-            if start_tag:
-                start_tag = start_tag.find_parent(['h2', 'h3'])  # 同时支持h2和h3标签
-                break
 
-        if not start_tag:
-            return None, None
+def extract_item_description(text: str) -> Optional[str]:
+    """从页面原文提取道具描述（流水线在子进程中调用）"""
+    return find_item_description(parse_section(text, START_HEADLINES, END_HEADLINES) or parse_html(text))
 
-        # 尝试找结束标签
-        end_tag = None
-        for headline_id in ["效果变更", "获得方式", "包包信息"]:
-            end_tag = soup.find('span', {'class': 'mw-headline', 'id': headline_id})
-            if end_tag:
-                end_tag = end_tag.find_parent(['h2', 'h3'])  # 同时支持h2和h3标签
-                break
 
-        return start_tag, end_tag
+class ItemDescriptionScraper:
+    def __init__(self, reparse: bool = False):
+        self.description_cache = open_tiered_cache('item_descriptions')
+        self.session = HttpClient()
+        # reparse: 不使用已提取的描述，只从本地保存的页面重新提取
+        self.reparse = reparse
+        # 与翻译处理器共用页面，reparse 时只读本地保存的页面
+        self.pages = PageFetchService(self.session, mode='offline') if reparse else shared_page_fetcher()
+
+    def _save_cache(self):
+        """提交道具描述缓存，并导出到 json/item_descriptions.json"""
+        self.description_cache.export_json()
+        print(self.description_cache.report())
 
     def get_item_description(self, item_en: str) -> str:
         """获取道具的中文描述"""
-        if item_en in self.description_cache:
-            description = self.description_cache[item_en]
+        found, description = (False, None) if self.reparse else self.description_cache.lookup(item_en)
+        if found:
+            description = description or ""
             # 去除"获得方式"及其后面的内容
             if "获得方式" in description:
-                description = description.split("获得方式")[0].strip() 
-            self.description_cache[item_en] = description
-            self._save_cache()
-            return self.description_cache[item_en]
+                description = description.split("获得方式")[0].strip()
+                # 只有清理后内容变化时才写回
+                self.description_cache[item_en] = description
+            return description
 
         try:
-            url = f"https://wiki.52poke.com/wiki/{item_en}"
-            response = self.session.get(url, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 找到边界标签
-            start_tag, end_tag = self._find_boundary_tags(soup)
-            if not start_tag:
+            # 只解析两个小标题之间的部分；没有开始或结束小标题时按整页查找
+            document = self.pages.wiki_page(item_en)
+            soup = parse_section(document.text, START_HEADLINES, END_HEADLINES) or document.soup
+
+            description = find_item_description(soup)
+            if description is None:
+                self.description_cache.mark_missing(item_en)
                 return ""
 
-            # 收集描述文本
-            description_parts = []
-            current = start_tag.find_next_sibling()
-            
-            while current:
-                # 检查是否到达结束标签
-                if current.name in ['h2', 'h3']:
-                    headline = current.find('span', {'class': 'mw-headline'})
-                    if headline and headline.get('id') in ["效果变更", "获得方式", "包包信息"]:
-                        break
-                
-                text = current.get_text(strip=True)
-                if text:
-                    description_parts.append(text)
-                current = current.find_next_sibling()
-
-            description = ' '.join(description_parts)
-            
-            # 去除"获得方式"及其后面的内容
-            if "获得方式" in description:
-                description = description.split("获得方式")[0].strip()
-                
             if description:
                 self.description_cache[item_en] = description
-                self._save_cache()
                 return description
             
-            time.sleep(1)
+            # 页面上没有描述，写入负缓存
+            self.description_cache.mark_missing(item_en)
         except Exception as e:
             print(f"获取道具描述失败 {item_en}: {e}")
-        return ""
+        # 获取失败时沿用已过期的旧描述
+        return self.description_cache.peek(item_en) or ""
 
-    def update_excel_with_descriptions(self, excel_file: str):
-        """更新Excel文件，添加描述列"""
+    def run_pipeline(self, journal: BatchJournal, names: Iterable[str],
+                     fetch_concurrency: int = DEFAULT_FETCH_CONCURRENCY, processes: Optional[int] = None):
+        """用流水线获取日志中还没有的描述：并发下载页面，进程池提取描述，写入阶段更新缓存和日志
+
+        缓存中已有的描述不经过流水线；下载失败的道具之后由 get_item_description 逐个重试。
+        """
+        names = [name for name in journal.pending(names) if self.reparse or name not in self.description_cache]
+
+        def write(item_en: str, description: Optional[str]):
+            if not description:
+                self.description_cache.mark_missing(item_en)
+                return
+            self.description_cache[item_en] = description
+            journal.record(item_en, description)
+
+        pipeline = FetchExtractPipeline(lambda name: self.pages.wiki_page(name).text, extract_item_description,
+                                        write, fetch_concurrency=fetch_concurrency, processes=processes,
+                                        desc="获取道具描述", batch=self.description_cache.batch)
+        pipeline.run(names)
+
+    def update_excel_with_descriptions(self, excel_file: str, only_names: Optional[Set[str]] = None,
+                                       restart: bool = False, pipeline: bool = False):
+        """更新Excel文件，添加描述列
+
+        only_names 不为空时只更新这些名称的行（如数据文件更新后新增或变化的记录），其他行保持不变。
+        获取到的描述逐条写入 cache/journals 下的日志，中断后重新运行只处理剩下的道具；
+        restart 为 True 时丢弃上次中断留下的日志；pipeline 为 True 时先用 run_pipeline 并发获取。
+        """
         print("读取Excel文件...")
         wb = load_workbook(excel_file)
         ws = wb.active
@@ -139,21 +180,38 @@ class ItemDescriptionScraper:
         # 设置描述列宽度
         ws.column_dimensions[get_column_letter(desc_col)].width = 100
 
-        print("获取道具描述...")
-        # 遍历所有道具
-        for row in tqdm(range(2, ws.max_row + 1)):
+        # 需要更新的行
+        rows = {}
+        for row in range(2, ws.max_row + 1):
             item_en = ws.cell(row=row, column=name_en_col).value
-            if item_en:
-                description = self.get_item_description(item_en)
-                ws.cell(row=row, column=desc_col, value=description)
+            if item_en and (only_names is None or item_en in only_names):
+                rows[row] = item_en
+
+        print("获取道具描述...")
+        journal = BatchJournal('item_descriptions_reparse' if self.reparse else 'item_descriptions', restart=restart)
+        if pipeline:
+            self.run_pipeline(journal, rows.values())
+        descriptions = run_batch(journal, rows.values(), self.get_item_description)
+        for row, item_en in rows.items():
+            ws.cell(row=row, column=desc_col, value=descriptions.get(item_en, ""))
 
         # 保存更新后的文件
         print("保存更新后的Excel文件...")
         wb.save(excel_file)
+        self._save_cache()
+        journal.complete()
 
 def main():
-    scraper = ItemDescriptionScraper()
-    scraper.update_excel_with_descriptions('output/item_data.xlsx')
+    # --reparse: 从 cache/pages 中保存的页面重新提取描述，不发网络请求
+    scraper = ItemDescriptionScraper(reparse='--reparse' in sys.argv)
+    # --changed-only: 只处理 utils.dataset_diff 记录的新增和变化的道具
+    only_names = load_changed_names('items') if '--changed-only' in sys.argv else None
+    if only_names is not None:
+        print(f"只更新 {len(only_names)} 个新增或变化的道具")
+    # --restart: 不从上次中断的位置继续
+    # --pipeline: 并发下载页面，在多个进程中提取描述
+    scraper.update_excel_with_descriptions('output/item_data.xlsx', only_names, restart='--restart' in sys.argv,
+                                           pipeline='--pipeline' in sys.argv)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
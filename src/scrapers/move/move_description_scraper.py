@@ -1,68 +1,101 @@
-import json
-import time
-import requests
-from bs4 import BeautifulSoup, Tag
-from pathlib import Path
-from tqdm import tqdm
-from typing import Optional, Tuple
+import sys
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+from typing import Iterable, Optional, Set, Tuple
 from openpyxl import load_workbook
 from openpyxl.utils import get_column_letter
+from utils.dataset_diff import load_changed_names
+from utils import HttpClient
+from utils.batch_journal import BatchJournal, run_batch
+from utils.html_parser import parse_html
+from utils.page_fetcher import PageFetchService, shared_page_fetcher
+from utils.pipeline import DEFAULT_FETCH_CONCURRENCY, FetchExtractPipeline
+from utils.tiered_cache import open_tiered_cache
+
+# 技能描述在某个表格的第二行，只解析表格部分
+DESCRIPTION_SCOPE = SoupStrainer('tbody')
+
+
+def find_move_description(soup: BeautifulSoup) -> Optional[str]:
+    """从页面中读取技能描述，页面上没有时返回 None"""
+    # 遍历所有tbody，找到包含技能描述的那个
+    for tbody in soup.find_all('tbody'):
+        trs = tbody.find_all('tr')
+        if len(trs) > 1:  # 确保至少有两行
+            # 获取第二行的td标签
+            td = trs[1].find('td', {'class': 'roundy'})  # 技能描述通常有roundy类
+            if td and td.get('style') and 'font-size:smaller' in td.get('style'):
+                description = td.get_text(strip=True)
+                if description:
+                    return description
+    return None
+
+
+def extract_move_description(text: str) -> Optional[str]:
+    """从页面原文提取技能描述（流水线在子进程中调用）"""
+    return find_move_description(parse_html(text, DESCRIPTION_SCOPE))
 
 class MoveDescriptionScraper:
-    def __init__(self):
-        self.description_cache_file = Path('json/move_descriptions.json')
-        self.description_cache = self._load_cache()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-
-    def _load_cache(self) -> dict:
-        """加载技能描述缓存"""
-        if self.description_cache_file.exists():
-            return json.loads(self.description_cache_file.read_text(encoding='utf-8'))
-        return {}
+    def __init__(self, reparse: bool = False):
+        self.description_cache = open_tiered_cache('move_descriptions')
+        self.session = HttpClient()
+        # reparse: 不使用已提取的描述，只从本地保存的页面重新提取
+        self.reparse = reparse
+        # 与翻译处理器共用页面，reparse 时只读本地保存的页面
+        self.pages = PageFetchService(self.session, mode='offline') if reparse else shared_page_fetcher()
 
     def _save_cache(self):
-        """保存技能描述缓存"""
-        self.description_cache_file.write_text(
-            json.dumps(self.description_cache, ensure_ascii=False, indent=2),
-            encoding='utf-8'
-        )
+        """提交技能描述缓存，并导出到 json/move_descriptions.json"""
+        self.description_cache.export_json()
+        print(self.description_cache.report())
 
     def get_move_description(self, move_en: str) -> str:
         """获取技能的中文描述"""
-        if move_en in self.description_cache:
-            return self.description_cache[move_en]
+        found, description = (False, None) if self.reparse else self.description_cache.lookup(move_en)
+        if found:
+            return description or ""
 
         try:
-            url = f"https://wiki.52poke.com/wiki/{move_en}"
-            response = self.session.get(url, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 找到所有tbody标签
-            tbodies = soup.find_all('tbody')
+            soup = self.pages.wiki_page(move_en).scoped(DESCRIPTION_SCOPE)
+            description = find_move_description(soup)
+            if description:
+                self.description_cache[move_en] = description
+                return description
             
-            # 遍历所有tbody，找到包含技能描述的那个
-            for tbody in tbodies:
-                trs = tbody.find_all('tr')
-                if len(trs) > 1:  # 确保至少有两行
-                    # 获取第二行的td标签
-                    td = trs[1].find('td', {'class': 'roundy'})  # 技能描述通常有roundy类
-                    if td and td.get('style') and 'font-size:smaller' in td.get('style'):
-                        description = td.get_text(strip=True)
-                        if description:
-                            self.description_cache[move_en] = description
-                            self._save_cache()
-                            return description
-            
-            time.sleep(1)
+            # 页面上没有描述，写入负缓存
+            self.description_cache.mark_missing(move_en)
         except Exception as e:
             print(f"获取技能描述失败 {move_en}: {e}")
-        return ""
+        # 获取失败时沿用已过期的旧描述
+        return self.description_cache.peek(move_en) or ""
+
+    def run_pipeline(self, journal: BatchJournal, names: Iterable[str],
+                     fetch_concurrency: int = DEFAULT_FETCH_CONCURRENCY, processes: Optional[int] = None):
+        """用流水线获取日志中还没有的描述：并发下载页面，进程池提取描述，写入阶段更新缓存和日志
 
-    def update_excel_with_descriptions(self, excel_file: str):
-        """更新Excel文件，添加描述列"""
+        缓存中已有的描述不经过流水线；下载失败的技能之后由 get_move_description 逐个重试。
+        """
+        names = [name for name in journal.pending(names) if self.reparse or name not in self.description_cache]
+
+        def write(move_en: str, description: Optional[str]):
+            if not description:
+                self.description_cache.mark_missing(move_en)
+                return
+            self.description_cache[move_en] = description
+            journal.record(move_en, description)
+
+        pipeline = FetchExtractPipeline(lambda name: self.pages.wiki_page(name).text, extract_move_description,
+                                        write, fetch_concurrency=fetch_concurrency, processes=processes,
+                                        desc="获取技能描述", batch=self.description_cache.batch)
+        pipeline.run(names)
+
+    def update_excel_with_descriptions(self, excel_file: str, only_names: Optional[Set[str]] = None,
+                                       restart: bool = False, pipeline: bool = False):
+        """更新Excel文件，添加描述列
+
+        only_names 不为空时只更新这些名称的行（如数据文件更新后新增或变化的记录），其他行保持不变。
+        获取到的描述逐条写入 cache/journals 下的日志，中断后重新运行只处理剩下的技能；
+        restart 为 True 时丢弃上次中断留下的日志；pipeline 为 True 时先用 run_pipeline 并发获取。
+        """
         print("读取Excel文件...")
         wb = load_workbook(excel_file)
         ws = wb.active
@@ -93,21 +126,38 @@ class MoveDescriptionScraper:
         # 设置描述列宽度
         ws.column_dimensions[get_column_letter(desc_col)].width = 100
 
-        print("获取技能描述...")
-        # 遍历所有技能
-        for row in tqdm(range(2, ws.max_row + 1)):
+        # 需要更新的行
+        rows = {}
+        for row in range(2, ws.max_row + 1):
             move_en = ws.cell(row=row, column=name_en_col).value
-            if move_en:
-                description = self.get_move_description(move_en)
-                ws.cell(row=row, column=desc_col, value=description)
+            if move_en and (only_names is None or move_en in only_names):
+                rows[row] = move_en
+
+        print("获取技能描述...")
+        journal = BatchJournal('move_descriptions_reparse' if self.reparse else 'move_descriptions', restart=restart)
+        if pipeline:
+            self.run_pipeline(journal, rows.values())
+        descriptions = run_batch(journal, rows.values(), self.get_move_description)
+        for row, move_en in rows.items():
+            ws.cell(row=row, column=desc_col, value=descriptions.get(move_en, ""))
 
         # 保存更新后的文件
         print("保存更新后的Excel文件...")
         wb.save(excel_file)
+        self._save_cache()
+        journal.complete()
 
 def main():
-    scraper = MoveDescriptionScraper()
-    scraper.update_excel_with_descriptions('output/move_data.xlsx')
+    # --reparse: 从 cache/pages 中保存的页面重新提取描述，不发网络请求
+    scraper = MoveDescriptionScraper(reparse='--reparse' in sys.argv)
+    # --changed-only: 只处理 utils.dataset_diff 记录的新增和变化的技能
+    only_names = load_changed_names('moves') if '--changed-only' in sys.argv else None
+    if only_names is not None:
+        print(f"只更新 {len(only_names)} 个新增或变化的技能")
+    # --restart: 不从上次中断的位置继续
+    # --pipeline: 并发下载页面，在多个进程中提取描述
+    scraper.update_excel_with_descriptions('output/move_data.xlsx', only_names, restart='--restart' in sys.argv,
+                                           pipeline='--pipeline' in sys.argv)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
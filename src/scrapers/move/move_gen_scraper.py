@@ -1,22 +1,22 @@
-import re
 import json
-import requests
-from bs4 import BeautifulSoup
 from pathlib import Path
 from typing import Dict, List
+from utils import HttpClient
+from utils.patterns import WIKI_MOVE_GEN_HEADER
+from utils.html_parser import parse_html
+from utils.endpoints import WIKI_BASE_URL
 
 class MoveGenScraper:
     def __init__(self):
-        self.url = "https://wiki.52poke.com/wiki/招式列表"
+        self.url = f"{WIKI_BASE_URL}招式列表"
         self.output_dir = Path('json')
         self.output_dir.mkdir(exist_ok=True)
+        self.session = HttpClient(user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
         
     def _get_page_content(self) -> str:
         """获取页面内容"""
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(self.url, headers=headers)
+        response = self.session.get(self.url)
+        response.raise_for_status()
         response.encoding = 'utf-8'
         return response.text
         
@@ -43,13 +43,13 @@ class MoveGenScraper:
         """爬取所有世代的招式"""
         print("开始爬取招式数据...")
         content = self._get_page_content()
-        soup = BeautifulSoup(content, 'html.parser')
+        soup = parse_html(content)
         
         # 存储所有世代的招式
         moves_by_gen = {}
         
         # 查找所有世代的标题
-        gen_pattern = re.compile(r'第([一二三四五六七八九])世代')
+        gen_pattern = WIKI_MOVE_GEN_HEADER
         gen_headers = soup.find_all('span', {'class': 'mw-headline'})
         
         for header in gen_headers:
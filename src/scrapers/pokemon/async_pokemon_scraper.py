@@ -0,0 +1,96 @@
+"""并发爬取宝可梦页面
+
+PokemonWebScraper 一次只请求一个页面，延迟都花在等待响应上。这里用 asyncio
+同时发出多个请求：
+
+- concurrency 限制同时进行的请求数
+- limiter 是按主机的限速器，默认与其他爬虫共用自适应的 HOST_LIMITS，
+  服务器响应正常时逐步提速，遇到 429/5xx/超时时减速
+- base_url 可以指向本地的 HTTP 服务，方便离线测试
+
+HttpClient 是阻塞的，下载和解析在专用线程池中执行，线程数与 concurrency 相同；
+重试退避和限速等待都发生在线程里，不阻塞事件循环，重试之间不再额外等待。
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+from pokemon_web_scraper import PokemonWebScraper
+from utils import HOST_LIMITS, HostRateLimiter, HttpClient
+from utils.page_store import PageNotStored
+from utils.endpoints import WIKI_BASE_URL
+
+
+class AsyncPokemonWebScraper:
+    def __init__(self, concurrency: int = 8, max_retries: int = 3,
+                 base_url: str = WIKI_BASE_URL,
+                 limiter: Optional[HostRateLimiter] = HOST_LIMITS, page_mode: str = 'cache'):
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        # 连接池大小与并发数一致，避免连接被反复丢弃重建
+        session = HttpClient(pool_size=concurrency, limiter=limiter)
+        self.scraper = PokemonWebScraper(base_url=base_url, session=session, page_mode=page_mode)
+
+    async def _scrape_one(self, name_en: str, semaphore: asyncio.Semaphore,
+                          executor: ThreadPoolExecutor) -> Tuple[str, Optional[Dict]]:
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_retries):
+            async with semaphore:
+                try:
+                    # 同一物种的各形态共用一个页面，同时请求时只下载一次
+                    info = await loop.run_in_executor(executor, self.scraper.scrape_once, name_en)
+                    return name_en, info
+                except PageNotStored:
+                    print(f"本地没有保存{name_en}的页面")
+                    return name_en, None
+                except Exception as e:
+                    if attempt == self.max_retries - 1:
+                        print(f"获取{name_en}的详细信息失败: {e}")
+        return name_en, None
+
+    async def iter_pokemon_info(self, names: Iterable[str]) -> AsyncIterator[Tuple[str, Optional[Dict]]]:
+        """按完成顺序逐个产出 (英文名称, 信息)，失败时信息为 None"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            tasks = [asyncio.ensure_future(self._scrape_one(name, semaphore, executor)) for name in names]
+            try:
+                for task in asyncio.as_completed(tasks):
+                    yield await task
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    async def scrape_all_async(self, names: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        names = list(names)
+        results = {}
+        async for name_en, info in self.iter_pokemon_info(names):
+            results[name_en] = info
+        # 保持输入顺序
+        return {name: results.get(name) for name in names}
+
+    def scrape_all(self, names: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        """同步入口，返回 {英文名称: 信息}，顺序与输入一致"""
+        return asyncio.run(self.scrape_all_async(names))
+
+
+def main():
+    import sys
+    # 用法: python async_pokemon_scraper.py [--base-url URL] 名称...
+    args = sys.argv[1:]
+    base_url = WIKI_BASE_URL
+    if '--base-url' in args:
+        index = args.index('--base-url')
+        base_url = args[index + 1]
+        del args[index:index + 2]
+    names: List[str] = args or ['Bulbasaur', 'Charmander', 'Squirtle']
+
+    scraper = AsyncPokemonWebScraper(base_url=base_url)
+    start = time.perf_counter()
+    results = scraper.scrape_all(names)
+    elapsed = time.perf_counter() - start
+    succeeded = sum(1 for info in results.values() if info)
+    print(f"\n完成 {succeeded}/{len(names)} 个页面，耗时 {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
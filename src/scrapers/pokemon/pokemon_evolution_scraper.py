@@ -1,8 +1,6 @@
-import time
 import pandas as pd
 from pathlib import Path
 from typing import Dict, Optional, Tuple
-from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -11,11 +9,14 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 from tqdm import tqdm
-import re
+from utils import HOST_LIMITS
+from utils.patterns import EVOLVES_FROM, PARENTHESIZED
+from utils.html_parser import parse_html
+from utils.endpoints import SHOWDOWN_POKEMON_URL
 
 class PokemonEvolutionScraper:
     def __init__(self):
-        self.base_url = "https://dex.pokemonshowdown.com/pokemon/{name_en}"
+        self.base_url = SHOWDOWN_POKEMON_URL + "{name_en}"
         
         # 设置Chrome选项
         chrome_options = Options()
@@ -36,6 +37,8 @@ class PokemonEvolutionScraper:
         """获取宝可梦的进化信息"""
         try:
             url = self.base_url.format(name_en=name_en.lower())
+            # 浏览器请求也按主机限速，间隔随 HttpClient 请求的反馈调整
+            HOST_LIMITS.acquire(url)
             self.driver.get(url)
             
             # 等待页面加载完成
@@ -43,7 +46,7 @@ class PokemonEvolutionScraper:
                 EC.presence_of_element_located((By.CSS_SELECTOR, "body"))
             )
             
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            soup = parse_html(self.driver.page_source)
             
             # 找到进化信息的dd标签
             table = soup.find('table', class_='evos')
@@ -59,9 +62,9 @@ class PokemonEvolutionScraper:
             if small_tag and 'Evolves from' in small_tag.text:
                 # 提取进化等级和原始宝可梦名称
                 evolution_text = small_tag.text
-                level_match = re.search(r'\((.*?)\)', evolution_text)
+                level_match = PARENTHESIZED.search(evolution_text)
                 # pokemon_match = re.search(r'Evolves from ([^(]+)', evolution_text)
-                pokemon_match = re.search(r'Evolves from (\w+)', evolution_text)       
+                pokemon_match = EVOLVES_FROM.search(evolution_text)
                 if level_match and pokemon_match:
                     level = level_match.group(1)
                     base_pokemon = pokemon_match.group(1).strip()
@@ -107,7 +110,6 @@ class PokemonEvolutionScraper:
                 if result:
                     base_pokemon, evolution_info = result
                     df.loc[df['宝可梦'] == base_pokemon, '进化条件'] = evolution_info
-                time.sleep(0.5)
             
             print("\n进化信息已更新到LevelUpMoves表")
 
@@ -153,7 +155,6 @@ def test_evolution_scraper():
             print(f"进化信息: {evolution_info}")
         else:
             print("没有进化信息")
-        time.sleep(0.5)
     
     scraper.__del__()
 
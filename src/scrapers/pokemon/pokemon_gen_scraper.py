@@ -1,8 +1,6 @@
-import re
 import json
 from pathlib import Path
 from typing import Optional, List
-from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -11,14 +9,17 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 import time
+from utils.patterns import SHOWDOWN_GEN_HEADER
+from utils.html_parser import parse_html
+from utils.endpoints import SHOWDOWN_POKEMON_URL
 
 class PokemonGenScraper:
     def __init__(self):
-        self.base_url = "https://dex.pokemonshowdown.com/pokemon/"
+        self.base_url = SHOWDOWN_POKEMON_URL
         self.output_dir = Path('json')
         self.output_dir.mkdir(exist_ok=True)
         # 查找所有世代的标题
-        self.gen_pattern = re.compile(r'Generation ([1-9])')
+        self.gen_pattern = SHOWDOWN_GEN_HEADER
         # 设置Chrome选项
         chrome_options = Options()
         chrome_options.add_argument('--headless')  # 无头模式
@@ -70,7 +71,7 @@ class PokemonGenScraper:
             time.sleep(2)  # 最后等待一下确保所有内容都加载完成
             
             # 获取渲染后的页面源码
-            return BeautifulSoup(self.driver.page_source, 'html.parser')
+            return parse_html(self.driver.page_source)
             
         except Exception as e:
             print(f"加载页面时出错: {e}")
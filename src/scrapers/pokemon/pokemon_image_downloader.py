@@ -1,9 +1,6 @@
-import time
-import requests
 import pandas as pd
 from pathlib import Path
 from typing import Optional, List
-from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -12,10 +9,14 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 from tqdm import tqdm
+from utils import HOST_LIMITS, HttpClient
+from utils.html_parser import parse_html
+from utils.endpoints import SHOWDOWN_POKEMON_URL
 
 class PokemonImageDownloader:
     def __init__(self):
-        self.base_url = "https://dex.pokemonshowdown.com/pokemon/{name_en}"
+        self.base_url = SHOWDOWN_POKEMON_URL + "{name_en}"
+        self.session = HttpClient()
         self.image_dir = Path('images')
         self.image_dir.mkdir(parents=True, exist_ok=True)
         
@@ -46,6 +47,8 @@ class PokemonImageDownloader:
         try:
             # 访问页面
             url = self.base_url.format(name_en=name_en.lower())
+            # 浏览器请求也按主机限速，间隔随 HttpClient 请求的反馈调整
+            HOST_LIMITS.acquire(url)
             self.driver.get(url)
             
             # 等待页面加载完成
@@ -54,7 +57,7 @@ class PokemonImageDownloader:
             )
             
             # 获取渲染后的页面源码
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            soup = parse_html(self.driver.page_source)
             img = None
             
             # 方法1: 通过类型标签查找
@@ -97,7 +100,7 @@ class PokemonImageDownloader:
                     img_url = "https:" + img_url
                 
                 # 下载图片
-                response = requests.get(img_url, stream=True)
+                response = self.session.get(img_url, stream=True)
                 if response.status_code == 200:
                     with open(file_path, 'wb') as f:
                         for chunk in response.iter_content(chunk_size=8192):
@@ -157,7 +160,6 @@ class PokemonImageDownloader:
                     success_count += 1
                 else:
                     failed_names.append(pokemon)
-                time.sleep(0.5)  # 添加短暂延迟
             
             # 保存更新后的Excel文件
             print("\n保存更新后的Excel文件...")
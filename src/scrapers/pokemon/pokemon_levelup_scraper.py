@@ -1,8 +1,7 @@
-import time
+import sys
 import pandas as pd
 from pathlib import Path
 from typing import Dict, List
-from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -10,11 +9,14 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
-from tqdm import tqdm
+from utils import HOST_LIMITS
+from utils.batch_journal import BatchJournal, run_batch
+from utils.html_parser import parse_html
+from utils.endpoints import SHOWDOWN_POKEMON_URL
 
 class PokemonLevelUpScraper:
     def __init__(self):
-        self.base_url = "https://dex.pokemonshowdown.com/pokemon/{name_en}"
+        self.base_url = SHOWDOWN_POKEMON_URL + "{name_en}"
         
         # 设置Chrome选项
         chrome_options = Options()
@@ -35,6 +37,8 @@ class PokemonLevelUpScraper:
         """获取宝可梦的升级技能"""
         try:
             url = self.base_url.format(name_en=name_en.lower())
+            # 浏览器请求也按主机限速，间隔随 HttpClient 请求的反馈调整
+            HOST_LIMITS.acquire(url)
             self.driver.get(url)
             
             # 等待页面加载完成
@@ -42,7 +46,7 @@ class PokemonLevelUpScraper:
                 EC.presence_of_element_located((By.CSS_SELECTOR, "body"))
             )
             
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            soup = parse_html(self.driver.page_source)
             moves_dict = {}  # 改用字典存储等级对应的技能列表
             
             # 找到Level-up标题
@@ -83,8 +87,12 @@ class PokemonLevelUpScraper:
             print(f"获取{name_en}的升级技能失败: {e}")
             return {}
 
-    def update_excel_with_levelup_moves(self, excel_file: str):
-        """更新Excel文件，添加升级技能信息"""
+    def update_excel_with_levelup_moves(self, excel_file: str, restart: bool = False):
+        """更新Excel文件，添加升级技能信息
+
+        每个宝可梦的结果写入 cache/journals/pokemon_levelup.jsonl，中断后重新运行只获取剩下的；
+        restart 为 True 时丢弃上次中断留下的日志。
+        """
         try:
             print(f"读取Excel文件: {excel_file}")
             # 读取现有的Excel文件
@@ -95,12 +103,13 @@ class PokemonLevelUpScraper:
                 pokemon_names = df['英文名称'].dropna().unique().tolist()
                 print(f"找到 {len(pokemon_names)} 个宝可梦")
                 
+                # 获取每个宝可梦的升级技能
+                journal = BatchJournal('pokemon_levelup', restart=restart)
+                results = run_batch(journal, pokemon_names, self.get_levelup_moves, desc="获取升级技能")
+
                 # 创建新的DataFrame来存储升级技能信息
                 levelup_data = []
-                
-                # 获取每个宝可梦的升级技能
-                for pokemon in tqdm(pokemon_names, desc="获取升级技能"):
-                    moves = self.get_levelup_moves(pokemon)
+                for pokemon, moves in results.items():
                     if moves:
                         # 将技能信息格式化为字符串
                         moves_str = []
@@ -117,7 +126,6 @@ class PokemonLevelUpScraper:
                             '宝可梦': pokemon,
                             '升级技能': ' '.join(moves_str)
                         })
-                    time.sleep(0.5)
                 
                 # 创建新的DataFrame
                 df_levelup = pd.DataFrame(levelup_data)
@@ -138,6 +146,7 @@ class PokemonLevelUpScraper:
                     worksheet.column_dimensions['B'].width = 100  # 升级技能列
                 
                 print("\n升级技能信息已保存到新的sheet页: LevelUpMoves")
+                journal.complete()
                 
         except Exception as e:
             print(f"更新Excel文件失败: {e}")
@@ -151,7 +160,8 @@ def main():
     scraper = PokemonLevelUpScraper()
     excel_file = 'output/pokemon_data.xlsx'
     print("开始获取升级技能信息...")
-    scraper.update_excel_with_levelup_moves(excel_file)
+    # --restart: 不从上次中断的位置继续
+    scraper.update_excel_with_levelup_moves(excel_file, restart='--restart' in sys.argv)
     scraper.__del__()
 
         # 测试几个典型的宝可梦
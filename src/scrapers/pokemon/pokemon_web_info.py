@@ -1,20 +1,101 @@
-import json
+import sys
+import asyncio
 import pandas as pd
 from pathlib import Path
+from typing import Dict, List, Optional
 from tqdm import tqdm
-from pokemon_web_scraper import PokemonWebScraper
+from pokemon_web_scraper import POKEDEX_REGIONS, PokemonWebScraper, extract_species_info
+from async_pokemon_scraper import AsyncPokemonWebScraper
+from utils.batch_journal import BatchJournal, run_batch
+from utils.cache_store import open_cache
+from utils.pipeline import DEFAULT_FETCH_CONCURRENCY, FetchExtractPipeline
+from utils.pokemon_infobox import group_by_species
+from utils.ts_offset_index import TSOffsetIndex
 
 class PokemonWebInfoProcessor:
-    def __init__(self):
-        self.cache_file = Path('pokemon_name_cache.json')
-        self.web_scraper = PokemonWebScraper()
+    def __init__(self, page_mode: str = 'cache'):
+        self.name_cache = open_cache('pokemon_names')
+        self.page_mode = page_mode
+        self.web_scraper = PokemonWebScraper(page_mode=page_mode)
         
-    def process_web_data(self, output_file: str):
-        """处理网页数据并生成新表格"""
+    def _flatten_info(self, info: Optional[Dict]) -> Dict:
+        """把爬取结果展开成表格的一行，获取失败时填充空值"""
+        if not info:
+            row = {
+                'category_cn': '', 'abilities_normal': '', 'ability_hidden': '',
+                'catch_rate': '', 'base_exp': '', 'egg_groups': '',
+                'egg_cycles': '', 'gender_ratio': '',
+                'ev_hp': 0, 'ev_atk': 0, 'ev_def': 0,
+                'ev_spa': 0, 'ev_spd': 0, 'ev_spe': 0,
+            }
+            row.update({f'dex_{region}': '' for region in POKEDEX_REGIONS})
+            return row
+
+        info = dict(info)
+        # 处理基础点数（EV）数据
+        ev_yield = info.pop('ev_yield')
+        info['ev_hp'] = ev_yield.get('HP', 0)
+        info['ev_atk'] = ev_yield.get('攻击', 0)
+        info['ev_def'] = ev_yield.get('防御', 0)
+        info['ev_spa'] = ev_yield.get('特攻', 0)
+        info['ev_spd'] = ev_yield.get('特防', 0)
+        info['ev_spe'] = ev_yield.get('速度', 0)
+
+        # 处理地区图鉴编号
+        pokedex = info.pop('pokedex_numbers')
+        for region in POKEDEX_REGIONS:
+            info[f'dex_{region}'] = pokedex.get(region, '')
+        return info
+
+    def _scrape_concurrently(self, journal: BatchJournal, names: List[str], concurrency: int):
+        """并发爬取日志中还没有的页面，每完成一个就写入日志"""
+        pending = journal.pending(names)
+        if len(journal):
+            print(f"从 {journal.path} 恢复 {len(names) - len(pending)} 条结果，剩余 {len(pending)} 条")
+        scraper = AsyncPokemonWebScraper(concurrency=concurrency, base_url=self.web_scraper.base_url,
+                                         page_mode=self.page_mode)
+
+        async def collect():
+            with tqdm(total=len(pending), desc=f"爬取网页数据（并发 {concurrency}）") as progress:
+                async for name_en, info in scraper.iter_pokemon_info(pending):
+                    if info:
+                        journal.record(name_en, info)
+                    progress.update(1)
+
+        asyncio.run(collect())
+
+    def _scrape_pipeline(self, journal: BatchJournal, names: List[str], concurrency: int):
+        """用流水线爬取日志中还没有的名称：并发下载物种页面，进程池提取信息，写入阶段写日志
+
+        每个物种只下载和解析一次基础页面；页面中找不到的形态和下载失败的名称之后逐个爬取。
+        """
+        species = group_by_species(journal.pending(names))
+
+        def fetch(base_name: str):
+            return self.web_scraper.fetch_page(base_name), species[base_name]
+
+        def write(base_name: str, infos: Dict[str, Optional[Dict]]):
+            for name_en, info in infos.items():
+                if info:
+                    journal.record(name_en, info)
+
+        pipeline = FetchExtractPipeline(fetch, extract_species_info, write, fetch_concurrency=concurrency,
+                                        desc="爬取网页数据（流水线）")
+        pipeline.run(species)
+
+    def process_web_data(self, output_file: str, concurrency: int = 1, restart: bool = False,
+                         pipeline: bool = False):
+        """处理网页数据并生成新表格，concurrency 大于1时并发爬取
+
+        pipeline 为 True 时先用流水线爬取（下载和提取分开，提取在多个进程中执行），剩下的再逐个爬取。
+
+        每爬完一个页面就写入 cache/journals/pokemon_web_info.jsonl，中断后重新运行只爬取剩下的页面，
+        表格由日志中的结果生成；restart 为 True 时丢弃上次中断留下的日志。
+        """
         print("读取宝可梦名称缓存...")
-        with open(self.cache_file, 'r', encoding='utf-8') as f:
-            name_cache = json.load(f)
-            
+        # 负缓存中查不到的名称没有值，跳过
+        name_cache = {name_en: name_cn for name_en, name_cn in self.name_cache.items() if name_cn}
+
         # 创建基础数据框
         df = pd.DataFrame({
             'name_en': list(name_cache.keys()),
@@ -23,41 +104,22 @@ class PokemonWebInfoProcessor:
         
         # 添加网页数据爬取部分
         print("从网页获取额外信息...")
-        web_data = []
-        for name_en in tqdm(df['name_en'], desc="爬取网页数据"):
-            info = self.web_scraper.scrape_pokemon_info(name_en)
-            if info:
-                # 处理基础点数（EV）数据
-                ev_yield = info['ev_yield']
-                info['ev_hp'] = ev_yield.get('HP', 0)
-                info['ev_atk'] = ev_yield.get('攻击', 0)
-                info['ev_def'] = ev_yield.get('防御', 0)
-                info['ev_spa'] = ev_yield.get('特攻', 0)
-                info['ev_spd'] = ev_yield.get('特防', 0)
-                info['ev_spe'] = ev_yield.get('速度', 0)
-                
-                # 处理地区图鉴编号
-                pokedex = info['pokedex_numbers']
-                for region in ['关都', '城都', '丰缘', '神奥', '合众', '卡洛斯', '阿罗拉', '伽勒尔', '帕底亚']:
-                    info[f'dex_{region}'] = pokedex.get(region, '')
-                
-                # 删除已处理的字典
-                del info['ev_yield']
-                del info['pokedex_numbers']
-            else:
-                # 如果获取失败，填充空值
-                info = {
-                    'category_cn': '', 'abilities_normal': '', 'ability_hidden': '',
-                    'catch_rate': '', 'base_exp': '', 'egg_groups': '',
-                    'egg_cycles': '', 'gender_ratio': '',
-                    'ev_hp': 0, 'ev_atk': 0, 'ev_def': 0,
-                    'ev_spa': 0, 'ev_spd': 0, 'ev_spe': 0,
-                    'dex_关都': '', 'dex_城都': '', 'dex_丰缘': '',
-                    'dex_神奥': '', 'dex_合众': '', 'dex_卡洛斯': '',
-                    'dex_阿罗拉': '', 'dex_伽勒尔': '', 'dex_帕底亚': ''
-                }
-            web_data.append(info)
-            
+        names = list(df['name_en'])
+        # 同一物种的各形态排在一起爬取，共用基础物种的页面
+        species = group_by_species(names)
+        print(f"{len(names)} 个宝可梦属于 {len(species)} 个物种")
+        ordered = [name_en for group in species.values() for name_en in group]
+        journal = BatchJournal('pokemon_web_info', restart=restart)
+        if pipeline:
+            self._scrape_pipeline(journal, ordered, concurrency if concurrency > 1 else DEFAULT_FETCH_CONCURRENCY)
+            results = run_batch(journal, ordered, self.web_scraper.scrape_pokemon_info, desc="爬取剩余的网页数据")
+        elif concurrency and concurrency > 1:
+            self._scrape_concurrently(journal, ordered, concurrency)
+            results = journal.results(names)
+        else:
+            results = run_batch(journal, ordered, self.web_scraper.scrape_pokemon_info, desc="爬取网页数据")
+        web_data = [self._flatten_info(results.get(name_en)) for name_en in names]
+
         # 将网页数据添加到DataFrame
         web_df = pd.DataFrame(web_data)
         df = pd.concat([df, web_df], axis=1)
@@ -100,6 +162,7 @@ class PokemonWebInfoProcessor:
         # 保存到Excel
         print(f"保存数据到 {output_file}")
         df.to_excel(output_file, index=False)
+        journal.complete()
 
 def test_scraper():
     """测试爬虫功能"""
@@ -107,6 +170,12 @@ def test_scraper():
     test_pokemon = "Meowth"  # 测试尼多娜
     print(f"\n测试爬取 {test_pokemon} 的数据...")
     
+    # 只读取这一条图鉴记录用于对照，不解析整个 pokedex.ts
+    with TSOffsetIndex('data/pokedex.ts') as pokedex:
+        record = pokedex.get(test_pokemon)
+    if record:
+        print(f"Showdown数据: 属性 {record.get('types')}, 特性 {record.get('abilities')}")
+    
     info = scraper.scrape_pokemon_info(test_pokemon)
     if info:
         print("\n爬取结果：")
@@ -116,14 +185,26 @@ def test_scraper():
         print("爬取失败")
 
 def main():
+    # --concurrency N: 同时爬取 N 个页面，默认逐个爬取
+    concurrency = 1
+    if '--concurrency' in sys.argv:
+        concurrency = int(sys.argv[sys.argv.index('--concurrency') + 1])
+    # --offline: 只用 cache/pages 中保存的页面重新提取；--refresh: 用条件请求检查页面是否更新
+    page_mode = 'offline' if '--offline' in sys.argv else 'refresh' if '--refresh' in sys.argv else 'cache'
+    # --restart: 不从上次中断的位置继续，重新爬取全部页面
+    restart = '--restart' in sys.argv
+    # --pipeline: 下载和提取分开，页面在多个进程中解析（--concurrency 为下载并发数）
+    pipeline = '--pipeline' in sys.argv
+
     # 先测试爬虫
     test_scraper()
     
     # 确认是否继续处理所有数据
     response = input("\n是否继续处理所有宝可梦数据？(y/n): ")
     if response.lower() == 'y':
-        processor = PokemonWebInfoProcessor()
-        processor.process_web_data('output/pokemon_web_info.xlsx')
+        processor = PokemonWebInfoProcessor(page_mode=page_mode)
+        processor.process_web_data('output/pokemon_web_info.xlsx', concurrency=concurrency, restart=restart,
+                                   pipeline=pipeline)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
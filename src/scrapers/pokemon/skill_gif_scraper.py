@@ -1,8 +1,6 @@
-import time
 import pandas as pd
 from pathlib import Path
 from typing import Dict, List
-from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -11,12 +9,15 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 from tqdm import tqdm
-import requests
+from utils import HOST_LIMITS, HttpClient
+from utils.html_parser import parse_html
+from utils.endpoints import SHOWDOWN_POKEMON_URL
 from openpyxl.utils import get_column_letter
 
 class SkillGifScraper:
     def __init__(self):
-        self.base_url = "https://dex.pokemonshowdown.com/pokemon/{name_en}"
+        self.base_url = SHOWDOWN_POKEMON_URL + "{name_en}"
+        self.session = HttpClient()
         
         # 设置Chrome选项
         chrome_options = Options()
@@ -37,6 +38,8 @@ class SkillGifScraper:
         """获取宝可梦的GIF图片URL"""
         try:
             url = self.base_url.format(name_en=name_en.lower())
+            # 浏览器请求也按主机限速，间隔随 HttpClient 请求的反馈调整
+            HOST_LIMITS.acquire(url)
             self.driver.get(url)
             
             # 等待页面加载完成
@@ -55,7 +58,7 @@ class SkillGifScraper:
                 EC.presence_of_element_located((By.CSS_SELECTOR, "table.sprites img"))
             )
             
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            soup = parse_html(self.driver.page_source)
             
             # 获取所有GIF图片URL
             gif_urls = {}
@@ -99,7 +102,7 @@ class SkillGifScraper:
                 file_path = pokemon_dir / file_name
                 
                 # 下载文件
-                response = requests.get(url, stream=True)
+                response = self.session.get(url, stream=True)
                 if response.status_code == 200:
                     with open(file_path, 'wb') as f:
                         for chunk in response.iter_content(chunk_size=8192):
@@ -144,7 +147,6 @@ class SkillGifScraper:
                     mask = df['英文名称'] == pokemon
                     if local_path:
                         df.loc[mask, 'GIF路径'] = local_path
-                time.sleep(0.5)
             
             # 保存更新后的数据
             with pd.ExcelWriter(excel_file, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
@@ -1,3 +1,16 @@
 from .translations import FORM_TRANSLATIONS, SPECIAL_FORM_NAMES, TYPE_TRANSLATIONS
+from .patterns import PATTERNS, PatternRegistry, TimedPattern
+from .ts_parser import PARSER_VERSION, TSParseError, load_ts_file, parse_ts_export, parse_ts_value, scan_ts_spans
+from .dataset_cache import DATA_FILES, load_ts_dataset
+from .dataset_index import RecordIndex, to_id
+from .rate_controller import AdaptiveHostLimiter, AdaptiveRateController
+from .http_client import HOST_LIMITS, HostRateLimiter, HttpClient, TokenBucket
 
-__all__ = ['FORM_TRANSLATIONS', 'SPECIAL_FORM_NAMES', 'TYPE_TRANSLATIONS'] 
\ No newline at end of file
+__all__ = [
+    'FORM_TRANSLATIONS', 'SPECIAL_FORM_NAMES', 'TYPE_TRANSLATIONS',
+    'PATTERNS', 'PatternRegistry', 'TimedPattern',
+    'PARSER_VERSION', 'TSParseError', 'load_ts_file', 'parse_ts_export', 'parse_ts_value', 'scan_ts_spans',
+    'DATA_FILES', 'load_ts_dataset', 'RecordIndex', 'to_id',
+    'AdaptiveHostLimiter', 'AdaptiveRateController',
+    'HOST_LIMITS', 'HostRateLimiter', 'HttpClient', 'TokenBucket'
+]
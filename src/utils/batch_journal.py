@@ -0,0 +1,112 @@
+"""可断点续跑的批处理日志
+
+批量爬取原来把结果都放在内存里，最后才写 Excel，中途出错或按 Ctrl-C 会丢掉全部结果。
+BatchJournal 把每条完成的结果立即追加到 cache/journals/<名称>.jsonl（每行一个
+{"key": ..., "value": ...}），重新运行时读取日志，只处理还没有完成的条目，最后用日志中的
+结果生成表格。表格保存成功后调用 complete() 删除日志，下次运行重新开始。
+
+    journal = BatchJournal('pokemon_web_info')
+    results = run_batch(journal, names, scraper.scrape_pokemon_info, desc="爬取网页数据")
+    ...  # 用 results 生成表格
+    journal.complete()
+
+结果为空（失败）的条目不写入日志，重新运行时会再试一次。
+"""
+import json
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from tqdm import tqdm
+
+JOURNAL_DIR = Path('cache/journals')
+
+
+class BatchJournal:
+    """追加写入的 JSONL 结果日志，线程安全"""
+
+    def __init__(self, name: str, root=JOURNAL_DIR, restart: bool = False):
+        self.path = Path(root) / f"{name}.jsonl"
+        if restart and self.path.exists():
+            self.path.unlink()
+        self.entries: Dict[str, Any] = self._load()
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Any]:
+        entries = {}
+        if not self.path.exists():
+            return entries
+        with self.path.open(encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # 进程中断时最后一行可能只写了一半
+                    continue
+                entries[record['key']] = record['value']
+        return entries
+
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        needs_newline = self.path.exists() and self.path.stat().st_size > 0 and \
+            not self.path.read_bytes().endswith(b'\n')
+        self._file = self.path.open('a', encoding='utf-8')
+        if needs_newline:
+            self._file.write('\n')
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def pending(self, keys: Iterable[str]) -> List[str]:
+        """还没有完成的键（去重并保持顺序）"""
+        return [key for key in dict.fromkeys(keys) if key not in self.entries]
+
+    def record(self, key: str, value: Any):
+        """写入一条完成的结果，立即刷新到磁盘"""
+        line = json.dumps({'key': key, 'value': value}, ensure_ascii=False)
+        with self._lock:
+            if self._file is None:
+                self._open()
+            self._file.write(line + '\n')
+            self._file.flush()
+            self.entries[key] = value
+
+    def results(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """按 keys 的顺序返回已完成的结果"""
+        return {key: self.entries[key] for key in keys if key in self.entries}
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def complete(self):
+        """全部处理完并保存结果后删除日志"""
+        self.close()
+        if self.path.exists():
+            self.path.unlink()
+
+    def __enter__(self) -> 'BatchJournal':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def run_batch(journal: BatchJournal, keys: Iterable[str], work: Callable[[str], Any],
+              desc: Optional[str] = None, keep: Callable[[Any], bool] = bool) -> Dict[str, Any]:
+    """对日志中没有的键依次调用 work，keep(结果) 为真时写入日志，返回所有已完成的结果"""
+    keys = list(keys)
+    pending = journal.pending(keys)
+    if len(journal):
+        print(f"从 {journal.path} 恢复 {len(keys) - len(pending)} 条结果，剩余 {len(pending)} 条")
+    for key in tqdm(pending, desc=desc):
+        value = work(key)
+        if keep(value):
+            journal.record(key, value)
+    return journal.results(keys)
@@ -0,0 +1,278 @@
+"""翻译和描述缓存的 SQLite 存储
+
+原来每个缓存都是 json/ 下的一个完整 JSON 文件，每新增一条就整个重写一次。现在所有
+缓存保存在同一个 SQLite 数据库（cache/cache_store.sqlite3，WAL 模式）的一张表里：
+
+    entries(namespace, key, value, updated_at)
+
+value 是 JSON 文本，NULL 表示"查询过但没有结果"。写入是按键 upsert，每次写入立即提交：
+事务很短，爬虫在两次写入之间做网络请求时不会占着写锁，多个线程或进程可以同时读写同一个数据库。
+连续的批量写入（批量查询标题的结果、流水线写入阶段已经就绪的结果、导入 JSON）放在 batch() 中
+合并为一个事务，块内不做网络请求。进程退出时自动关闭默认的数据库连接。
+
+json/*.json 仍然保留：某个命名空间第一次打开且为空时自动导入对应的 JSON 文件，
+处理结束后调用 export_json() 写回，保持与原格式兼容。
+
+用法（项目根目录）:
+    PYTHONPATH=src python -m utils.cache_store                  # 查看各命名空间的条目数
+    PYTHONPATH=src python -m utils.cache_store export [命名空间...]
+    PYTHONPATH=src python -m utils.cache_store import [命名空间...]
+"""
+import atexit
+import json
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, MutableMapping, Optional, Tuple
+
+CACHE_DB_FILE = Path('cache/cache_store.sqlite3')
+
+# 命名空间 -> 兼容的 JSON 文件
+JSON_CACHE_FILES = {
+    'pokemon_names': Path('json/pokemon_name_cache.json'),
+    'ability_translations': Path('json/ability_translations.json'),
+    'item_translations': Path('json/item_translations.json'),
+    'move_translations': Path('json/move_translations.json'),
+    'ability_descriptions': Path('json/ability_descriptions.json'),
+    'item_descriptions': Path('json/item_descriptions.json'),
+    'move_descriptions': Path('json/move_descriptions.json'),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT,
+    updated_at REAL NOT NULL,
+    UNIQUE (namespace, key)
+)
+"""
+
+
+class CacheStore:
+    """SQLite 缓存数据库，所有命名空间共用一个连接"""
+
+    def __init__(self, path=CACHE_DB_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # 一个连接加锁即可：SQLite 同一时间只允许一个写事务
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._closed = False
+
+    def _write(self, sql: str, params: Tuple) -> sqlite3.Cursor:
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            if not self._batch_depth:
+                self._conn.commit()
+            return cursor
+
+    @contextmanager
+    def batch(self):
+        """块内的写入在块结束时一次提交；块内不要做网络请求，否则会一直占着写锁"""
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self.flush()
+
+    def flush(self):
+        """提交尚未提交的写入"""
+        with self._lock:
+            if not self._closed and self._conn.in_transaction:
+                self._conn.commit()
+
+    def get_entry(self, namespace: str, key: str) -> Optional[Tuple[Optional[str], float]]:
+        """返回 (JSON文本或None, 更新时间)，没有该键时返回 None"""
+        with self._lock:
+            return self._conn.execute(
+                'SELECT value, updated_at FROM entries WHERE namespace = ? AND key = ?', (namespace, key)
+            ).fetchone()
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        entry = self.get_entry(namespace, key)
+        if entry is None or entry[0] is None:
+            return default
+        return json.loads(entry[0])
+
+    def contains(self, namespace: str, key: str) -> bool:
+        return self.get_entry(namespace, key) is not None
+
+    def set(self, namespace: str, key: str, value: Any):
+        """写入一条缓存，value 为 None 时保存为 NULL"""
+        raw = None if value is None else json.dumps(value, ensure_ascii=False)
+        self._write(
+            'INSERT INTO entries (namespace, key, value, updated_at) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at',
+            (namespace, key, raw, time.time()),
+        )
+
+    def delete(self, namespace: str, key: str) -> bool:
+        cursor = self._write('DELETE FROM entries WHERE namespace = ? AND key = ?', (namespace, key))
+        return cursor.rowcount > 0
+
+    def keys(self, namespace: str) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT key FROM entries WHERE namespace = ? ORDER BY rowid', (namespace,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def key_times(self, namespace: str) -> List[Tuple[str, bool, float]]:
+        """按写入顺序返回 (键, 是否为 NULL, 更新时间)，不解析值"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT key, value IS NULL, updated_at FROM entries WHERE namespace = ? ORDER BY rowid',
+                (namespace,),
+            ).fetchall()
+        return [(key, bool(is_null), updated_at) for key, is_null, updated_at in rows]
+
+    def items(self, namespace: str) -> List[Tuple[str, Any]]:
+        """按写入顺序返回有值的条目（不含 NULL）"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT key, value FROM entries WHERE namespace = ? AND value IS NOT NULL ORDER BY rowid',
+                (namespace,),
+            ).fetchall()
+        return [(key, json.loads(value)) for key, value in rows]
+
+    def count(self, namespace: str) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM entries WHERE namespace = ?', (namespace,)).fetchone()[0]
+
+    def namespaces(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute('SELECT namespace, COUNT(*) FROM entries GROUP BY namespace').fetchall()
+        return dict(rows)
+
+    def import_json(self, namespace: str, path) -> int:
+        """把 JSON 文件中的 {键: 值} 导入命名空间，返回导入条数"""
+        data = json.loads(Path(path).read_text(encoding='utf-8'))
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                'INSERT INTO entries (namespace, key, value, updated_at) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at',
+                [(namespace, key, json.dumps(value, ensure_ascii=False), now) for key, value in data.items()],
+            )
+            if not self._batch_depth:
+                self._conn.commit()
+        return len(data)
+
+    def export_json(self, namespace: str, path) -> int:
+        """把命名空间导出为与原格式相同的 JSON 文件，返回导出条数"""
+        self.flush()
+        data = dict(self.items(namespace))
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+        return len(data)
+
+    def namespace(self, name: str, json_file=None) -> 'CacheNamespace':
+        """获取命名空间视图；命名空间为空且 json_file 存在时先导入"""
+        if json_file is not None and Path(json_file).exists() and self.count(name) == 0:
+            self.import_json(name, json_file)
+        return CacheNamespace(self, name, json_file)
+
+    def close(self):
+        """提交剩余的写入并关闭连接，可以重复调用"""
+        with self._lock:
+            if self._closed:
+                return
+            self.flush()
+            self._conn.close()
+            self._closed = True
+
+
+class CacheNamespace(MutableMapping):
+    """某个命名空间的字典视图，可以直接替换原来的缓存 dict"""
+
+    def __init__(self, store: CacheStore, name: str, json_file=None):
+        self.store = store
+        self.name = name
+        self.json_file = Path(json_file) if json_file is not None else None
+
+    def __getitem__(self, key: str) -> Any:
+        entry = self.store.get_entry(self.name, key)
+        if entry is None:
+            raise KeyError(key)
+        return None if entry[0] is None else json.loads(entry[0])
+
+    def __setitem__(self, key: str, value: Any):
+        self.store.set(self.name, key, value)
+
+    def __delitem__(self, key: str):
+        if not self.store.delete(self.name, key):
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.store.contains(self.name, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.store.keys(self.name))
+
+    def __len__(self) -> int:
+        return self.store.count(self.name)
+
+    def batch(self):
+        """见 CacheStore.batch"""
+        return self.store.batch()
+
+    def export_json(self, path=None) -> int:
+        """导出为 JSON 文件，默认写回导入时的文件"""
+        path = path or self.json_file
+        if path is None:
+            raise ValueError(f"命名空间 {self.name} 没有对应的 JSON 文件")
+        return self.store.export_json(self.name, path)
+
+
+_default_store: Optional[CacheStore] = None
+_default_lock = threading.Lock()
+
+
+def default_store() -> CacheStore:
+    """进程内共用的 CacheStore，进程退出时自动关闭"""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = CacheStore()
+            atexit.register(_default_store.close)
+        return _default_store
+
+
+def open_cache(namespace: str) -> CacheNamespace:
+    """打开一个已知的缓存命名空间（见 JSON_CACHE_FILES）"""
+    return default_store().namespace(namespace, JSON_CACHE_FILES.get(namespace))
+
+
+def main():
+    store = default_store()
+    args = sys.argv[1:]
+    command = args[0] if args else 'stats'
+    names = args[1:] or list(JSON_CACHE_FILES)
+    if command == 'export':
+        for name in names:
+            print(f"{name}: 导出 {store.export_json(name, JSON_CACHE_FILES[name])} 条")
+    elif command == 'import':
+        with store.batch():
+            for name in names:
+                print(f"{name}: 导入 {store.import_json(name, JSON_CACHE_FILES[name])} 条")
+    else:
+        for name, count in sorted(store.namespaces().items()):
+            print(f"{name}: {count} 条")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
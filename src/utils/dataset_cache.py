@@ -0,0 +1,69 @@
+"""data/*.ts 解析结果缓存
+
+缓存以源文件内容的 SHA-256 和解析器版本为键，解析结果用 pickle 存成二进制，
+源文件没有变化时直接加载缓存，不再重新解析。每个数据文件只保留最新的一份缓存。
+"""
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .ts_parser import PARSER_VERSION, parse_ts_export
+
+CACHE_DIR = Path('cache/datasets')
+
+# 数据集名称 -> Showdown 数据文件
+DATA_FILES = {
+    'pokedex': 'data/pokedex.ts',
+    'moves': 'data/moves.ts',
+    'items': 'data/items.ts',
+    'abilities': 'data/abilities.ts',
+}
+
+
+def _cache_path(source: Path, cache_dir: Path) -> Path:
+    return cache_dir / f"{source.stem}.pickle"
+
+
+def _read_cache(cache_file: Path, digest: str) -> Optional[Dict[str, Dict[str, Any]]]:
+    """读取缓存，键不匹配或文件损坏时返回 None"""
+    try:
+        with open(cache_file, 'rb') as f:
+            payload = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+    if payload.get('parser_version') != PARSER_VERSION or payload.get('sha256') != digest:
+        return None
+    return payload['records']
+
+
+def _write_cache(cache_file: Path, digest: str, records: Dict[str, Dict[str, Any]]):
+    """先写临时文件再替换，避免并发运行时读到写了一半的缓存"""
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    payload = {'parser_version': PARSER_VERSION, 'sha256': digest, 'records': records}
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    with open(tmp_file, 'wb') as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_file, cache_file)
+
+
+def load_ts_dataset(path, cache_dir=CACHE_DIR, use_cache: bool = True) -> Dict[str, Dict[str, Any]]:
+    """读取 data/*.ts 的解析结果，优先使用缓存"""
+    source = Path(path)
+    raw = source.read_bytes()
+    if not use_cache:
+        return parse_ts_export(raw.decode('utf-8'))
+
+    digest = hashlib.sha256(raw).hexdigest()
+    cache_file = _cache_path(source, Path(cache_dir))
+    records = _read_cache(cache_file, digest)
+    if records is not None:
+        return records
+
+    records = parse_ts_export(raw.decode('utf-8'))
+    try:
+        _write_cache(cache_file, digest, records)
+    except OSError as e:
+        print(f"写入解析缓存失败 {cache_file}: {e}")
+    return records
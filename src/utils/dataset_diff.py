@@ -0,0 +1,142 @@
+"""数据文件更新时的记录级差异
+
+拉取新的 Showdown 数据后，把新解析的 data/*.ts 与上次导入时保存的快照比较，
+得到每个数据集新增、删除、变化的记录ID。差异（按英文名称）写入
+cache/snapshots/changes.json，描述爬虫等下游步骤可以只处理这些记录。
+
+用法（项目根目录）:
+    PYTHONPATH=src python -m utils.dataset_diff           # 只比较
+    PYTHONPATH=src python -m utils.dataset_diff --commit  # 比较并把当前数据保存为新快照
+"""
+import json
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from .dataset_cache import DATA_FILES, load_ts_dataset
+
+SNAPSHOT_DIR = Path('cache/snapshots')
+CHANGES_FILE = SNAPSHOT_DIR / 'changes.json'
+
+
+class DatasetDiff:
+    """一个数据集两个版本之间的差异，均为记录ID列表"""
+
+    def __init__(self, old: Dict[str, Dict[str, Any]], new: Dict[str, Dict[str, Any]]):
+        self.added: List[str] = [record_id for record_id in new if record_id not in old]
+        self.removed: List[str] = [record_id for record_id in old if record_id not in new]
+        self.changed: List[str] = [
+            record_id for record_id, record in new.items()
+            if record_id in old and old[record_id] != record
+        ]
+        self._old = old
+        self._new = new
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def changed_fields(self, record_id: str) -> List[str]:
+        """变化记录中值不同的字段名"""
+        old, new = self._old.get(record_id, {}), self._new.get(record_id, {})
+        return sorted(key for key in old.keys() | new.keys() if old.get(key) != new.get(key))
+
+    def names(self, record_ids: List[str]) -> List[str]:
+        """把记录ID换成英文名称（下游表格按英文名称查找）"""
+        names = []
+        for record_id in record_ids:
+            record = self._new.get(record_id) or self._old.get(record_id) or {}
+            names.append(record.get('name', record_id))
+        return names
+
+    def touched_names(self) -> Set[str]:
+        """需要下游重新处理的记录（新增和变化）的英文名称"""
+        return set(self.names(self.added + self.changed))
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        return {
+            'added': self.names(self.added),
+            'removed': self.names(self.removed),
+            'changed': self.names(self.changed),
+        }
+
+    def summary(self) -> str:
+        return f"新增 {len(self.added)}, 删除 {len(self.removed)}, 变化 {len(self.changed)}"
+
+
+class SnapshotStore:
+    """保存每个数据集上次导入时的解析结果"""
+
+    def __init__(self, snapshot_dir=SNAPSHOT_DIR):
+        self.snapshot_dir = Path(snapshot_dir)
+
+    def _path(self, dataset: str) -> Path:
+        return self.snapshot_dir / f"{dataset}.pickle"
+
+    def load(self, dataset: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        path = self._path(dataset)
+        if not path.exists():
+            return None
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    def save(self, dataset: str, records: Dict[str, Dict[str, Any]]):
+        """下游处理完成后调用，把当前数据记为新的快照"""
+        path = self._path(dataset)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(records, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def diff(self, dataset: str, records: Dict[str, Dict[str, Any]]) -> DatasetDiff:
+        """与上次快照比较，没有快照时所有记录都算新增"""
+        return DatasetDiff(self.load(dataset) or {}, records)
+
+
+def save_changes(diffs: Dict[str, DatasetDiff], changes_file=CHANGES_FILE):
+    """把各数据集的差异（英文名称）写入 changes.json"""
+    changes_file = Path(changes_file)
+    changes_file.parent.mkdir(parents=True, exist_ok=True)
+    changes = {dataset: diff.to_dict() for dataset, diff in diffs.items()}
+    changes_file.write_text(json.dumps(changes, ensure_ascii=False, indent=2), encoding='utf-8')
+
+
+def load_changed_names(dataset: str, changes_file=CHANGES_FILE) -> Optional[Set[str]]:
+    """读取某个数据集需要重新处理的英文名称，没有差异文件时返回 None（表示全部处理）"""
+    changes_file = Path(changes_file)
+    if not changes_file.exists():
+        return None
+    changes = json.loads(changes_file.read_text(encoding='utf-8'))
+    if dataset not in changes:
+        return None
+    return set(changes[dataset]['added']) | set(changes[dataset]['changed'])
+
+
+def main():
+    commit = '--commit' in sys.argv
+    store = SnapshotStore()
+    diffs = {}
+    for dataset, path in DATA_FILES.items():
+        records = load_ts_dataset(path)
+        diff = store.diff(dataset, records)
+        diffs[dataset] = diff
+        print(f"\n{dataset}: {diff.summary()}")
+        for record_id in diff.changed[:20]:
+            print(f"  ~ {record_id}: {', '.join(diff.changed_fields(record_id))}")
+        for name in diff.names(diff.added[:20]):
+            print(f"  + {name}")
+        for name in diff.names(diff.removed[:20]):
+            print(f"  - {name}")
+        if commit:
+            store.save(dataset, records)
+
+    save_changes(diffs)
+    print(f"\n差异已保存到: {CHANGES_FILE}")
+    if commit:
+        print("已保存新的快照")
+
+
+if __name__ == "__main__":
+    main()
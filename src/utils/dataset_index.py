@@ -0,0 +1,59 @@
+"""按记录ID索引的数据集
+
+data/*.ts 的记录ID就是 Showdown 的 toID(name)：名称转小写后只保留字母和数字。
+带重音的名称（如 Flabébé）先去掉重音符号，与数据文件中的ID（flabebe）一致。
+Excel 里存的是英文名称，用 to_id 换算后即可直接按ID查字典，不需要再对原文件做正则。
+"""
+import unicodedata
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from .dataset_cache import load_ts_dataset
+from .patterns import NON_ID_CHARS
+
+
+def to_id(text: str) -> str:
+    """与 Showdown 的 toID 一致，例如 "10,000,000 Volt Thunderbolt" -> "10000000voltthunderbolt\""""
+    text = str(text).lower()
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text)
+        text = ''.join(char for char in text if not unicodedata.combining(char))
+    return NON_ID_CHARS.sub('', text)
+
+
+class RecordIndex:
+    """以记录ID为键的数据集，提供按名称或ID的字段查询"""
+
+    def __init__(self, records: Dict[str, Dict[str, Any]]):
+        self.records = records
+
+    @classmethod
+    def load(cls, path) -> 'RecordIndex':
+        return cls(load_ts_dataset(path))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, name_or_id: str) -> bool:
+        return to_id(name_or_id) in self.records
+
+    def get(self, name_or_id: str) -> Optional[Dict[str, Any]]:
+        """按英文名称或记录ID获取整条记录"""
+        return self.records.get(to_id(name_or_id))
+
+    def field(self, name_or_id: str, field: str, default: Any = None) -> Any:
+        """获取某条记录的单个字段，记录或字段不存在时返回 default"""
+        record = self.records.get(to_id(name_or_id))
+        if record is None:
+            return default
+        return record.get(field, default)
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        return iter(self.records.items())
+
+    def column(self, field: str) -> Dict[str, Any]:
+        """生成 英文名称 -> 字段值 的字典，跳过没有该字段的记录"""
+        return {
+            record['name']: record[field]
+            for record in self.records.values()
+            if 'name' in record and field in record
+        }
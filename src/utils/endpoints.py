@@ -0,0 +1,18 @@
+"""爬虫请求的站点地址
+
+默认是 52poke wiki 和 Showdown 图鉴。设置环境变量后所有爬虫改为请求指定的地址，
+例如指向本地的模拟服务（见 utils.mock_server）:
+
+    POKEMON_WIKI_HOST=http://127.0.0.1:8765 POKEMON_SHOWDOWN_HOST=http://127.0.0.1:8765 \\
+        PYTHONPATH=src python src/scrapers/pokemon/pokemon_web_info.py
+"""
+import os
+
+WIKI_HOST = os.environ.get('POKEMON_WIKI_HOST', 'https://wiki.52poke.com').rstrip('/')
+SHOWDOWN_HOST = os.environ.get('POKEMON_SHOWDOWN_HOST', 'https://dex.pokemonshowdown.com').rstrip('/')
+
+# wiki 页面地址前缀，后面直接接页面名称
+WIKI_BASE_URL = f"{WIKI_HOST}/wiki/"
+WIKI_API_URL = f"{WIKI_HOST}/api.php"
+# Showdown 图鉴的宝可梦页面前缀
+SHOWDOWN_POKEMON_URL = f"{SHOWDOWN_HOST}/pokemon/"
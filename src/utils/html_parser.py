@@ -0,0 +1,83 @@
+"""可替换的 HTML 解析后端和按范围解析
+
+各爬虫原来都用 BeautifulSoup(text, 'html.parser') 解析整个页面，html.parser 是纯 Python 实现，
+最慢；而翻译处理器只需要 h1#firstHeading，描述爬虫也只需要页面中很小的一部分。
+
+- parse_html() 使用已安装的最快后端（PARSER_BACKENDS 的顺序：lxml，否则 html.parser）
+- 提取器用 SoupStrainer 声明自己需要的元素，只构建这些元素（scope 参数）
+- slice_section() 在原文中截取两个小标题之间的部分，只解析这一段
+- 安装了 selectolax 时，extract_title() 直接用它的 CSS 选择器读取标题，不构建 BeautifulSoup
+
+基准测试: PYTHONPATH=src python src/benchmarks/html_parser_benchmark.py
+"""
+from typing import Iterable, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from .patterns import WIKI_HEADLINE
+
+try:
+    import lxml  # noqa: F401
+except ImportError:
+    lxml = None
+
+try:
+    from selectolax.parser import HTMLParser as SelectolaxParser
+except ImportError:
+    SelectolaxParser = None
+
+# 按速度排列，使用第一个已安装的
+PARSER_BACKENDS = ('lxml', 'html.parser')
+DEFAULT_BACKEND = 'lxml' if lxml is not None else 'html.parser'
+
+# wiki 页面的标题
+TITLE_SCOPE = SoupStrainer('h1', id='firstHeading')
+
+
+def parse_html(text: str, scope: Optional[SoupStrainer] = None, backend: Optional[str] = None) -> BeautifulSoup:
+    """解析 HTML；scope 不为空时只构建匹配的元素（及其子元素）"""
+    return BeautifulSoup(text, backend or DEFAULT_BACKEND, parse_only=scope)
+
+
+def extract_title(text: str) -> Optional[str]:
+    """读取 h1#firstHeading 的文本，没有时返回 None"""
+    if SelectolaxParser is not None:
+        node = SelectolaxParser(text).css_first('h1#firstHeading')
+        return node.text() if node is not None else None
+    heading = parse_html(text, TITLE_SCOPE).find('h1')
+    return heading.text if heading else None
+
+
+def _heading_start(text: str, pos: int) -> int:
+    """pos 所在小标题的 <h2>/<h3> 开始位置"""
+    return max(text.rfind('<h2', 0, pos), text.rfind('<h3', 0, pos), 0)
+
+
+def slice_section(text: str, start_ids: Iterable[str], end_ids: Iterable[str]) -> Optional[str]:
+    """截取从第一个存在的开始小标题到其后最近的结束小标题之前的原文
+
+    小标题按 MediaWiki 的 <span class="mw-headline" id="..."> 查找，开始小标题按 start_ids
+    的顺序取第一个存在的；没有开始小标题时返回 None。
+
+    开始小标题之后没有结束小标题时也返回 None，由调用方解析整页：截到页面末尾的话，
+    正文 div 的结束标签被丢掉，#catlinks、#footer 等会成为小标题的同级元素，混进描述。
+    """
+    headlines = [(match.group(1), match.start()) for match in WIKI_HEADLINE.finditer(text)]
+    positions = {}
+    for headline_id, pos in headlines:
+        positions.setdefault(headline_id, pos)
+    start = next((positions[i] for i in start_ids if i in positions), None)
+    if start is None:
+        return None
+    end_ids = set(end_ids)
+    end = next((pos for headline_id, pos in headlines if pos > start and headline_id in end_ids), None)
+    if end is None:
+        return None
+    return text[_heading_start(text, start):_heading_start(text, end)]
+
+
+def parse_section(text: str, start_ids: Iterable[str], end_ids: Iterable[str],
+                  backend: Optional[str] = None) -> Optional[BeautifulSoup]:
+    """只解析 slice_section() 截取的部分，截取不到时返回 None（调用方解析整页）"""
+    section = slice_section(text, start_ids, end_ids)
+    return parse_html(section, backend=backend) if section is not None else None
@@ -0,0 +1,187 @@
+"""所有爬虫共用的 HTTP 客户端
+
+- 基于 requests.Session 的长连接，连接池大小与并发数一致
+- 统一的 User-Agent 和默认超时
+- 429/5xx 和连接错误时按指数退避（带随机抖动）重试，优先遵守 Retry-After
+- 同一主机的请求共用一个限速器（进程内全局），多个爬虫同时运行也不会超过速率；
+  默认的 HOST_LIMITS 根据响应自适应调整速率（见 rate_controller）
+"""
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .rate_controller import AdaptiveHostLimiter
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+DEFAULT_TIMEOUT = 10
+# 每个主机默认每秒2个请求，允许突发2个
+DEFAULT_RATE = 2.0
+DEFAULT_BURST = 2
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """线程安全的令牌桶，rate 为每秒补充的令牌数，capacity 为最大突发数"""
+
+    def __init__(self, rate: float, capacity: float):
+        if rate <= 0:
+            raise ValueError(f"速率必须大于0: {rate}")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """取一个令牌，返回需要等待的秒数（令牌不足时预支，调用方等待后再发请求）"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self) -> float:
+        """阻塞直到拿到令牌，返回等待的秒数"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """按主机分配令牌桶"""
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: float = DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, host: str, rate: float, burst: Optional[float] = None):
+        """单独设置某个主机的速率"""
+        with self._lock:
+            self._buckets[host] = TokenBucket(rate, burst if burst is not None else max(1.0, rate))
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return bucket
+
+    def acquire(self, url: str) -> float:
+        return self.bucket(urlsplit(url).netloc).acquire()
+
+    def record(self, url: str, latency: Optional[float], status: Optional[int] = None,
+               retry_after: Optional[float] = None):
+        """固定速率，不根据响应调整"""
+
+
+# 进程内所有 HttpClient 默认共用的限速器
+HOST_LIMITS = AdaptiveHostLimiter()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析 Retry-After 头（秒数或 HTTP 日期），返回需要等待的秒数"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class HttpClient:
+    """带连接池、重试退避和按主机限速的 HTTP 客户端，接口与 requests.Session 的 get 一致"""
+
+    def __init__(self, pool_size: int = 10, timeout: float = DEFAULT_TIMEOUT, max_retries: int = 3,
+                 backoff: float = 1.0, max_backoff: float = 60.0,
+                 limiter: Optional[Union[HostRateLimiter, AdaptiveHostLimiter]] = HOST_LIMITS,
+                 user_agent: str = DEFAULT_USER_AGENT):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.limiter = limiter
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': user_agent})
+        # 重试由本类处理，urllib3 层不重试
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.stats = {'requests': 0, 'retries': 0, 'throttled_seconds': 0.0}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def headers(self):
+        return self.session.headers
+
+    def _count(self, key: str, amount=1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def backoff_delay(self, attempt: int) -> float:
+        """第 attempt 次重试前的等待时间：指数增长，取一半固定加一半随机"""
+        delay = min(self.max_backoff, self.backoff * (2 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """发送请求，遇到 429/5xx 或连接错误时重试；重试用尽后返回最后的响应或抛出最后的异常"""
+        kwargs.setdefault('timeout', self.timeout)
+        for attempt in range(self.max_retries + 1):
+            if self.limiter is not None:
+                waited = self.limiter.acquire(url)
+                if waited:
+                    self._count('throttled_seconds', waited)
+            self._count('requests')
+            last_attempt = attempt == self.max_retries
+            started = time.monotonic()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                self._feedback(url, None, None)
+                if last_attempt:
+                    raise
+                delay = self.backoff_delay(attempt)
+            else:
+                retry_after = None
+                if response.status_code in RETRY_STATUSES:
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                self._feedback(url, time.monotonic() - started, response.status_code, retry_after)
+                if response.status_code not in RETRY_STATUSES or last_attempt:
+                    return response
+                delay = min(self.max_backoff, retry_after) if retry_after is not None else self.backoff_delay(attempt)
+                response.close()
+            self._count('retries')
+            time.sleep(delay)
+
+    def _feedback(self, url: str, latency: Optional[float], status: Optional[int],
+                  retry_after: Optional[float] = None):
+        """把响应结果反馈给限速器，status 为 None 表示超时或连接错误"""
+        if self.limiter is not None:
+            self.limiter.record(url, latency, status, retry_after)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self) -> 'HttpClient':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,279 @@
+"""本地模拟 wiki / Showdown 图鉴服务和页面录制
+
+没有外网的机器上无法运行爬虫，也无法测试限速、重试和并发的改动。MockWikiServer 用录制的页面
+模拟两个站点，可以设置响应延迟、随机错误和定时出现的 429：
+
+- debug/<名称>_response.html 作为 Showdown 图鉴页面 /pokemon/<名称小写> 返回
+- debug/fixtures.json 记录录制的其他页面（wiki 页面、api.php 查询等），按路径和查询参数匹配
+- debug/wiki/ 中是按 52poke 宝可梦条目的信息框结构整理的测试页面（妙蛙种子，带三个形态的超梦），
+  也登记在 fixtures.json 中；联网后可以用 record 录制真实页面替换
+- 没有录制的路径返回 404；响应带 ETag，支持 If-None-Match（304）
+- /__stats 返回各状态码的次数
+
+爬虫通过 utils.endpoints 的环境变量指向模拟服务:
+
+    PYTHONPATH=src python -m utils.mock_server --port 8765 --latency 0.2 --error-rate 0.05 \\
+        --burst-interval 30 --burst-duration 3
+    POKEMON_WIKI_HOST=http://127.0.0.1:8765 POKEMON_SHOWDOWN_HOST=http://127.0.0.1:8765 \\
+        PYTHONPATH=src python src/scrapers/pokemon/pokemon_web_info.py
+
+录制页面（需要联网，或从 cache/pages 中已下载的页面导出）:
+
+    PYTHONPATH=src python -m utils.mock_server record https://wiki.52poke.com/wiki/Mewtwo
+    PYTHONPATH=src python -m utils.mock_server record --from-cache
+"""
+import hashlib
+import json
+import math
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit
+
+from .patterns import NON_FILENAME_CHARS
+
+FIXTURE_DIR = Path('debug')
+MANIFEST_NAME = 'fixtures.json'
+RECORDED_DIR_NAME = 'recorded'
+DEFAULT_PORT = 8765
+DEFAULT_CONTENT_TYPE = 'text/html; charset=UTF-8'
+SHOWDOWN_FIXTURE_SUFFIX = '_response.html'
+
+
+def fixture_key(url: str) -> str:
+    """与主机无关的键：解码后的路径加排序后的查询参数"""
+    parts = urlsplit(url)
+    key = unquote(parts.path) or '/'
+    if parts.query:
+        key += '?' + urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return key
+
+
+class FixtureSet:
+    """录制的响应，按 fixture_key 查找"""
+
+    def __init__(self, root=FIXTURE_DIR):
+        self.root = Path(root)
+        self.manifest_path = self.root / MANIFEST_NAME
+        self.entries: Dict[str, Dict] = {}
+        # 抓取时保存的 Showdown 图鉴页面，按文件名约定加载，不写入 fixtures.json
+        self._conventional = set()
+        for path in sorted(self.root.glob(f'*{SHOWDOWN_FIXTURE_SUFFIX}')):
+            name = path.name[:-len(SHOWDOWN_FIXTURE_SUFFIX)]
+            key = f'/pokemon/{name.lower()}'
+            self.entries[key] = {'file': path.name}
+            self._conventional.add(key)
+        if self.manifest_path.exists():
+            manifest = json.loads(self.manifest_path.read_text(encoding='utf-8'))
+            self.entries.update(manifest)
+            self._conventional.difference_update(manifest)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: str) -> Optional[Tuple[Dict, bytes]]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        return entry, (self.root / entry['file']).read_bytes()
+
+    def add(self, url: str, content: bytes, status: int = 200, content_type: Optional[str] = None) -> str:
+        """保存一个响应到 recorded/ 并写入 fixtures.json，返回键"""
+        key = fixture_key(url)
+        slug = NON_FILENAME_CHARS.sub('_', key).strip('_')[:60]
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:8]
+        relative = f"{RECORDED_DIR_NAME}/{slug}_{digest}.html"
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+        self.entries[key] = {'file': relative, 'status': status, 'content_type': content_type or DEFAULT_CONTENT_TYPE}
+        return key
+
+    def save(self):
+        # Showdown 页面按文件名约定加载，其他条目（录制的和 fixtures.json 中原有的）都保存
+        recorded = {key: entry for key, entry in self.entries.items() if key not in self._conventional}
+        self.manifest_path.write_text(json.dumps(recorded, ensure_ascii=False, indent=2, sort_keys=True),
+                                      encoding='utf-8')
+
+
+class MockWikiServer(ThreadingHTTPServer):
+    """返回录制页面的 HTTP 服务
+
+    latency: 平均响应延迟（秒），jitter 为上下浮动的比例
+    error_rate: 随机返回 503 的比例
+    burst_interval/burst_duration: 每 burst_interval 秒中的前 burst_duration 秒对所有请求返回 429
+    """
+    daemon_threads = True
+
+    def __init__(self, fixtures: FixtureSet, port: int = 0, latency: float = 0.0, jitter: float = 0.5,
+                 error_rate: float = 0.0, burst_interval: float = 0.0, burst_duration: float = 0.0,
+                 seed: Optional[int] = None):
+        super().__init__(('127.0.0.1', port), MockWikiHandler)
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.burst_interval = burst_interval
+        self.burst_duration = burst_duration
+        self.started = time.monotonic()
+        self.stats: Dict[str, int] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self) -> 'MockWikiServer':
+        """在后台线程中运行（供基准测试使用）"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def count(self, status: int):
+        with self._lock:
+            self.stats[str(status)] = self.stats.get(str(status), 0) + 1
+
+    def burst_remaining(self) -> float:
+        """当前处于 429 时段时返回剩余秒数，否则返回0"""
+        if self.burst_interval <= 0 or self.burst_duration <= 0:
+            return 0.0
+        elapsed = (time.monotonic() - self.started) % self.burst_interval
+        return self.burst_duration - elapsed if elapsed < self.burst_duration else 0.0
+
+    def delay(self) -> float:
+        with self._lock:
+            return max(0.0, self.latency * (1 + self._random.uniform(-self.jitter, self.jitter)))
+
+    def fails(self) -> bool:
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+
+class MockWikiHandler(BaseHTTPRequestHandler):
+    server: MockWikiServer
+
+    def _send(self, status: int, body: bytes = b'', headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body and self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        if self.path == '/__stats':
+            body = json.dumps(server.stats).encode('utf-8')
+            self._send(200, body, {'Content-Type': 'application/json'})
+            return
+
+        remaining = server.burst_remaining()
+        if remaining > 0:
+            server.count(429)
+            self._send(429, headers={'Retry-After': str(math.ceil(remaining))})
+            return
+        time.sleep(server.delay())
+        if server.fails():
+            server.count(503)
+            self._send(503)
+            return
+
+        fixture = server.fixtures.get(fixture_key(self.path))
+        if fixture is None:
+            server.count(404)
+            self._send(404, b'not found', {'Content-Type': 'text/plain'})
+            return
+        entry, body = fixture
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        if self.headers.get('If-None-Match') == etag:
+            server.count(304)
+            self._send(304, headers={'ETag': etag})
+            return
+        status = entry.get('status', 200)
+        server.count(status)
+        self._send(status, body, {'Content-Type': entry.get('content_type', DEFAULT_CONTENT_TYPE), 'ETag': etag})
+
+    do_HEAD = do_GET
+
+    def log_message(self, *args):
+        pass
+
+
+def record_urls(fixtures: FixtureSet, urls: Iterable[str]) -> int:
+    """下载 urls 并保存为录制页面"""
+    from .http_client import HttpClient
+    session = HttpClient()
+    count = 0
+    for url in urls:
+        try:
+            response = session.get(url)
+            fixtures.add(url, response.content, response.status_code, response.headers.get('Content-Type'))
+            print(f"已录制 {url}: {response.status_code}")
+            count += 1
+        except Exception as e:
+            print(f"录制 {url} 失败: {e}")
+    return count
+
+
+def record_from_cache(fixtures: FixtureSet) -> int:
+    """把 cache/pages 中已下载的页面导出为录制页面"""
+    from .page_store import PageStore
+    store = PageStore()
+    count = 0
+    for url in store.urls():
+        page = store.get(url)
+        if page is not None:
+            fixtures.add(url, page.content, content_type=f"text/html; charset={page.encoding}")
+            count += 1
+    return count
+
+
+def _pop_option(args, name: str, default, convert=str):
+    if name not in args:
+        return default
+    index = args.index(name)
+    value = convert(args[index + 1])
+    del args[index:index + 2]
+    return value
+
+
+def main():
+    args = sys.argv[1:]
+    fixtures = FixtureSet(_pop_option(args, '--fixtures', FIXTURE_DIR))
+    if args and args[0] == 'record':
+        if '--from-cache' in args:
+            count = record_from_cache(fixtures)
+        else:
+            count = record_urls(fixtures, args[1:])
+        fixtures.save()
+        print(f"录制 {count} 个页面，共 {len(fixtures)} 个，保存在 {fixtures.manifest_path}")
+        return
+
+    server = MockWikiServer(
+        fixtures,
+        port=_pop_option(args, '--port', DEFAULT_PORT, int),
+        latency=_pop_option(args, '--latency', 0.0, float),
+        jitter=_pop_option(args, '--jitter', 0.5, float),
+        error_rate=_pop_option(args, '--error-rate', 0.0, float),
+        burst_interval=_pop_option(args, '--burst-interval', 0.0, float),
+        burst_duration=_pop_option(args, '--burst-duration', 0.0, float),
+        seed=_pop_option(args, '--seed', None, int),
+    )
+    print(f"模拟服务: {server.base_url}，{len(fixtures)} 个录制页面")
+    print(f"POKEMON_WIKI_HOST={server.base_url} POKEMON_SHOWDOWN_HOST={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"状态码统计: {server.stats}")
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
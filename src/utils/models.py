@@ -0,0 +1,224 @@
+"""宝可梦、技能、道具、特性的共享数据模型
+
+各处理器统一从 data/*.ts 的解析记录构建这些对象，再在导出时转换成表格行。
+对象使用 __slots__ 减少内存；属性、分类、特性名等重复出现的字符串经过 intern，
+能力值以 array('h') 保存为整数（记录中缺少某项能力值时改为元组，缺少的项为 None），
+需要拼接字符串时再通过属性生成。
+"""
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+STAT_NAMES = ('hp', 'atk', 'def', 'spa', 'spd', 'spe')
+
+# 特性槽位：0/1 为普通特性，H 为隐藏特性，S 为特殊特性
+ABILITY_SLOTS = ('0', '1', 'H', 'S')
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Species:
+    """宝可梦（含形态）"""
+    __slots__ = ('id', 'num', 'name', 'types', 'stats', 'height', 'weight',
+                 'abilities', 'base_species', 'forme')
+
+    def __init__(self, id: str, num: int, name: Optional[str], types: Tuple[str, ...],
+                 stats: Optional[Sequence[Optional[int]]], height: Optional[float], weight: Optional[float],
+                 abilities: Tuple[Tuple[str, str], ...], base_species: Optional[str] = None,
+                 forme: Optional[str] = None):
+        self.id = id
+        self.num = num
+        self.name = name
+        self.types = types
+        self.stats = stats
+        self.height = height
+        self.weight = weight
+        self.abilities = abilities
+        self.base_species = base_species
+        self.forme = forme
+
+    @classmethod
+    def from_record(cls, record_id: str, record: Dict[str, Any]) -> Optional['Species']:
+        """从 pokedex.ts 的一条记录构建，没有编号的记录返回 None"""
+        if 'num' not in record:
+            return None
+        base_stats = record.get('baseStats')
+        stats = None
+        if base_stats:
+            values = tuple(int(base_stats[stat]) if stat in base_stats else None for stat in STAT_NAMES)
+            # 缺少的能力值保留为 None，不当作 0
+            stats = values if None in values else array('h', values)
+        abilities = tuple(
+            (_intern(slot), _intern(name))
+            for slot, name in record.get('abilities', {}).items()
+            if name
+        )
+        return cls(
+            id=record_id,
+            num=int(record['num']),
+            name=record.get('name'),
+            types=tuple(_intern(t) for t in record.get('types', ())),
+            stats=stats,
+            height=float(record['heightm']) if 'heightm' in record else None,
+            weight=float(record['weightkg']) if 'weightkg' in record else None,
+            abilities=abilities,
+            base_species=_intern(record.get('baseSpecies')),
+            forme=_intern(record.get('forme')),
+        )
+
+    def stat(self, name: str) -> Optional[int]:
+        """按 hp/atk/def/spa/spd/spe 获取能力值"""
+        if self.stats is None:
+            return None
+        return self.stats[STAT_NAMES.index(name)]
+
+    @property
+    def has_all_stats(self) -> bool:
+        """六项能力值是否齐全"""
+        return self.stats is not None and None not in self.stats
+
+    @property
+    def bst(self) -> Optional[int]:
+        """种族值总和，能力值不全时为 None"""
+        return sum(self.stats) if self.has_all_stats else None
+
+    @property
+    def ability_names(self) -> Tuple[str, ...]:
+        return tuple(name for _, name in self.abilities)
+
+    @property
+    def types_en(self) -> str:
+        """导出用的属性字符串，如 "Grass, Poison\""""
+        return ', '.join(self.types)
+
+    @property
+    def abilities_en(self) -> str:
+        """导出用的特性字符串，如 "0:Overgrow, H:Chlorophyll\""""
+        return ', '.join(f"{slot}:{name}" for slot, name in self.abilities)
+
+    def __repr__(self) -> str:
+        return f"Species({self.name!r}, num={self.num})"
+
+
+class Move:
+    """技能"""
+    __slots__ = ('id', 'num', 'name', 'accuracy', 'base_power', 'pp', 'priority',
+                 'category', 'target', 'type')
+
+    def __init__(self, id: str, num: Optional[int], name: str, accuracy: Any,
+                 base_power: Optional[int], pp: Optional[int], priority: Optional[int],
+                 category: Optional[str], target: Optional[str], type: Optional[str]):
+        self.id = id
+        self.num = num
+        self.name = name
+        self.accuracy = accuracy
+        self.base_power = base_power
+        self.pp = pp
+        self.priority = priority
+        self.category = category
+        self.target = target
+        self.type = type
+
+    @classmethod
+    def from_record(cls, record_id: str, record: Dict[str, Any]) -> Optional['Move']:
+        """从 moves.ts 的一条记录构建，没有名称的记录返回 None"""
+        if not record.get('name'):
+            return None
+        return cls(
+            id=record_id,
+            num=record.get('num'),
+            name=record['name'],
+            # accuracy: true 表示必中
+            accuracy=record.get('accuracy', True),
+            base_power=record.get('basePower'),
+            pp=record.get('pp'),
+            priority=record.get('priority'),
+            category=_intern(record.get('category')),
+            target=_intern(record.get('target')),
+            type=_intern(record.get('type')),
+        )
+
+    @property
+    def always_hits(self) -> bool:
+        return self.accuracy is True
+
+    def __repr__(self) -> str:
+        return f"Move({self.name!r}, num={self.num})"
+
+
+class Item:
+    """道具"""
+    __slots__ = ('id', 'num', 'name', 'spritenum', 'gen')
+
+    def __init__(self, id: str, num: Optional[int], name: str,
+                 spritenum: Optional[int], gen: Optional[int]):
+        self.id = id
+        self.num = num
+        self.name = name
+        self.spritenum = spritenum
+        self.gen = gen
+
+    @classmethod
+    def from_record(cls, record_id: str, record: Dict[str, Any]) -> Optional['Item']:
+        """从 items.ts 的一条记录构建，没有名称的记录返回 None"""
+        if not record.get('name'):
+            return None
+        return cls(
+            id=record_id,
+            num=record.get('num'),
+            name=record['name'],
+            spritenum=record.get('spritenum'),
+            gen=record.get('gen'),
+        )
+
+    def __repr__(self) -> str:
+        return f"Item({self.name!r}, num={self.num})"
+
+
+class Ability:
+    """特性"""
+    __slots__ = ('id', 'num', 'name', 'rating')
+
+    def __init__(self, id: str, num: int, name: str, rating: float):
+        self.id = id
+        self.num = num
+        self.name = name
+        self.rating = rating
+
+    @classmethod
+    def from_record(cls, record_id: str, record: Dict[str, Any]) -> Optional['Ability']:
+        """从 abilities.ts 的一条记录构建，缺少名称、评分或编号的记录返回 None"""
+        if not record.get('name') or 'rating' not in record or 'num' not in record:
+            return None
+        return cls(
+            id=record_id,
+            num=int(record['num']),
+            name=record['name'],
+            rating=float(record['rating']),
+        )
+
+    def __repr__(self) -> str:
+        return f"Ability({self.name!r}, num={self.num})"
+
+
+def build_models(model_cls, records: Dict[str, Dict[str, Any]]) -> List[Any]:
+    """把一个数据集的全部记录转换成模型对象，跳过无法构建和出错的记录"""
+    models = []
+    for record_id, record in records.items():
+        try:
+            model = model_cls.from_record(record_id, record)
+        except Exception as e:
+            # 与原来逐条解析时一样，出错的记录打印后跳过，不影响其他记录
+            print(f"解析错误: {e}")
+            print(f"出错的数据: {record_id}")
+            continue
+        if model is not None:
+            models.append(model)
+    return models
+
+
+def index_by_name(models: Iterable[Any]) -> Dict[str, Any]:
+    """生成 英文名称 -> 模型对象 的字典"""
+    return {model.name: model for model in models if model.name}
@@ -0,0 +1,153 @@
+"""爬虫和数据处理器共用的页面获取服务
+
+同一个 wiki 页面原来会被请求多次：特性/技能/道具处理器为了读标题请求一次，
+描述爬虫为了读正文又请求一次；宝可梦处理器查中文名和 PokemonWebScraper 也各请求一次。
+PageFetchService 统一负责获取页面：
+
+- 页面通过 CachedPageFetcher 保存到 cache/pages，其他脚本之后读取同一页面时不再下载
+- 同一进程内的最近页面保存在 LRU 中，多个提取器共用一个 PageDocument
+- 多个线程同时请求同一个URL时只发一个请求，其余线程等待同一个结果（single-flight）
+- PageDocument 的 BeautifulSoup 在第一次用到时才解析，之后共用；只需要部分元素的提取器
+  用 scoped() 只解析自己声明的范围，读标题时不解析整页（见 html_parser）
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Optional
+
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
+
+from .endpoints import WIKI_BASE_URL
+from .html_parser import extract_title, parse_html
+from .http_client import HttpClient
+from .page_store import CachedPageFetcher, PageStore
+
+DEFAULT_MAX_DOCUMENTS = 64
+
+
+class PageDocument:
+    """一个已获取的页面，status 为 404 时表示页面不存在"""
+    __slots__ = ('url', 'status', 'text', '_soup', '_scoped', '_lock')
+
+    def __init__(self, url: str, text: str, status: int = 200):
+        self.url = url
+        self.status = status
+        self.text = text
+        self._soup = None
+        self._scoped = {}
+        self._lock = threading.Lock()
+
+    @property
+    def missing(self) -> bool:
+        return self.status == 404
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        """解析后的页面，只解析一次"""
+        with self._lock:
+            if self._soup is None:
+                self._soup = parse_html(self.text)
+                self._scoped.clear()
+            return self._soup
+
+    def scoped(self, scope: SoupStrainer) -> BeautifulSoup:
+        """只包含 scope 匹配元素的解析结果；已经解析过整页时直接返回整页"""
+        with self._lock:
+            if self._soup is not None:
+                return self._soup
+            soup = self._scoped.get(scope)
+            if soup is None:
+                soup = self._scoped[scope] = parse_html(self.text, scope)
+            return soup
+
+    @property
+    def title(self) -> Optional[str]:
+        """h1#firstHeading 的文本，没有时返回 None"""
+        if self.missing:
+            return None
+        if self._soup is not None:
+            heading = self._soup.find('h1', {'id': 'firstHeading'})
+            return heading.text if heading else None
+        return extract_title(self.text)
+
+
+class PageFetchService:
+    """带 LRU 和请求合并的页面获取器"""
+
+    def __init__(self, session: Optional[HttpClient] = None, store: Optional[PageStore] = None,
+                 mode: str = 'cache', base_url: str = WIKI_BASE_URL, max_documents: int = DEFAULT_MAX_DOCUMENTS):
+        self.fetcher = CachedPageFetcher(session, store, mode=mode)
+        self.base_url = base_url
+        self.max_documents = max_documents
+        self._documents: 'OrderedDict[str, PageDocument]' = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        # 与 CachedPageFetcher 共用一个统计字典
+        self.stats = self.fetcher.stats
+        self.stats.update({'memory_hits': 0, 'coalesced': 0})
+
+    @property
+    def mode(self) -> str:
+        return self.fetcher.mode
+
+    def wiki_url(self, name: str) -> str:
+        return f"{self.base_url}{name}"
+
+    def get(self, url: str) -> PageDocument:
+        """获取页面；404 返回 missing 的文档，其他错误抛出异常"""
+        with self._lock:
+            document = self._documents.get(url)
+            if document is not None:
+                self._documents.move_to_end(url)
+                self.stats['memory_hits'] += 1
+                return document
+            future = self._inflight.get(url)
+            if future is not None:
+                self.stats['coalesced'] += 1
+                owner = False
+            else:
+                future = self._inflight[url] = Future()
+                owner = True
+        if not owner:
+            return future.result()
+
+        try:
+            document = self._download(url)
+        except BaseException as e:
+            future.set_exception(e)
+            with self._lock:
+                del self._inflight[url]
+            raise
+        with self._lock:
+            self._documents[url] = document
+            while len(self._documents) > self.max_documents:
+                self._documents.popitem(last=False)
+            del self._inflight[url]
+        future.set_result(document)
+        return document
+
+    def _download(self, url: str) -> PageDocument:
+        try:
+            return PageDocument(url, self.fetcher.fetch_text(url))
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return PageDocument(url, '', status=404)
+            raise
+
+    def wiki_page(self, name: str) -> PageDocument:
+        """获取 wiki 上名为 name 的页面"""
+        return self.get(self.wiki_url(name))
+
+
+_shared_fetcher: Optional[PageFetchService] = None
+_shared_lock = threading.Lock()
+
+
+def shared_page_fetcher() -> PageFetchService:
+    """进程内共用的页面获取服务（cache 模式）"""
+    global _shared_fetcher
+    with _shared_lock:
+        if _shared_fetcher is None:
+            _shared_fetcher = PageFetchService()
+        return _shared_fetcher
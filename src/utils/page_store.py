@@ -0,0 +1,172 @@
+"""网页原始内容的本地存储
+
+爬虫下载的页面按内容的 SHA-256 压缩保存（cache/pages/blobs/ab/abcd....gz），
+每个URL另有一个元数据文件（cache/pages/meta/<URL哈希>.json），记录对应的内容哈希、
+编码、ETag 和 Last-Modified。内容相同的页面只保存一份。
+
+CachedPageFetcher 有三种模式：
+- cache: 已保存的页面直接使用，没有保存的才下载（默认）
+- offline: 只使用已保存的页面，不发任何请求；修改解析代码后用它重新提取
+- refresh: 对已保存的页面发送条件请求（If-None-Match / If-Modified-Since），
+  服务器返回 304 时继续使用本地内容
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from .http_client import HttpClient
+
+PAGE_STORE_DIR = Path('cache/pages')
+FETCH_MODES = ('cache', 'offline', 'refresh')
+
+
+class PageNotStored(KeyError):
+    """离线模式下请求了没有保存过的页面"""
+
+
+def _url_key(url: str) -> str:
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # 临时文件按进程和线程区分：多个线程同时保存内容相同的页面时会写同一个 blob
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+class StoredPage:
+    """一个已保存的页面"""
+    __slots__ = ('url', 'sha256', 'encoding', 'etag', 'last_modified', 'fetched_at', 'checked_at', 'content')
+
+    def __init__(self, url: str, sha256: str, encoding: str, etag: Optional[str],
+                 last_modified: Optional[str], fetched_at: float, checked_at: float, content: bytes):
+        self.url = url
+        self.sha256 = sha256
+        self.encoding = encoding
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+        self.checked_at = checked_at
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+
+class PageStore:
+    """按内容寻址、gzip 压缩的页面存储"""
+
+    def __init__(self, root=PAGE_STORE_DIR):
+        self.root = Path(root)
+        self.blob_dir = self.root / 'blobs'
+        self.meta_dir = self.root / 'meta'
+
+    def _blob_path(self, sha256: str) -> Path:
+        return self.blob_dir / sha256[:2] / f"{sha256}.gz"
+
+    def _meta_path(self, url: str) -> Path:
+        return self.meta_dir / f"{_url_key(url)}.json"
+
+    def meta(self, url: str) -> Optional[Dict]:
+        path = self._meta_path(url)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding='utf-8'))
+
+    def get(self, url: str) -> Optional[StoredPage]:
+        """读取已保存的页面，没有时返回 None"""
+        meta = self.meta(url)
+        if meta is None:
+            return None
+        blob_path = self._blob_path(meta['sha256'])
+        if not blob_path.exists():
+            return None
+        content = gzip.decompress(blob_path.read_bytes())
+        return StoredPage(content=content, **meta)
+
+    def put(self, url: str, content: bytes, encoding: Optional[str] = None,
+            etag: Optional[str] = None, last_modified: Optional[str] = None) -> StoredPage:
+        """保存页面内容和响应头信息"""
+        sha256 = hashlib.sha256(content).hexdigest()
+        blob_path = self._blob_path(sha256)
+        if not blob_path.exists():
+            _write_atomic(blob_path, gzip.compress(content, compresslevel=6))
+        now = time.time()
+        meta = {
+            'url': url, 'sha256': sha256, 'encoding': encoding or 'utf-8',
+            'etag': etag, 'last_modified': last_modified,
+            'fetched_at': now, 'checked_at': now,
+        }
+        self._write_meta(url, meta)
+        return StoredPage(content=content, **meta)
+
+    def touch(self, url: str):
+        """记录一次确认页面未变化（304）的时间"""
+        meta = self.meta(url)
+        if meta is not None:
+            meta['checked_at'] = time.time()
+            self._write_meta(url, meta)
+
+    def _write_meta(self, url: str, meta: Dict):
+        _write_atomic(self._meta_path(url), json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+
+    def __contains__(self, url: str) -> bool:
+        return self._meta_path(url).exists()
+
+    def urls(self) -> Iterator[str]:
+        """所有已保存页面的URL"""
+        if not self.meta_dir.exists():
+            return
+        for path in self.meta_dir.glob('*.json'):
+            yield json.loads(path.read_text(encoding='utf-8'))['url']
+
+
+class CachedPageFetcher:
+    """先查 PageStore 再下载的页面获取器"""
+
+    def __init__(self, session: Optional[HttpClient] = None, store: Optional[PageStore] = None,
+                 mode: str = 'cache'):
+        if mode not in FETCH_MODES:
+            raise ValueError(f"未知的获取模式: {mode}，可选 {FETCH_MODES}")
+        self.session = session or HttpClient()
+        self.store = store or PageStore()
+        self.mode = mode
+        self.stats = {'stored': 0, 'downloaded': 0, 'not_modified': 0}
+
+    def fetch(self, url: str) -> StoredPage:
+        """按当前模式返回页面，下载失败或状态码不是200时抛出异常"""
+        stored = self.store.get(url)
+        if stored is not None and self.mode != 'refresh':
+            self.stats['stored'] += 1
+            return stored
+        if self.mode == 'offline':
+            raise PageNotStored(url)
+
+        headers = {}
+        if stored is not None:
+            if stored.etag:
+                headers['If-None-Match'] = stored.etag
+            if stored.last_modified:
+                headers['If-Modified-Since'] = stored.last_modified
+        response = self.session.get(url, headers=headers)
+        if response.status_code == 304 and stored is not None:
+            self.store.touch(url)
+            self.stats['not_modified'] += 1
+            return stored
+        response.raise_for_status()
+        self.stats['downloaded'] += 1
+        return self.store.put(
+            url, response.content, encoding=response.encoding,
+            etag=response.headers.get('ETag'), last_modified=response.headers.get('Last-Modified'),
+        )
+
+    def fetch_text(self, url: str) -> str:
+        return self.fetch(url).text
@@ -0,0 +1,174 @@
+"""共享的预编译正则表达式
+
+所有处理器、提取器和爬虫用到的正则都在这里按名称注册，模块加载时编译一次，
+不在循环里用字符串字面量或 f-string 重新构造。开启计时（PATTERN_TIMING=1 或
+PATTERNS.set_timing(True)）后每个模式记录调用次数和累计耗时，
+可以用 PATTERNS.report() 查看哪些正则最耗时。
+
+data/*.ts 解析器这类每个文件调用几十万次的热点在创建扫描器时绑定 pattern.match 等方法，
+不计时时就是 re.Pattern 自己的方法；开启计时后新建的扫描器同样计入统计。
+"""
+import os
+import re
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+_METHODS = ('search', 'match', 'fullmatch', 'findall', 'finditer', 'sub')
+
+
+class TimedPattern:
+    """已编译正则，开启计时后统计调用次数和累计耗时
+
+    search/match 等方法直接绑定到 re.Pattern 的方法上，不计时的情况下
+    调用没有任何额外开销；开启计时后换成带统计的包装函数。
+    """
+    __slots__ = ('name', 'regex', 'calls', 'elapsed_ns') + _METHODS
+
+    def __init__(self, name: str, regex: re.Pattern, timing: bool = False):
+        self.name = name
+        self.regex = regex
+        self.calls = 0
+        self.elapsed_ns = 0
+        self.set_timing(timing)
+
+    def set_timing(self, enabled: bool):
+        for method in _METHODS:
+            raw = getattr(self.regex, method)
+            setattr(self, method, self._timed(raw) if enabled else raw)
+
+    def _timed(self, raw: Callable) -> Callable:
+        if raw.__name__ == 'finditer':
+            def timed_finditer(*args, **kwargs):
+                self.calls += 1
+                return self._timed_iter(raw(*args, **kwargs))
+            return timed_finditer
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return raw(*args, **kwargs)
+            finally:
+                self.elapsed_ns += time.perf_counter_ns() - start
+                self.calls += 1
+        return timed
+
+    def _timed_iter(self, matches: Iterator[re.Match]) -> Iterator[re.Match]:
+        """finditer 的匹配在迭代时才发生：仍然逐个返回，每取一个匹配计入一次耗时"""
+        while True:
+            start = time.perf_counter_ns()
+            try:
+                match = next(matches)
+            except StopIteration:
+                return
+            finally:
+                self.elapsed_ns += time.perf_counter_ns() - start
+            yield match
+
+    def group(self, string: str, index: int = 1) -> Optional[str]:
+        """search 并返回指定分组，没有匹配时返回 None"""
+        match = self.search(string)
+        return match.group(index) if match else None
+
+    def reset(self):
+        self.calls = 0
+        self.elapsed_ns = 0
+
+    def __repr__(self) -> str:
+        return f"TimedPattern({self.name!r}, {self.regex.pattern!r})"
+
+
+class PatternRegistry:
+    """按名称管理 TimedPattern"""
+
+    def __init__(self, timing: bool = False):
+        self._patterns: Dict[str, TimedPattern] = {}
+        self.timing = timing
+
+    def register(self, name: str, pattern: str, flags: int = 0) -> TimedPattern:
+        """注册并编译一个正则；同名同模式重复注册返回已有对象，模式不同则报错"""
+        existing = self._patterns.get(name)
+        if existing is not None:
+            if existing.regex.pattern != pattern or existing.regex.flags != re.compile(pattern, flags).flags:
+                raise ValueError(f"正则 {name} 已注册为不同的模式: {existing.regex.pattern!r}")
+            return existing
+        timed = TimedPattern(name, re.compile(pattern, flags), self.timing)
+        self._patterns[name] = timed
+        return timed
+
+    def get(self, name: str) -> TimedPattern:
+        try:
+            return self._patterns[name]
+        except KeyError:
+            raise KeyError(f"未注册的正则: {name}") from None
+
+    def __getitem__(self, name: str) -> TimedPattern:
+        return self.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._patterns
+
+    def __iter__(self) -> Iterator[TimedPattern]:
+        return iter(self._patterns.values())
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def set_timing(self, enabled: bool):
+        """开启或关闭所有正则的计时"""
+        self.timing = enabled
+        for pattern in self._patterns.values():
+            pattern.set_timing(enabled)
+
+    def stats(self) -> List[Tuple[str, int, float]]:
+        """[(名称, 调用次数, 累计耗时ms)]，按累计耗时从高到低排序"""
+        rows = [(p.name, p.calls, p.elapsed_ns / 1e6) for p in self._patterns.values()]
+        return sorted(rows, key=lambda row: row[2], reverse=True)
+
+    def reset(self):
+        for pattern in self._patterns.values():
+            pattern.reset()
+
+    def report(self, only_used: bool = True):
+        """打印每个正则的调用次数、累计耗时和平均耗时"""
+        print(f"{'正则':<28} {'调用次数':>10} {'累计(ms)':>10} {'平均(us)':>10}")
+        for name, calls, total_ms in self.stats():
+            if only_used and not calls:
+                continue
+            avg_us = total_ms * 1000 / calls if calls else 0.0
+            print(f"{name:<28} {calls:>10} {total_ms:>10.2f} {avg_us:>10.2f}")
+
+
+# 设置环境变量 PATTERN_TIMING=1 在启动时开启计时
+PATTERNS = PatternRegistry(timing=os.environ.get('PATTERN_TIMING') == '1')
+
+# data/*.ts 解析器的分词正则（热点，扫描器创建时绑定方法）
+TS_EXPORT = PATTERNS.register('ts.export', r'export\s+const\s+(\w+)\s*(?::[^=]*)?=\s*')
+TS_WHITESPACE = PATTERNS.register('ts.whitespace', r'(?:\s+|//[^\n]*|/\*.*?\*/)*', re.S)
+TS_KEY = PATTERNS.register('ts.key', r'([A-Za-z_$][\w$]*|\d+)|"((?:[^"\\\n]|\\.)*)"|\'((?:[^\'\\\n]|\\.)*)\'')
+TS_STRING = PATTERNS.register('ts.string', r'"((?:[^"\\\n]|\\.)*)"|\'((?:[^\'\\\n]|\\.)*)\'')
+TS_NUMBER = PATTERNS.register('ts.number', r'-?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?')
+TS_IDENT = PATTERNS.register('ts.ident', r'[A-Za-z_$][\w$]*')
+TS_CODE_TOKEN = PATTERNS.register('ts.code_token', r'[{}()\[\]"\'`,]|//|/\*')
+TS_TEMPLATE_TOKEN = PATTERNS.register('ts.template_token', r'[`\\]|\$\{')
+TS_ESCAPE = PATTERNS.register('ts.escape', r'\\(u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|.)', re.S)
+
+# Showdown toID 去掉的字符
+NON_ID_CHARS = PATTERNS.register('id.non_id_chars', r'[^a-z0-9]+')
+
+# 通用文本
+NON_FILENAME_CHARS = PATTERNS.register('text.non_filename_chars', r'[^\w.-]+')
+DIGITS = PATTERNS.register('text.digits', r'\d+')
+FIRST_NUMBER = PATTERNS.register('text.first_number', r'(\d+)')
+PARENTHESIZED = PATTERNS.register('text.parenthesized', r'\((.*?)\)')
+BRACKETED = PATTERNS.register('text.bracketed', r'\[(.*?)\]')
+
+# 网页
+EVOLVES_FROM = PATTERNS.register('wiki.evolves_from', r'Evolves from (\w+)')
+SHOWDOWN_GEN_HEADER = PATTERNS.register('showdown.gen_header', r'Generation ([1-9])')
+WIKI_MOVE_GEN_HEADER = PATTERNS.register('wiki.move_gen_header', r'第([一二三四五六七八九])世代')
+WIKI_ABILITY_GEN_HEADER = PATTERNS.register('wiki.ability_gen_header', r'第([三四五六七八九])世代引入特性')
+# 52poke 信息框中切换形态的按钮类名，如 _toggler_show-form2
+WIKI_FORM_TOGGLER_CLASS = PATTERNS.register('wiki.form_toggler_class', r'^_toggler_show-(form\d+)$')
+# MediaWiki 小标题，html_parser.slice_section 在原文中按它截取小节
+WIKI_HEADLINE = PATTERNS.register('wiki.headline', r'<span class="mw-headline" id="([^"]+)"')
@@ -0,0 +1,199 @@
+"""抓取 → 提取 → 写入 三段流水线
+
+原来各爬虫在一个循环里交替下载和解析页面：解析时不会发出下一个请求，多个线程同时解析又受 GIL 限制。
+FetchExtractPipeline 把这几步分开，各阶段之间用有界队列连接：
+
+- 抓取：fetch_concurrency 个 asyncio 协程通过线程池并发调用 fetch(key)（HttpClient 是阻塞的）
+- 提取：extract(payload) 在进程池中执行，多个页面同时解析；extract 必须是模块级函数，
+  参数和返回值可以 pickle。processes=0 时在线程中执行（提取很轻时省去进程间传输）
+- 写入：唯一的写入协程依次调用 write(key, result)，缓存和日志只在一个线程里写；
+  队列中已经就绪的结果放在同一个 batch() 中写入（如 CacheStore.batch，合并为一个事务），块内不等待
+
+下游处理不过来时队列被填满，上游等待（背压），不会下载远超提取能力的页面。
+结束时输出每个阶段的处理数、错误数、吞吐量、平均并发和等待下游的时间，以及队列的最大深度。
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Any, Callable, ContextManager, Dict, Hashable, Iterable, Optional
+
+from tqdm import tqdm
+
+DEFAULT_FETCH_CONCURRENCY = 8
+DEFAULT_QUEUE_SIZE = 32
+_DONE = object()
+
+
+class StageStats:
+    """一个阶段的统计"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.errors = 0
+        # 执行 fetch/extract/write 的累计时间，并发执行时会超过实际经过的时间
+        self.busy = 0.0
+        # 输出队列已满、等待下游的时间（背压）
+        self.blocked = 0.0
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    def begin(self) -> float:
+        now = time.perf_counter()
+        if self.started is None:
+            self.started = now
+        return now
+
+    def end(self, started: float, error: bool = False):
+        now = time.perf_counter()
+        self.busy += now - started
+        self.finished = now
+        if error:
+            self.errors += 1
+        else:
+            self.items += 1
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+    def report(self) -> str:
+        elapsed = self.elapsed
+        rate = self.items / elapsed if elapsed else 0.0
+        concurrency = self.busy / elapsed if elapsed else 0.0
+        return (f"{self.name:<4} {self.items:>6} {self.errors:>6} {rate:>10.1f} "
+                f"{concurrency:>8.1f} {self.blocked:>12.1f}")
+
+
+class FetchExtractPipeline:
+    """fetch(key) -> payload，extract(payload) -> result，write(key, result)
+
+    fetch 或 extract 出错的 key 不会调用 write，由调用方之后重试。
+    batch() 返回包住一组 write 的上下文管理器，默认不合并。
+    """
+
+    def __init__(self, fetch: Callable[[Hashable], Any], extract: Callable[[Any], Any],
+                 write: Callable[[Hashable, Any], None], fetch_concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+                 processes: Optional[int] = None, queue_size: int = DEFAULT_QUEUE_SIZE, desc: Optional[str] = None,
+                 batch: Callable[[], ContextManager] = nullcontext):
+        self.fetch = fetch
+        self.extract = extract
+        self.write = write
+        self.batch = batch
+        self.fetch_concurrency = max(1, fetch_concurrency)
+        self.processes = (os.cpu_count() or 1) if processes is None else processes
+        self.queue_size = queue_size
+        self.desc = desc
+        self.stats = {name: StageStats(name) for name in ('抓取', '提取', '写入')}
+        self.max_depth = {'抓取→提取': 0, '提取→写入': 0}
+
+    async def _put(self, queue: asyncio.Queue, item, stats: StageStats, depth_name: str):
+        if queue.full():
+            started = time.perf_counter()
+            await queue.put(item)
+            stats.blocked += time.perf_counter() - started
+        else:
+            queue.put_nowait(item)
+        self.max_depth[depth_name] = max(self.max_depth[depth_name], queue.qsize())
+
+    async def _fetcher(self, executor: Executor, keys: asyncio.Queue, fetched: asyncio.Queue, progress):
+        loop = asyncio.get_running_loop()
+        stats = self.stats['抓取']
+        while not keys.empty():
+            key = keys.get_nowait()
+            started = stats.begin()
+            try:
+                payload = await loop.run_in_executor(executor, self.fetch, key)
+            except Exception as e:
+                stats.end(started, error=True)
+                progress.update(1)
+                print(f"抓取 {key} 失败: {e}")
+                continue
+            stats.end(started)
+            await self._put(fetched, (key, payload), stats, '抓取→提取')
+
+    async def _extractor(self, executor: Executor, fetched: asyncio.Queue, extracted: asyncio.Queue, progress):
+        loop = asyncio.get_running_loop()
+        stats = self.stats['提取']
+        while True:
+            item = await fetched.get()
+            if item is _DONE:
+                return
+            key, payload = item
+            started = stats.begin()
+            try:
+                result = await loop.run_in_executor(executor, self.extract, payload)
+            except Exception as e:
+                stats.end(started, error=True)
+                progress.update(1)
+                print(f"提取 {key} 失败: {e}")
+                continue
+            stats.end(started)
+            await self._put(extracted, (key, result), stats, '提取→写入')
+
+    async def _writer(self, fetched: asyncio.Queue, extracted: asyncio.Queue, progress):
+        stats = self.stats['写入']
+        while True:
+            items = [await extracted.get()]
+            # 已经就绪的结果一起写入；_DONE 总是最后一个
+            while not extracted.empty():
+                items.append(extracted.get_nowait())
+            done = items[-1] is _DONE
+            if done:
+                items.pop()
+            if items:
+                with self.batch():
+                    for key, result in items:
+                        started = stats.begin()
+                        try:
+                            self.write(key, result)
+                            stats.end(started)
+                        except Exception as e:
+                            stats.end(started, error=True)
+                            print(f"写入 {key} 失败: {e}")
+                        progress.update(1)
+                progress.set_postfix_str(f"队列 {fetched.qsize()}/{extracted.qsize()}", refresh=False)
+            if done:
+                return
+
+    async def _run(self, keys: list):
+        queue: asyncio.Queue = asyncio.Queue()
+        for key in keys:
+            queue.put_nowait(key)
+        fetched: asyncio.Queue = asyncio.Queue(self.queue_size)
+        extracted: asyncio.Queue = asyncio.Queue(self.queue_size)
+        workers = self.processes or 1
+        extract_pool = ProcessPoolExecutor(workers) if self.processes else ThreadPoolExecutor(workers)
+        with tqdm(total=len(keys), desc=self.desc) as progress, \
+                ThreadPoolExecutor(self.fetch_concurrency) as fetch_pool, extract_pool:
+            fetchers = [asyncio.ensure_future(self._fetcher(fetch_pool, queue, fetched, progress))
+                        for _ in range(self.fetch_concurrency)]
+            extractors = [asyncio.ensure_future(self._extractor(extract_pool, fetched, extracted, progress))
+                          for _ in range(workers)]
+            writer = asyncio.ensure_future(self._writer(fetched, extracted, progress))
+            await asyncio.gather(*fetchers)
+            for _ in extractors:
+                await fetched.put(_DONE)
+            await asyncio.gather(*extractors)
+            await extracted.put(_DONE)
+            await writer
+
+    def run(self, keys: Iterable[Hashable]) -> Dict[str, StageStats]:
+        """处理全部 key，返回各阶段的统计"""
+        keys = list(keys)
+        if keys:
+            asyncio.run(self._run(keys))
+            print(self.report())
+        return self.stats
+
+    def report(self) -> str:
+        mode = f"{self.processes} 个进程" if self.processes else "线程"
+        lines = [f"流水线: 抓取并发 {self.fetch_concurrency}，提取 {mode}，队列上限 {self.queue_size}",
+                 f"{'阶段':<4} {'处理数':>6} {'错误':>6} {'吞吐(个/s)':>10} {'平均并发':>8} {'等待下游(s)':>12}"]
+        lines += [stats.report() for stats in self.stats.values()]
+        lines.append("队列最大深度: " + "，".join(f"{name} {depth}" for name, depth in self.max_depth.items()))
+        return '\n'.join(lines)
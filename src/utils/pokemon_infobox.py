@@ -0,0 +1,346 @@
+"""宝可梦页面信息的单次遍历提取
+
+parse_pokemon_page 原来为每个字段分别调用 soup.find/find_all/find_parent/find_next，
+每次都扫描整个文档，其中几个还对每个标签调用 lambda。现在需要的元素在 PAGE_SPECS 中声明，
+collect_elements() 只遍历一次文档，按标签名交给对应的规则，记录匹配的元素和它在文档中的位置；
+各字段再只在收集到的少量元素（主要是信息框的单元格）上计算。
+
+原来的 find_previous/find_next（"之前/之后最近的某个元素"）改为按记录的位置二分查找。
+
+同一物种的各形态（如 Mewtwo、Mewtwo-Mega-X、Mewtwo-Mega-Y）在 wiki 上是同一个条目，
+信息框中各形态独有的元素带有 "_toggle formN" 类，切换按钮带有 "_toggler_show-formN" 类、
+文本是形态名称。split_form_name() 按 FORM_TRANSLATIONS/SPECIAL_FORM_NAMES 找出形态名称对应的
+基础物种，PokemonInfobox(soup, form) 跳过其他形态的元素，只提取一个形态的信息。
+"""
+import bisect
+import unicodedata
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from bs4 import BeautifulSoup, Tag
+
+from .patterns import DIGITS, FIRST_NUMBER, WIKI_FORM_TOGGLER_CLASS
+from .translations import FORM_TRANSLATIONS, SPECIAL_FORM_NAMES
+
+# 页面上列出图鉴编号的地区
+POKEDEX_REGIONS = ['关都', '城都', '丰缘', '神奥', '合众', '卡洛斯', '阿罗拉', '伽勒尔', '帕底亚']
+EV_STATS = ['HP', '攻击', '防御', '特攻', '特防', '速度']
+
+
+def class_matches(tag: Tag, predicate: Callable[[str], bool]) -> bool:
+    """与 bs4 的 class_=函数 相同：任意一个类名或完整的 class 字符串满足条件"""
+    classes = tag.get('class') or []
+    return any(predicate(c) for c in classes) or (len(classes) > 1 and predicate(' '.join(classes)))
+
+
+def _form_toggler(tag: Tag) -> Optional[str]:
+    """切换到某个形态的按钮对应的形态（如 'form2'）"""
+    for c in tag.get('class') or ():
+        match = WIKI_FORM_TOGGLER_CLASS.match(c)
+        if match:
+            return match.group(1)
+    return None
+
+
+class ElementSpec(NamedTuple):
+    """要收集的元素：名称、标签名（None 表示任意标签）、匹配条件，first 为 True 时只取第一个"""
+    name: str
+    tag: Optional[str]
+    match: Optional[Callable[[Tag], bool]] = None
+    first: bool = True
+
+
+PAGE_SPECS = [
+    ElementSpec('title', 'title'),
+    # 第一个属性链接所在单元格的 class 就是信息框单元格的 class
+    ElementSpec('type_link', 'a', lambda tag: tag.get('title', '').endswith('（属性）')),
+    ElementSpec('category', 'a', lambda tag: 'Category:' in tag.get('href', '') and '宝可梦' in tag.get('title', '')),
+    # 全部链接，用于查找隐藏特性标记之前的特性链接
+    ElementSpec('links', 'a', first=False),
+    ElementSpec('hidden_ability', 'small', lambda tag: '隱藏特性' in str(tag.string)),
+    ElementSpec('ev_label', 'b', lambda tag: '取得基础点数' in str(tag.string)),
+    ElementSpec('gender_ratio', 'span', lambda tag: tag.get('style') == 'color:#FF6060;'),
+    ElementSpec('roundy_cells', 'td', lambda tag: class_matches(tag, lambda c: 'roundy' in c), first=False),
+    ElementSpec('region_cells', 'td', lambda tag: class_matches(
+        tag, lambda c: c.startswith('bgl-') and 'roundyleft' in c), first=False),
+    ElementSpec('number_cells', 'td', lambda tag: class_matches(tag, lambda c: c.startswith('bd-')), first=False),
+    ElementSpec('form_togglers', None, lambda tag: _form_toggler(tag) is not None, first=False),
+]
+
+
+class PageElements:
+    """collect_elements() 的结果：每个规则匹配的 (位置, 元素) 列表，按文档顺序排列"""
+
+    def __init__(self, found: Dict[str, List[Tuple[int, Tag]]]):
+        self.found = found
+
+    def first(self, name: str) -> Optional[Tag]:
+        matches = self.found[name]
+        return matches[0][1] if matches else None
+
+    def all(self, name: str) -> List[Tuple[int, Tag]]:
+        return self.found[name]
+
+    def previous(self, name: str, position: int) -> Optional[Tag]:
+        """位置在 position 之前的最后一个元素"""
+        matches = self.found[name]
+        # 位置各不相同，(position,) 只与元组的第一项比较
+        index = bisect.bisect_left(matches, (position,))
+        return matches[index - 1][1] if index > 0 else None
+
+    def next(self, name: str, position: int) -> Optional[Tag]:
+        """位置在 position 之后的第一个元素"""
+        matches = self.found[name]
+        index = bisect.bisect_left(matches, (position + 1,))
+        return matches[index][1] if index < len(matches) else None
+
+
+def _subtree_end(tag: Tag):
+    """文档顺序中 tag 的子树之后的第一个节点"""
+    while tag is not None and tag.next_sibling is None:
+        tag = tag.parent
+    return tag.next_sibling if tag is not None else None
+
+
+def collect_elements(soup: BeautifulSoup, specs: List[ElementSpec] = PAGE_SPECS,
+                     excluded: Optional[Callable[[Tag], bool]] = None) -> PageElements:
+    """遍历一次文档，收集 specs 声明的元素；excluded(元素) 为真时跳过整个子树"""
+    by_tag = defaultdict(list)
+    for spec in specs:
+        by_tag[spec.tag].append(spec)
+    any_tag = by_tag.pop(None, [])
+    found = {spec.name: [] for spec in specs}
+    position = 0
+    skip_until = None
+    for element in soup.descendants:
+        if skip_until is not None:
+            if element is not skip_until:
+                continue
+            skip_until = None
+        if not isinstance(element, Tag):
+            continue
+        if excluded is not None and excluded(element):
+            skip_until = _subtree_end(element)
+            if skip_until is None:
+                break
+            continue
+        tag_specs = by_tag.get(element.name)
+        if any_tag:
+            tag_specs = tag_specs + any_tag if tag_specs else any_tag
+        if tag_specs is None:
+            continue
+        position += 1
+        for spec in tag_specs:
+            matches = found[spec.name]
+            if spec.first and matches:
+                continue
+            if spec.match is None or spec.match(element):
+                matches.append((position, element))
+    return PageElements(found)
+
+
+class PokemonInfobox:
+    """一个宝可梦页面的各项信息，字段都从 collect_elements() 的结果计算"""
+
+    def __init__(self, soup: BeautifulSoup, form: Optional[str] = None):
+        # form 为 None 时使用整个页面（与原来逐个页面提取相同），否则跳过其他形态独有的元素
+        self.form = form
+        excluded = None
+        if form is not None:
+            excluded = lambda tag: '_toggle' in (tag.get('class') or ()) and form not in tag.get('class')
+        self.elements = collect_elements(soup, excluded=excluded)
+        title = self.elements.first('title')
+        self.title = title.text if title else None
+        self.type_name, self.type_class = self._type()
+        # 与属性单元格 class 相同的单元格（信息框中的各项）及其文本
+        self.cells: List[Tuple[Tag, str]] = []
+        if self.type_class:
+            self.cells = [(cell, cell.text) for _, cell in self.elements.all('roundy_cells')
+                          if class_matches(cell, lambda c: c == self.type_class)]
+
+    def _type(self) -> Tuple[Optional[str], Optional[str]]:
+        """属性名称和信息框单元格的完整类名"""
+        type_link = self.elements.first('type_link')
+        if type_link:
+            type_td = type_link.find_parent('td', class_=lambda x: x and 'roundy' in x)
+            if type_td:
+                return type_link['title'].replace('（属性）', ''), ' '.join(type_td['class'])
+        return None, None
+
+    def form_labels(self) -> Dict[str, str]:
+        """页面中各形态的名称，如 {'form1': '超梦', 'form2': '超级超梦Ｘ'}"""
+        labels = {}
+        for _, toggler in self.elements.all('form_togglers'):
+            label = toggler.get_text(strip=True)
+            if label:
+                labels.setdefault(_form_toggler(toggler), label)
+        return labels
+
+    def category(self) -> str:
+        category = self.elements.first('category')
+        return category.text.replace('宝可梦', '') if category else ""
+
+    def abilities(self) -> str:
+        for cell, text in self.cells:
+            if cell.get('width') == '50%' and not ('隐藏特性' in text or '隱藏特性' in text):
+                ability_links = cell.find_all('a', title=lambda x: x and x.endswith('（特性）'))
+                if ability_links:
+                    # 用"或"连接所有特性，去掉"（特性）"后缀
+                    return ' 或 '.join(link['title'].replace('（特性）', '') for link in ability_links)
+        return ""
+
+    def hidden_ability(self) -> str:
+        # 隐藏特性标记之前最近的链接就是隐藏特性
+        hidden = self.elements.all('hidden_ability')
+        if hidden:
+            ability_link = self.elements.previous('links', hidden[0][0])
+            if ability_link:
+                return ability_link.text.strip()
+        return ""
+
+    def catch_rate(self) -> str:
+        for cell, _ in self.cells:
+            explain_span = cell.find('span', class_='explain')
+            if explain_span and '%' in explain_span.text:
+                return explain_span.text.strip()
+        return ""
+
+    def base_exp(self) -> str:
+        for _, text in self.cells:
+            if '基础经验值' in text:
+                match = FIRST_NUMBER.search(text.strip())
+                if match:
+                    return match.group(1)
+        return ""
+
+    def ev_yield(self) -> Dict[str, int]:
+        ev_stats = {stat: 0 for stat in EV_STATS}
+        ev_label = self.elements.first('ev_label')
+        if ev_label:
+            ev_table = ev_label.find_parent('td').find('table', class_='roundy bgwhite fulltable')
+            if ev_table:
+                for stat in EV_STATS:
+                    cell = ev_table.find('td', class_=f'roundy bw-1 bgl-{stat} bd-{stat}')
+                    if cell:
+                        # 最后一个数字是基础点数
+                        numbers = DIGITS.findall(cell.get_text(strip=True))
+                        if numbers:
+                            ev_stats[stat] = int(numbers[-1])
+        return ev_stats
+
+    def egg_groups(self) -> Optional[str]:
+        for _, text in self.cells:
+            if '蛋组' in text:
+                return text.strip()
+        # 与原来的 _get_egg_groups 相同，找不到时为 None
+        return None
+
+    def egg_cycles(self) -> str:
+        for _, text in self.cells:
+            if '孵化周期' in text:
+                numbers = DIGITS.findall(text)
+                if len(numbers) >= 2:
+                    # "20周期（5140步）" 格式
+                    return f"{numbers[0]}周期（{numbers[1]}步）"
+                if numbers:
+                    return numbers[0]
+        return ""
+
+    def gender_ratio(self) -> str:
+        ratio_cell = self.elements.first('gender_ratio')
+        return ratio_cell.text.strip() if ratio_cell else ""
+
+    def pokedex_numbers(self) -> Dict[str, str]:
+        numbers = {}
+        for position, cell in self.elements.all('region_cells'):
+            region = cell.find('b')
+            if region is None:
+                # 与原来的写法相同：遇到没有地区名称的单元格时停止，只保留之前的编号
+                break
+            if region.text in POKEDEX_REGIONS:
+                # 地区单元格之后的第一个编号单元格
+                number = self.elements.next('number_cells', position)
+                if number and '#' in number.text:
+                    numbers[region.text] = number.text.split('#')[1].strip()
+        return numbers
+
+    # 输出的字段: (字段名, 计算方法, 出错时的默认值)
+    FIELDS = [
+        ('category_cn', category, ""),
+        ('abilities_normal', abilities, ""),
+        ('ability_hidden', hidden_ability, ""),
+        ('catch_rate', catch_rate, ""),
+        ('base_exp', base_exp, ""),
+        ('ev_yield', ev_yield, None),
+        ('egg_groups', egg_groups, ""),
+        ('egg_cycles', egg_cycles, ""),
+        ('gender_ratio', gender_ratio, ""),
+        ('pokedex_numbers', pokedex_numbers, None),
+    ]
+
+    def fields(self) -> Dict:
+        """计算全部字段，单个字段出错时使用默认值"""
+        data = {}
+        for name, method, default in self.FIELDS:
+            try:
+                data[name] = method(self)
+            except Exception as e:
+                print(f"获取{name}失败: {e}")
+                data[name] = default
+        if data['ev_yield'] is None:
+            data['ev_yield'] = {stat: 0 for stat in EV_STATS}
+        if data['pokedex_numbers'] is None:
+            data['pokedex_numbers'] = {}
+        return data
+
+
+def _translate_form(parts: List[str]) -> Optional[List[str]]:
+    """把形态部分拆成 FORM_TRANSLATIONS 中的词（词本身可以带连字符），返回中文；拆不开时返回 None"""
+    if not parts:
+        return []
+    for i in range(len(parts), 0, -1):
+        key = '-'.join(parts[:i])
+        if key in FORM_TRANSLATIONS:
+            rest = _translate_form(parts[i:])
+            if rest is not None:
+                return [FORM_TRANSLATIONS[key]] + rest
+    return None
+
+
+def split_form_name(name_en: str) -> Tuple[str, List[str]]:
+    """返回 (基础物种英文名, 形态的中文关键词)；不是形态时关键词为空
+
+    如 'Mewtwo-Mega-X' -> ('Mewtwo', ['超级', 'X'])，'Ho-Oh' -> ('Ho-Oh', [])。
+    SPECIAL_FORM_NAMES 中不带括号的名称是独立条目（如尼多朗、换装皮卡丘），不算形态。
+    """
+    parts = name_en.split('-')
+    special = SPECIAL_FORM_NAMES.get(name_en)
+    if special is not None:
+        if '（' not in special:
+            return name_en, []
+        keywords = _translate_form(parts[1:]) or [special[special.index('（') + 1:].rstrip('）')]
+        return parts[0], keywords
+    for i in range(1, len(parts)):
+        keywords = _translate_form(parts[i:])
+        if keywords is not None:
+            return '-'.join(parts[:i]), keywords
+    return name_en, []
+
+
+def match_form(labels: Dict[str, str], keywords: Iterable[str]) -> Optional[str]:
+    """在页面的形态名称中找包含全部关键词的形态，有多个时取名称最短的"""
+    keywords = [unicodedata.normalize('NFKC', keyword) for keyword in keywords]
+    candidates = []
+    for form, label in labels.items():
+        label = unicodedata.normalize('NFKC', label)
+        if all(keyword in label for keyword in keywords):
+            candidates.append((len(label), form))
+    return min(candidates)[1] if candidates else None
+
+
+def group_by_species(names: Iterable[str]) -> Dict[str, List[str]]:
+    """按基础物种分组，保持第一次出现的顺序"""
+    groups: Dict[str, List[str]] = {}
+    for name_en in names:
+        groups.setdefault(split_form_name(name_en)[0], []).append(name_en)
+    return groups
@@ -0,0 +1,152 @@
+"""按主机自适应调整请求速率（AIMD）
+
+原来各爬虫在请求之间固定 time.sleep(1)/(2)/(0.5)，服务器空闲时浪费时间，
+服务器繁忙时又不会主动减速。AdaptiveRateController 根据每个响应调整速率：
+
+- 慢启动：第一次遇到拥塞之前，每个正常响应使速率加1（大约每秒翻倍），尽快接近服务器的承载能力
+- 加性增：之后响应正常且延迟没有明显升高时，速率每秒大约增加 increase 个请求
+- 乘性减：遇到 429、5xx、超时/连接错误或延迟超过基线的 latency_factor 倍时，速率乘以 decrease；
+  同一个 cooldown 时间内只减一次，避免同一批并发请求的失败把速率连续压到最低
+- 响应带 Retry-After 时，在指定时间之前暂停该主机的所有请求
+
+请求按当前速率均匀发出（相邻两个请求至少间隔 1/rate 秒）。AdaptiveHostLimiter 为每个主机
+维护一个控制器，接口与 HostRateLimiter 相同，HttpClient 每次请求后调用 record() 反馈结果。
+"""
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+DEFAULT_INITIAL_RATE = 2.0
+DEFAULT_MIN_RATE = 0.2
+DEFAULT_MAX_RATE = 10.0
+# 这些状态码表示服务器过载或限流
+CONGESTION_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class AdaptiveRateController:
+    """单个主机的 AIMD 速率控制器，线程安全"""
+
+    def __init__(self, initial_rate: float = DEFAULT_INITIAL_RATE, min_rate: float = DEFAULT_MIN_RATE,
+                 max_rate: float = DEFAULT_MAX_RATE, increase: float = 1.0, decrease: float = 0.5,
+                 latency_factor: float = 3.0, cooldown: float = 1.0):
+        if not 0 < min_rate <= initial_rate <= max_rate:
+            raise ValueError(f"速率范围不正确: {min_rate} <= {initial_rate} <= {max_rate}")
+        self.rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.cooldown = cooldown
+        self.stats = {'requests': 0, 'increases': 0, 'decreases': 0, 'paused_seconds': 0.0}
+        self._baseline: Optional[float] = None
+        self._latency: Optional[float] = None
+        self._last_send = float('-inf')
+        self._paused_until = 0.0
+        self._cooldown_until = 0.0
+        self._slow_start = True
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """阻塞到可以发送请求，返回等待的秒数
+
+        不预约未来的时间点：等待期间速率提高时，醒来后按新的速率重新计算。
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                send_at = max(self._last_send + 1.0 / self.rate, self._paused_until)
+                if send_at <= now:
+                    self._last_send = now
+                    self.stats['requests'] += 1
+                    return waited
+                wait = send_at - now
+            time.sleep(wait)
+            waited += wait
+
+    def _is_slow(self, latency: float) -> bool:
+        # 基线取观察到的最低延迟，并缓慢向当前延迟靠拢，避免被个别极快的响应拉得过低
+        if self._baseline is None:
+            self._baseline = latency
+        else:
+            self._baseline = min(latency, self._baseline + (latency - self._baseline) * 0.01)
+        self._latency = latency if self._latency is None else self._latency * 0.8 + latency * 0.2
+        return latency > self._baseline * self.latency_factor
+
+    def record(self, latency: Optional[float], status: Optional[int] = None,
+               retry_after: Optional[float] = None):
+        """反馈一次请求的结果；status 为 None 表示超时或连接错误"""
+        with self._lock:
+            now = time.monotonic()
+            if retry_after is not None and retry_after > 0:
+                paused_until = now + retry_after
+                if paused_until > self._paused_until:
+                    self.stats['paused_seconds'] += paused_until - max(now, self._paused_until)
+                    self._paused_until = paused_until
+            congested = status is None or status in CONGESTION_STATUSES
+            if latency is not None and self._is_slow(latency):
+                congested = True
+            if congested:
+                self._slow_start = False
+                if now >= self._cooldown_until:
+                    self.rate = max(self.min_rate, self.rate * self.decrease)
+                    self._cooldown_until = now + self.cooldown
+                    self.stats['decreases'] += 1
+            elif self.rate < self.max_rate:
+                # 加性增时每个请求增加 increase/rate，按当前速率发送时每秒约增加 increase
+                step = 1.0 if self._slow_start else self.increase / self.rate
+                self.rate = min(self.max_rate, self.rate + step)
+                self.stats['increases'] += 1
+
+    def metrics(self) -> Dict[str, float]:
+        """当前速率（请求/秒）、平均延迟等指标"""
+        with self._lock:
+            return {
+                'rate': round(self.rate, 3),
+                'latency': round(self._latency, 4) if self._latency is not None else None,
+                'baseline_latency': round(self._baseline, 4) if self._baseline is not None else None,
+                **self.stats,
+            }
+
+
+class AdaptiveHostLimiter:
+    """按主机分配 AdaptiveRateController"""
+
+    def __init__(self, initial_rate: float = DEFAULT_INITIAL_RATE, min_rate: float = DEFAULT_MIN_RATE,
+                 max_rate: float = DEFAULT_MAX_RATE, **options):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.options = options
+        self._controllers: Dict[str, AdaptiveRateController] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, host: str, rate: float, burst: Optional[float] = None, max_rate: Optional[float] = None):
+        """单独设置某个主机的初始速率和上限（burst 只为与 HostRateLimiter 兼容，不使用）"""
+        max_rate = max(rate, max_rate if max_rate is not None else self.max_rate)
+        with self._lock:
+            self._controllers[host] = AdaptiveRateController(
+                rate, min(self.min_rate, rate), max_rate, **self.options)
+
+    def controller(self, host: str) -> AdaptiveRateController:
+        with self._lock:
+            controller = self._controllers.get(host)
+            if controller is None:
+                controller = self._controllers[host] = AdaptiveRateController(
+                    self.initial_rate, self.min_rate, self.max_rate, **self.options)
+            return controller
+
+    def acquire(self, url: str) -> float:
+        return self.controller(urlsplit(url).netloc).acquire()
+
+    def record(self, url: str, latency: Optional[float], status: Optional[int] = None,
+               retry_after: Optional[float] = None):
+        self.controller(urlsplit(url).netloc).record(latency, status, retry_after)
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """各主机的当前速率等指标"""
+        with self._lock:
+            controllers = dict(self._controllers)
+        return {host: controller.metrics() for host, controller in controllers.items()}
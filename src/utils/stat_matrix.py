@@ -0,0 +1,151 @@
+"""宝可梦种族值矩阵与向量化查询
+
+所有宝可梦的种族值保存在一个 (宝可梦数, 6) 的 int16 数组中，列顺序为
+hp/atk/def/spa/spd/spe；编号和形态序号各是一个整数数组。种族值总和、
+百分位、排名、阈值筛选和加权 top-k 都直接在数组上计算，不经过 pandas apply。
+
+用法（项目根目录）:
+    PYTHONPATH=src python -m utils.stat_matrix
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .dataset_cache import load_ts_dataset
+from .models import STAT_NAMES, Species, build_models
+
+# 'bst' 表示种族值总和
+StatKey = Union[str, int]
+
+
+class BaseStatMatrix:
+    """种族值矩阵"""
+
+    def __init__(self, names: Sequence[str], nums: np.ndarray, form_index: np.ndarray, stats: np.ndarray):
+        if stats.ndim != 2 or stats.shape[1] != len(STAT_NAMES):
+            raise ValueError(f"种族值数组的形状应为 (n, {len(STAT_NAMES)})，实际为 {stats.shape}")
+        self.names = list(names)
+        self.nums = nums
+        self.form_index = form_index
+        self.stats = stats
+        self._row_by_name = {name: row for row, name in enumerate(self.names)}
+        self._bst = None
+        self._sorted_columns = {}
+
+    @classmethod
+    def from_species(cls, species_list: Iterable[Species]) -> 'BaseStatMatrix':
+        """从 Species 列表构建，跳过种族值不全的记录"""
+        names, nums, form_index, rows = [], [], [], []
+        forms_seen: Dict[int, int] = {}
+        for species in species_list:
+            if not species.has_all_stats:
+                continue
+            # 同一编号下按出现顺序编号：0 为基础形态，1 起为其他形态
+            form_index.append(forms_seen.get(species.num, 0))
+            forms_seen[species.num] = form_index[-1] + 1
+            names.append(species.name)
+            nums.append(species.num)
+            rows.append(species.stats)
+        stats = np.array(rows, dtype=np.int16).reshape(len(rows), len(STAT_NAMES))
+        return cls(names, np.array(nums, dtype=np.int32), np.array(form_index, dtype=np.int16), stats)
+
+    @classmethod
+    def load(cls, path='data/pokedex.ts') -> 'BaseStatMatrix':
+        return cls.from_species(build_models(Species, load_ts_dataset(path)))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def row(self, name: str) -> int:
+        """英文名称对应的行号"""
+        return self._row_by_name[name]
+
+    def names_of(self, rows: Iterable[int]) -> List[str]:
+        return [self.names[row] for row in rows]
+
+    def bst(self) -> np.ndarray:
+        """每只宝可梦的种族值总和"""
+        if self._bst is None:
+            self._bst = self.stats.sum(axis=1, dtype=np.int32)
+        return self._bst
+
+    def column(self, stat: StatKey) -> np.ndarray:
+        """按 hp/atk/def/spa/spd/spe/bst 或列号取一列"""
+        if stat == 'bst':
+            return self.bst()
+        if isinstance(stat, str):
+            stat = STAT_NAMES.index(stat)
+        return self.stats[:, stat]
+
+    def _sorted(self, stat: StatKey) -> np.ndarray:
+        key = stat if isinstance(stat, str) else STAT_NAMES[stat]
+        if key not in self._sorted_columns:
+            self._sorted_columns[key] = np.sort(self.column(stat))
+        return self._sorted_columns[key]
+
+    def percentile(self, stat: StatKey) -> np.ndarray:
+        """百分位：该项数值不高于自身的宝可梦所占百分比"""
+        values = self.column(stat)
+        if len(values) == 0:
+            return np.empty(0, dtype=np.float64)
+        not_above = np.searchsorted(self._sorted(stat), values, side='right')
+        return not_above * (100.0 / len(values))
+
+    def rank(self, stat: StatKey) -> np.ndarray:
+        """名次：1 为最高，数值相同的名次相同"""
+        values = self.column(stat)
+        if len(values) == 0:
+            return np.empty(0, dtype=np.int32)
+        not_above = np.searchsorted(self._sorted(stat), values, side='right')
+        return (len(values) - not_above + 1).astype(np.int32)
+
+    def filter(self, min_stats: Optional[Dict[str, int]] = None,
+               max_stats: Optional[Dict[str, int]] = None) -> np.ndarray:
+        """按阈值筛选，返回满足所有条件的行号，例如 filter(min_stats={'spe': 100, 'bst': 500})"""
+        mask = np.ones(len(self), dtype=bool)
+        for stat, threshold in (min_stats or {}).items():
+            mask &= self.column(stat) >= threshold
+        for stat, threshold in (max_stats or {}).items():
+            mask &= self.column(stat) <= threshold
+        return np.flatnonzero(mask)
+
+    def weighted_score(self, weights: Dict[str, float]) -> np.ndarray:
+        """按权重计算得分，未给出的能力值权重为 0"""
+        weight_vector = np.array([weights.get(stat, 0.0) for stat in STAT_NAMES], dtype=np.float64)
+        return self.stats @ weight_vector
+
+    def top_k(self, weights: Dict[str, float], k: int = 10,
+              rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """加权得分最高的 k 个行号（从高到低），可先用 filter 的结果限定范围"""
+        scores = self.weighted_score(weights)
+        candidates = np.arange(len(self)) if rows is None else np.asarray(rows)
+        if len(candidates) == 0:
+            return candidates
+        k = min(k, len(candidates))
+        candidate_scores = scores[candidates]
+        top = np.argpartition(-candidate_scores, k - 1)[:k]
+        top = top[np.argsort(-candidate_scores[top], kind='stable')]
+        return candidates[top]
+
+
+def main():
+    matrix = BaseStatMatrix.load()
+    print(f"共 {len(matrix)} 只宝可梦（含形态）")
+
+    bst = matrix.bst()
+    print("\n种族值总和前10:")
+    for row in np.argsort(-bst, kind='stable')[:10]:
+        print(f"  {matrix.names[row]}: {bst[row]}")
+
+    fast = matrix.filter(min_stats={'spe': 120}, max_stats={'bst': 540})
+    print(f"\n速度>=120 且种族值总和<=540: {len(fast)} 只")
+
+    sweepers = matrix.top_k({'spa': 1.0, 'spe': 1.0}, k=5, rows=fast)
+    print("其中特攻+速度最高的5只:", matrix.names_of(sweepers))
+
+    row = matrix.row('Pikachu')
+    print(f"\nPikachu 速度百分位 {matrix.percentile('spe')[row]:.1f}, 速度排名 {matrix.rank('spe')[row]}")
+
+
+if __name__ == "__main__":
+    main()
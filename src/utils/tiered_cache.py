@@ -0,0 +1,157 @@
+"""内存 LRU + SQLite 的两级缓存
+
+TieredCache 包在 cache_store 的命名空间外面：
+- 第一级是进程内有上限的 LRU（OrderedDict），命中时不访问数据库
+- 第二级是 CacheStore，内存中没有时从数据库读取并放入 LRU
+- 每个命名空间有自己的有效期（NAMESPACE_TTLS，按 updated_at 计算），过期的条目当作未命中
+- 值为 None 的是"负缓存"：确认查不到的名称（如页面不存在）也记下来，
+  有效期较短（NEGATIVE_TTL），期间不会再发请求
+
+网络错误等临时失败不应写入负缓存，由调用方区分。
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, MutableMapping, Optional, Tuple
+
+from .cache_store import CacheNamespace, open_cache
+
+DAY = 24 * 3600
+
+# 正常条目的有效期（秒），None 表示不过期
+NAMESPACE_TTLS: Dict[str, Optional[float]] = {
+    'pokemon_names': None,
+    'ability_translations': None,
+    'item_translations': None,
+    'move_translations': None,
+    'ability_descriptions': 180 * DAY,
+    'item_descriptions': 180 * DAY,
+    'move_descriptions': 180 * DAY,
+}
+# 负缓存的有效期
+NEGATIVE_TTL = 7 * DAY
+DEFAULT_MAX_ENTRIES = 4096
+
+
+class TieredCache(MutableMapping):
+    """带有效期和负缓存的两级缓存，接口与 dict 相同
+
+    `key in cache` 只对未过期的条目成立；`cache[key]` 对负缓存返回 None。
+    遍历和 len() 与之一致：只包含未过期的条目（含未过期的负缓存），不计入命中统计。
+    """
+
+    def __init__(self, backend: CacheNamespace, ttl: Optional[float] = None,
+                 negative_ttl: Optional[float] = NEGATIVE_TTL, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.backend = backend
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._memory: 'OrderedDict[str, Tuple[Any, float]]' = OrderedDict()
+        self._lock = threading.RLock()
+        self.stats = {'hits': 0, 'disk_hits': 0, 'negative_hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0}
+
+    @property
+    def name(self) -> str:
+        return self.backend.name
+
+    def _fresh(self, negative: bool, updated_at: float) -> bool:
+        ttl = self.negative_ttl if negative else self.ttl
+        return ttl is None or time.time() - updated_at <= ttl
+
+    def _remember(self, key: str, value: Any, updated_at: float):
+        self._memory[key] = (value, updated_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def _load(self, key: str) -> Optional[Tuple[Any, float]]:
+        """先查内存再查数据库，返回 (值, 更新时间)，不检查有效期"""
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            return entry
+        stored = self.backend.store.get_entry(self.name, key)
+        if stored is None:
+            return None
+        raw, updated_at = stored
+        entry = (None if raw is None else json.loads(raw), updated_at)
+        self._remember(key, *entry)
+        return entry
+
+    def lookup(self, key: str) -> Tuple[bool, Any]:
+        """返回 (是否命中, 值)；命中负缓存时为 (True, None)"""
+        with self._lock:
+            in_memory = key in self._memory
+            entry = self._load(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return False, None
+            value, updated_at = entry
+            if not self._fresh(value is None, updated_at):
+                self.stats['expired'] += 1
+                return False, None
+            if value is None:
+                self.stats['negative_hits'] += 1
+            else:
+                self.stats['hits' if in_memory else 'disk_hits'] += 1
+            return True, value
+
+    def peek(self, key: str) -> Any:
+        """返回已保存的值，不检查有效期也不计入统计（用于刷新失败时沿用旧值）"""
+        with self._lock:
+            entry = self._load(key)
+        return None if entry is None else entry[0]
+
+    def mark_missing(self, key: str):
+        """记录一个确认查不到的名称"""
+        self[key] = None
+
+    def __getitem__(self, key: str) -> Any:
+        found, value = self.lookup(key)
+        if not found:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.lookup(key)[0]
+
+    def __setitem__(self, key: str, value: Any):
+        with self._lock:
+            self.backend[key] = value
+            self._remember(key, value, time.time())
+
+    def __delitem__(self, key: str):
+        with self._lock:
+            self._memory.pop(key, None)
+            del self.backend[key]
+
+    def _fresh_keys(self) -> List[str]:
+        return [key for key, negative, updated_at in self.backend.store.key_times(self.name)
+                if self._fresh(negative, updated_at)]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fresh_keys())
+
+    def __len__(self) -> int:
+        return len(self._fresh_keys())
+
+    def batch(self):
+        """块内的写入合并为一个事务，见 CacheStore.batch"""
+        return self.backend.batch()
+
+    def export_json(self, path=None) -> int:
+        """导出有值的条目（负缓存不导出）"""
+        return self.backend.export_json(path)
+
+    def report(self) -> str:
+        stats = self.stats
+        return (f"{self.name}: 内存命中 {stats['hits']}，数据库命中 {stats['disk_hits']}，"
+                f"负缓存命中 {stats['negative_hits']}，未命中 {stats['misses']}，"
+                f"过期 {stats['expired']}，淘汰 {stats['evictions']}")
+
+
+def open_tiered_cache(namespace: str, max_entries: int = DEFAULT_MAX_ENTRIES) -> TieredCache:
+    """打开一个已知命名空间的两级缓存，有效期见 NAMESPACE_TTLS"""
+    return TieredCache(open_cache(namespace), ttl=NAMESPACE_TTLS.get(namespace), max_entries=max_entries)
@@ -1,5 +1,14 @@
 """宝可梦形态翻译数据"""
 
+# 属性中英文对照
+TYPE_TRANSLATIONS = {
+    'Normal': '一般', 'Fire': '火', 'Water': '水', 'Electric': '电',
+    'Grass': '草', 'Ice': '冰', 'Fighting': '格斗', 'Poison': '毒',
+    'Ground': '地面', 'Flying': '飞行', 'Psychic': '超能力', 'Bug': '虫',
+    'Rock': '岩石', 'Ghost': '幽灵', 'Dragon': '龙', 'Dark': '恶',
+    'Steel': '钢', 'Fairy': '妖精'
+}
+
 # 特殊形态的中文翻译对照
 FORM_TRANSLATIONS = {
     # 基础形态
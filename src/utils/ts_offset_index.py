@@ -0,0 +1,118 @@
+"""data/*.ts 的按需读取索引
+
+第一次使用时扫描一遍文件，记下每条顶层记录（如 bulbasaur: {...}）的字节区间，
+保存到源文件旁边的 <文件名>.idx；之后通过 mmap 只读取和解析被访问的那一条记录。
+适合只需要查看少量记录的调试工具，不必为一条记录解析整个文件。
+
+用法（项目根目录）:
+    PYTHONPATH=src python -m utils.ts_offset_index data/pokedex.ts Bulbasaur Pikachu
+"""
+import json
+import mmap
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from .dataset_index import to_id
+from .ts_parser import PARSER_VERSION, parse_ts_value, scan_ts_spans
+
+INDEX_SUFFIX = '.idx'
+
+
+class TSOffsetIndex:
+    """按记录ID随机访问 data/*.ts 的只读索引"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.index_file = self.path.with_name(self.path.name + INDEX_SUFFIX)
+        self._file = open(self.path, 'rb')
+        stat = os.fstat(self._file.fileno())
+        self._stamp = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'parser_version': PARSER_VERSION}
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b''
+        self._records: Dict[str, Any] = {}
+        self.offsets = self._load_offsets()
+
+    def _load_offsets(self) -> Dict[str, Tuple[int, int]]:
+        """读取已保存的偏移表，源文件变化（大小或修改时间不同）时重新扫描"""
+        if self.index_file.exists():
+            try:
+                saved = json.loads(self.index_file.read_text(encoding='utf-8'))
+                if all(saved.get(key) == value for key, value in self._stamp.items()):
+                    return {key: tuple(span) for key, span in saved['offsets'].items()}
+            except (OSError, ValueError, KeyError):
+                pass
+
+        # 语法字符都是 ASCII，按 latin-1 解码时字符位置就是字节偏移
+        offsets = scan_ts_spans(self._mmap[:].decode('latin-1'))
+        try:
+            tmp_file = self.index_file.with_name(f"{self.index_file.name}.{os.getpid()}.tmp")
+            tmp_file.write_text(json.dumps({**self._stamp, 'offsets': offsets}), encoding='utf-8')
+            os.replace(tmp_file, self.index_file)
+        except OSError as e:
+            print(f"保存偏移索引失败 {self.index_file}: {e}")
+        return offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __contains__(self, name_or_id: str) -> bool:
+        return to_id(name_or_id) in self.offsets
+
+    def keys(self) -> Iterator[str]:
+        return iter(self.offsets)
+
+    def raw(self, name_or_id: str) -> Optional[str]:
+        """返回记录的原始源码文本"""
+        span = self.offsets.get(to_id(name_or_id))
+        if span is None:
+            return None
+        start, end = span
+        return self._mmap[start:end].decode('utf-8')
+
+    def get(self, name_or_id: str) -> Optional[Dict[str, Any]]:
+        """按英文名称或记录ID读取并解析一条记录，结果会被缓存"""
+        record_id = to_id(name_or_id)
+        if record_id in self._records:
+            return self._records[record_id]
+        text = self.raw(record_id)
+        if text is None:
+            return None
+        record = parse_ts_value(text)
+        self._records[record_id] = record
+        return record
+
+    def close(self):
+        if isinstance(self._mmap, mmap.mmap):
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> 'TSOffsetIndex':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("用法: python -m utils.ts_offset_index <data/*.ts> <名称或ID> [...]")
+        return
+
+    start = time.perf_counter()
+    with TSOffsetIndex(sys.argv[1]) as index:
+        print(f"打开索引: {len(index)} 条记录, 耗时 {(time.perf_counter() - start) * 1000:.2f}ms")
+        for name in sys.argv[2:]:
+            start = time.perf_counter()
+            record = index.get(name)
+            elapsed = (time.perf_counter() - start) * 1000
+            if record is None:
+                print(f"\n{name}: 未找到")
+                continue
+            print(f"\n{name} (查询耗时 {elapsed:.3f}ms):")
+            print(json.dumps(record, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""Showdown data/*.ts 对象字面量解析器
+
+data/*.ts 的格式都是 ``export const X = { id: {...}, ... };``。这里用一个
+基于正则分词的单遍扫描器把整个对象字面量解析成 Python 数据：
+
+- 字符串、数字、true/false/null、数组、对象都会转换成对应的 Python 值
+- onHit(...) {...} 这类方法、箭头函数、function 表达式等非字面量的值
+  通过括号配对直接跳过，不做回溯，也不会出现在结果里
+"""
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from . import patterns
+
+# 解析器版本，解析结果的格式或语义变化时递增，用于让旧的解析缓存失效
+PARSER_VERSION = 1
+
+# 跳过的值（函数体、表达式等）使用的占位符
+_SKIP = object()
+
+_ESCAPE_MAP = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+_LITERALS = {'true': True, 'false': False, 'null': None, 'undefined': None}
+
+
+class TSParseError(ValueError):
+    """数据文件格式无法解析"""
+
+
+def _unescape(raw: str) -> str:
+    """处理字符串中的转义字符"""
+    if '\\' not in raw:
+        return raw
+
+    def replace(match):
+        esc = match.group(1)
+        if esc[0] in 'ux' and len(esc) > 1:
+            return chr(int(esc[1:], 16))
+        return _ESCAPE_MAP.get(esc, esc)
+
+    return patterns.TS_ESCAPE.sub(replace, raw)
+
+
+class _TSScanner:
+    """对象字面量扫描器，从左到右只走一遍"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+        # 按当前的计时设置绑定分词方法：不计时时就是 re.Pattern 自己的方法，没有额外开销；
+        # 开启计时（PATTERNS.set_timing）后创建的扫描器使用计时的版本
+        self._export = patterns.TS_EXPORT.search
+        self._ws = patterns.TS_WHITESPACE.match
+        self._key = patterns.TS_KEY.match
+        self._string = patterns.TS_STRING.match
+        self._number = patterns.TS_NUMBER.match
+        self._ident = patterns.TS_IDENT.match
+        self._code_token = patterns.TS_CODE_TOKEN.search
+        self._template_token = patterns.TS_TEMPLATE_TOKEN.search
+
+    def error(self, message: str) -> TSParseError:
+        line = self.text.count('\n', 0, self.pos) + 1
+        return TSParseError(f"{message} (第{line}行)")
+
+    def skip_ws(self):
+        self.pos = self._ws(self.text, self.pos).end()
+
+    def peek(self) -> str:
+        return self.text[self.pos:self.pos + 1]
+
+    def expect(self, char: str):
+        self.skip_ws()
+        if self.peek() != char:
+            raise self.error(f"期望 '{char}'，实际为 '{self.peek()}'")
+        self.pos += 1
+
+    def parse_export(self) -> Tuple[str, Dict[str, Any]]:
+        """定位 export const 声明并解析其对象字面量"""
+        match = self._export(self.text)
+        if not match:
+            raise TSParseError("找不到 export const 声明")
+        self.pos = match.end()
+        self.skip_ws()
+        if self.peek() != '{':
+            raise self.error("export const 的值不是对象字面量")
+        return match.group(1), self.parse_object()
+
+    def scan_spans(self) -> Dict[str, Tuple[int, int]]:
+        """只扫描顶层对象，返回 {记录ID: (值起始位置, 值结束位置)}，不解析记录内容"""
+        match = self._export(self.text)
+        if not match:
+            raise TSParseError("找不到 export const 声明")
+        self.pos = match.end()
+        self.expect('{')
+        spans = {}
+        text = self.text
+        while True:
+            self.skip_ws()
+            if self.peek() == '}':
+                return spans
+            key_match = self._key(text, self.pos)
+            if not key_match:
+                raise self.error("无法识别的记录ID")
+            self.pos = key_match.end()
+            if key_match.group(1) is not None:
+                key = key_match.group(1)
+            else:
+                raw = key_match.group(2) if key_match.group(2) is not None else key_match.group(3)
+                key = _unescape(raw)
+            self.expect(':')
+            self.skip_ws()
+            start = self.pos
+            if self.peek() == '{':
+                self.pos = self.skip_code(start, stop_on_comma=False)
+            else:
+                self.pos = self.skip_code(start, stop_on_comma=True)
+            spans[key] = (start, self.pos)
+            self.skip_ws()
+            if self.peek() == ',':
+                self.pos += 1
+            elif self.peek() != '}':
+                raise self.error(f"对象中出现意外字符 '{self.peek()}'")
+
+    def parse_value(self) -> Any:
+        self.skip_ws()
+        char = self.peek()
+        if char == '{':
+            return self.parse_object()
+        if char == '[':
+            return self.parse_array()
+        if char in '"\'':
+            match = self._string(self.text, self.pos)
+            if not match:
+                raise self.error("字符串未闭合")
+            self.pos = match.end()
+            raw = match.group(1) if match.group(1) is not None else match.group(2)
+            return _unescape(raw)
+        if char.isdigit() or char in '-.':
+            match = self._number(self.text, self.pos)
+            if match:
+                self.pos = match.end()
+                number = match.group()
+                if '.' in number or 'e' in number or 'E' in number:
+                    return float(number)
+                return int(number)
+        match = self._ident(self.text, self.pos)
+        if match and match.group() in _LITERALS:
+            self.pos = match.end()
+            return _LITERALS[match.group()]
+        # 函数表达式、箭头函数、模板字符串、计算表达式等一律跳过
+        self.pos = self.skip_code(self.pos, stop_on_comma=True)
+        return _SKIP
+
+    def _finish_value(self, start: int, value: Any, closer: str) -> Any:
+        """值后面不是分隔符时（如 60 * 2），把整个表达式当成非字面量跳过"""
+        self.skip_ws()
+        if self.peek() in (',', closer):
+            return value
+        self.pos = self.skip_code(start, stop_on_comma=True)
+        self.skip_ws()
+        return _SKIP
+
+    def parse_object(self) -> Dict[str, Any]:
+        self.expect('{')
+        obj = {}
+        text = self.text
+        while True:
+            self.skip_ws()
+            char = self.peek()
+            if char == '}':
+                self.pos += 1
+                return obj
+            if text.startswith('...', self.pos):
+                self.pos = self.skip_code(self.pos, stop_on_comma=True)
+            else:
+                match = self._key(text, self.pos)
+                if not match:
+                    raise self.error("无法识别的属性名")
+                self.pos = match.end()
+                if match.group(1) is not None:
+                    key = match.group(1)
+                else:
+                    raw = match.group(2) if match.group(2) is not None else match.group(3)
+                    key = _unescape(raw)
+                self.skip_ws()
+                char = self.peek()
+                if char == ':':
+                    self.pos += 1
+                    self.skip_ws()
+                    start = self.pos
+                    value = self._finish_value(start, self.parse_value(), '}')
+                    if value is not _SKIP:
+                        obj[key] = value
+                elif char == '(':
+                    # 方法简写 onHit(target) {...}：跳过参数表和函数体
+                    self.pos = self.skip_code(self.pos, stop_on_comma=False)
+                    body = text.find('{', self.pos)
+                    if body < 0:
+                        raise self.error("方法缺少函数体")
+                    self.pos = self.skip_code(body, stop_on_comma=False)
+                elif char in ',}':
+                    # 属性简写 {foo}，没有字面量值
+                    pass
+                else:
+                    raise self.error(f"属性 {key} 后出现意外字符 '{char}'")
+            self.skip_ws()
+            char = self.peek()
+            if char == ',':
+                self.pos += 1
+            elif char != '}':
+                raise self.error(f"对象中出现意外字符 '{char}'")
+
+    def parse_array(self) -> List[Any]:
+        self.expect('[')
+        items = []
+        while True:
+            self.skip_ws()
+            if self.peek() == ']':
+                self.pos += 1
+                return items
+            start = self.pos
+            value = self._finish_value(start, self.parse_value(), ']')
+            if value is not _SKIP:
+                items.append(value)
+            char = self.peek()
+            if char == ',':
+                self.pos += 1
+            elif char != ']':
+                raise self.error(f"数组中出现意外字符 '{char}'")
+
+    def skip_code(self, pos: int, stop_on_comma: bool) -> int:
+        """按括号配对跳过一段代码，返回结束位置
+
+        stop_on_comma 为 True 时跳过一个表达式，停在同层的逗号或外层的闭括号之前；
+        为 False 时 pos 必须指向开括号，返回与之配对的闭括号之后的位置。
+        """
+        text = self.text
+        depth = 0
+        while True:
+            match = self._code_token(text, pos)
+            if not match:
+                self.pos = pos
+                raise self.error("代码块未闭合")
+            token = match.group()
+            pos = match.end()
+            if token in '{([':
+                depth += 1
+            elif token in '})]':
+                if depth == 0:
+                    return match.start()
+                depth -= 1
+                if depth == 0 and not stop_on_comma:
+                    return pos
+            elif token == ',':
+                if depth == 0 and stop_on_comma:
+                    return match.start()
+            elif token in '"\'':
+                string = self._string(text, match.start())
+                if not string:
+                    self.pos = match.start()
+                    raise self.error("字符串未闭合")
+                pos = string.end()
+            elif token == '`':
+                pos = self._skip_template(pos)
+            elif token == '//':
+                newline = text.find('\n', pos)
+                pos = len(text) if newline < 0 else newline
+            else:
+                end = text.find('*/', pos)
+                if end < 0:
+                    self.pos = pos
+                    raise self.error("注释未闭合")
+                pos = end + 2
+
+    def _skip_template(self, pos: int) -> int:
+        """跳过模板字符串（pos 位于反引号之后），处理 ${...} 插值"""
+        text = self.text
+        while True:
+            match = self._template_token(text, pos)
+            if not match:
+                self.pos = pos
+                raise self.error("模板字符串未闭合")
+            token = match.group()
+            if token == '`':
+                return match.end()
+            if token == '\\':
+                pos = match.end() + 1
+            else:
+                pos = self.skip_code(match.start() + 1, stop_on_comma=False)
+
+
+def parse_ts_export(content: str) -> Dict[str, Dict[str, Any]]:
+    """解析 export const X = {...} 内容，返回 {记录ID: 字段字典}"""
+    _, records = _TSScanner(content).parse_export()
+    return records
+
+
+def scan_ts_spans(content: str) -> Dict[str, Tuple[int, int]]:
+    """扫描顶层记录的位置，返回 {记录ID: (起始位置, 结束位置)}"""
+    return _TSScanner(content).scan_spans()
+
+
+def parse_ts_value(content: str) -> Any:
+    """解析单个值，例如 scan_ts_spans 给出的一条记录"""
+    value = _TSScanner(content).parse_value()
+    return None if value is _SKIP else value
+
+
+def load_ts_file(path) -> Dict[str, Dict[str, Any]]:
+    """读取并解析 data/*.ts 文件"""
+    content = Path(path).read_text(encoding='utf-8')
+    return parse_ts_export(content)
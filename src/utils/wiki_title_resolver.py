@@ -0,0 +1,144 @@
+"""通过 MediaWiki API 批量获取英文名称对应的中文页面标题
+
+原来的翻译方式是下载整张 wiki 页面，只为了读取 h1#firstHeading。52poke 的英文
+名称页面都会重定向到中文页面，所以直接调用 api.php 的 query 接口，一次查询最多
+50 个标题，跟随重定向并做繁简转换，就能得到同样的标题。
+
+用法（项目根目录）:
+    PYTHONPATH=src python -m utils.wiki_title_resolver Overgrow Thunderbolt "Master Ball"
+    PYTHONPATH=src python -m utils.wiki_title_resolver --api http://127.0.0.1:8000/api.php Overgrow
+
+API 查不到的名称用 fetch_page_titles() 逐页查询：页面并发下载，标题在进程池中提取。
+"""
+import sys
+from contextlib import nullcontext
+from typing import Callable, Dict, Iterable, List, MutableMapping, Optional
+
+from .endpoints import WIKI_API_URL
+from .html_parser import extract_title
+from .http_client import HttpClient
+from .pipeline import DEFAULT_FETCH_CONCURRENCY, FetchExtractPipeline
+
+# 非机器人账号每次 query 最多 50 个标题
+MAX_TITLES_PER_REQUEST = 50
+
+
+def clean_title(title: str) -> str:
+    """去掉标题中的消歧义后缀，如 "茂盛（特性）" -> "茂盛\""""
+    return title.split('（')[0].split('(')[0].strip()
+
+
+class WikiTitleResolver:
+    def __init__(self, api_url: str = WIKI_API_URL, session: Optional[HttpClient] = None,
+                 batch_size: int = MAX_TITLES_PER_REQUEST):
+        self.api_url = api_url
+        self.session = session or HttpClient()
+        self.batch_size = min(batch_size, MAX_TITLES_PER_REQUEST)
+        self.requests_sent = 0
+
+    def _query(self, titles: List[str]) -> Dict[str, Optional[str]]:
+        params = {
+            'action': 'query',
+            'titles': '|'.join(titles),
+            'redirects': 1,
+            'converttitles': 1,
+            'format': 'json',
+            'formatversion': 2,
+        }
+        response = self.session.get(self.api_url, params=params)
+        response.raise_for_status()
+        self.requests_sent += 1
+        query = response.json().get('query', {})
+
+        # 标题依次经过 规范化 -> 繁简转换 -> 重定向（可能多级）
+        steps = {}
+        for key in ('normalized', 'converted', 'redirects'):
+            for entry in query.get(key, []):
+                steps[entry['from']] = entry['to']
+        existing = {
+            page['title'] for page in query.get('pages', [])
+            if not page.get('missing') and not page.get('invalid')
+        }
+
+        resolved = {}
+        for title in titles:
+            current, seen = title, {title}
+            while current in steps and steps[current] not in seen:
+                current = steps[current]
+                seen.add(current)
+            resolved[title] = current if current in existing else None
+        return resolved
+
+    def resolve(self, titles: Iterable[str]) -> Dict[str, Optional[str]]:
+        """返回 {英文标题: 最终页面标题}，页面不存在时为 None"""
+        unique = list(dict.fromkeys(title for title in titles if title))
+        resolved = {}
+        for start in range(0, len(unique), self.batch_size):
+            resolved.update(self._query(unique[start:start + self.batch_size]))
+        return resolved
+
+    def fill_cache(self, cache: MutableMapping[str, str], names: Iterable[str]) -> int:
+        """把缓存中没有的名称批量查询后写入缓存，返回新增的条数
+
+        查询失败或页面不存在的名称不写入，仍由调用方逐页查询。
+        """
+        missing = [name for name in dict.fromkeys(names) if name and name not in cache]
+        if not missing:
+            return 0
+        print(f"批量查询 {len(missing)} 个中文标题...")
+        try:
+            resolved = self.resolve(missing)
+        except Exception as e:
+            print(f"批量查询标题失败: {e}")
+            return 0
+        added = 0
+        # 缓存有 batch() 时（CacheNamespace、TieredCache）合并为一个事务提交
+        with getattr(cache, 'batch', nullcontext)():
+            for name, title in resolved.items():
+                if title:
+                    cache[name] = clean_title(title)
+                    added += 1
+        print(f"获得 {added} 个翻译，共发送 {self.requests_sent} 个请求")
+        return added
+
+
+def fetch_page_titles(cache, pages, names: Iterable[str], clean: Callable[[str], str] = clean_title,
+                      fetch_concurrency: int = DEFAULT_FETCH_CONCURRENCY, processes: Optional[int] = None,
+                      desc: Optional[str] = None) -> int:
+    """逐页查询缓存中仍然没有的名称，返回新增的条数
+
+    pages 是 PageFetchService，页面经流水线下载后在进程池中读取标题，结果只在写入阶段写缓存。
+    页面不存在或没有标题时写入负缓存；下载失败的名称不写入，由调用方之后重试。
+    """
+    missing = [name for name in dict.fromkeys(names) if name and name not in cache]
+    added = 0
+
+    def write(name: str, title: Optional[str]):
+        nonlocal added
+        if title:
+            cache[name] = clean(title)
+            added += 1
+        else:
+            cache.mark_missing(name)
+
+    pipeline = FetchExtractPipeline(lambda name: pages.wiki_page(name).text, extract_title, write,
+                                    fetch_concurrency=fetch_concurrency, processes=processes, desc=desc,
+                                    batch=getattr(cache, 'batch', nullcontext))
+    pipeline.run(missing)
+    return added
+
+
+def main():
+    args = sys.argv[1:]
+    api_url = WIKI_API_URL
+    if '--api' in args:
+        index = args.index('--api')
+        api_url = args[index + 1]
+        del args[index:index + 2]
+    resolver = WikiTitleResolver(api_url)
+    for name, title in resolver.resolve(args).items():
+        print(f"{name}: {clean_title(title) if title else '（不存在）'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""原来的 PokemonWebScraper 逐项查找信息框的写法（baseline 提交中的 _get_* 方法），用于比较新旧提取结果
+
+只去掉了调试输出，查找逻辑和出错时的返回值保持原样。
+"""
+import re
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup, Tag
+
+
+def _get_type_class_and_prefix(soup):
+    try:
+        type_link = soup.find('a', title=lambda x: x and x.endswith('（属性）'))
+        if type_link:
+            type_name = type_link['title'].replace('（属性）', '')
+            type_td = type_link.find_parent('td', class_=lambda x: x and 'roundy' in x)
+            if type_td:
+                return ' '.join(type_td['class']), type_name
+    except Exception:
+        pass
+    return None, None
+
+
+def _get_category(soup) -> str:
+    try:
+        category = soup.select_one('a[href*="Category:"][title*="宝可梦"]')
+        return category.text.replace('宝可梦', '') if category else ""
+    except:
+        return ""
+
+
+def _get_abilities(poison_cells: List[Tag]) -> str:
+    try:
+        for cell in poison_cells:
+            if cell.get('width') == '50%' and not ('隐藏特性' in cell.text or '隱藏特性' in cell.text):
+                ability_links = cell.find_all('a', title=lambda x: x and x.endswith('（特性）'))
+                if ability_links:
+                    return ' 或 '.join(link['title'].replace('（特性）', '') for link in ability_links)
+    except Exception:
+        pass
+    return ""
+
+
+def _get_hidden_ability(soup) -> str:
+    try:
+        hidden_tag = soup.find('small', string=lambda x: '隱藏特性' in str(x))
+        if hidden_tag:
+            ability_link = hidden_tag.find_previous('a')
+            if ability_link:
+                return ability_link.text.strip()
+    except Exception:
+        pass
+    return ""
+
+
+def _get_catch_rate(poison_cells: List[Tag]) -> str:
+    try:
+        for cell in poison_cells:
+            explain_span = cell.find('span', class_='explain')
+            if explain_span and '%' in explain_span.text:
+                return explain_span.text.strip()
+    except Exception:
+        pass
+    return ""
+
+
+def _get_base_exp(poison_cells: List[Tag]) -> str:
+    try:
+        for cell in poison_cells:
+            if '基础经验值' in cell.text:
+                match = re.search(r'(\d+)', cell.text.strip())
+                if match:
+                    return match.group(1)
+    except Exception:
+        pass
+    return ""
+
+
+def _get_ev_yield(soup: BeautifulSoup) -> Dict[str, int]:
+    ev_stats = {'HP': 0, '攻击': 0, '防御': 0, '特攻': 0, '特防': 0, '速度': 0}
+    try:
+        ev_section = soup.find('b', string=lambda x: '取得基础点数' in str(x))
+        if ev_section:
+            ev_table = ev_section.find_parent('td').find('table', class_='roundy bgwhite fulltable')
+            if ev_table:
+                for stat in ev_stats:
+                    cell = ev_table.find('td', class_=f'roundy bw-1 bgl-{stat} bd-{stat}')
+                    if cell:
+                        numbers = re.findall(r'\d+', cell.get_text(strip=True))
+                        if numbers:
+                            ev_stats[stat] = int(numbers[-1])
+    except Exception:
+        pass
+    return ev_stats
+
+
+def _get_egg_groups(poison_cells: List[Tag]) -> Optional[str]:
+    try:
+        for cell in poison_cells:
+            if '蛋组' in cell.text:
+                return cell.text.strip()
+    except:
+        return ""
+
+
+def _get_egg_cycles(poison_cells: List[Tag]) -> str:
+    try:
+        for cell in poison_cells:
+            if '孵化周期' in cell.text:
+                numbers = re.findall(r'\d+', cell.text)
+                if len(numbers) >= 2:
+                    return f"{numbers[0]}周期（{numbers[1]}步）"
+                elif numbers:
+                    return numbers[0]
+    except Exception:
+        pass
+    return ""
+
+
+def _get_gender_ratio(soup) -> str:
+    try:
+        ratio_cell = soup.find('span', style='color:#FF6060;')
+        if ratio_cell:
+            return ratio_cell.text.strip()
+    except Exception:
+        pass
+    return ""
+
+
+def _get_pokedex_numbers(soup) -> Dict[str, str]:
+    numbers = {}
+    try:
+        region_cells = soup.find_all('td', class_=lambda x: x and x.startswith('bgl-') and 'roundyleft' in x)
+        for cell in region_cells:
+            region = cell.find('b').text
+            if region in ['关都', '城都', '丰缘', '神奥', '合众', '卡洛斯', '阿罗拉', '伽勒尔', '帕底亚']:
+                number = cell.find_next('td', class_=lambda x: x and x.startswith('bd-'))
+                if number and '#' in number.text:
+                    numbers[region] = number.text.split('#')[1].strip()
+    except:
+        pass
+    return numbers
+
+
+def extract_baseline(html: str) -> Optional[Dict]:
+    """与原来 scrape_pokemon_info 中的数据字典相同；找不到属性单元格时原来的写法会出错，返回 None"""
+    soup = BeautifulSoup(html, 'html.parser')
+    class_str, _ = _get_type_class_and_prefix(soup)
+    if not class_str:
+        return None
+    poison_cells = soup.find_all('td', class_=class_str)
+    return {
+        'category_cn': _get_category(soup),
+        'abilities_normal': _get_abilities(poison_cells),
+        'ability_hidden': _get_hidden_ability(soup),
+        'catch_rate': _get_catch_rate(poison_cells),
+        'base_exp': _get_base_exp(poison_cells),
+        'ev_yield': _get_ev_yield(soup),
+        'egg_groups': _get_egg_groups(poison_cells),
+        'egg_cycles': _get_egg_cycles(poison_cells),
+        'gender_ratio': _get_gender_ratio(soup),
+        'pokedex_numbers': _get_pokedex_numbers(soup),
+    }
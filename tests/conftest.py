@@ -0,0 +1,44 @@
+"""测试配置：与脚本运行方式相同，把 src 和各爬虫脚本所在目录加入导入路径
+
+scrapers 包的 __init__ 会导入需要 selenium 的爬虫，测试直接按脚本所在目录导入。
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT / 'src', ROOT / 'src' / 'scrapers' / 'pokemon', ROOT / 'src' / 'scrapers' / 'item'):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from utils import cache_store
+from utils.mock_server import FixtureSet, MockWikiServer
+
+FIXTURE_DIR = ROOT / 'debug'
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """在临时目录中运行：cache/、json/ 等相对路径都写到这里，进程共用的 CacheStore 也换成新的"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(cache_store, '_default_store', None)
+    yield tmp_path
+    if cache_store._default_store is not None:
+        cache_store._default_store.close()
+
+
+@pytest.fixture
+def mock_server():
+    """启动 utils.mock_server：mock_server(fixtures=None, **选项)，fixtures 默认为 debug/ 中的页面"""
+    servers = []
+
+    def start(fixtures=None, **options):
+        server = MockWikiServer(fixtures or FixtureSet(FIXTURE_DIR), **options).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
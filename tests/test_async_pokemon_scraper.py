@@ -0,0 +1,49 @@
+import time
+from pathlib import Path
+
+from async_pokemon_scraper import AsyncPokemonWebScraper
+from utils.mock_server import FixtureSet
+
+WIKI_DIR = Path(__file__).resolve().parent.parent / 'debug' / 'wiki'
+NAMES = [f'Pokemon{index}' for index in range(12)]
+
+
+def species_fixtures(root) -> FixtureSet:
+    """每个名称都返回妙蛙种子的页面"""
+    fixtures = FixtureSet(root)
+    page = (WIKI_DIR / 'Bulbasaur.html').read_bytes()
+    for name in NAMES:
+        fixtures.add(f'/wiki/{name}', page, content_type='text/html; charset=UTF-8')
+    return fixtures
+
+
+def make_scraper(server, concurrency: int) -> AsyncPokemonWebScraper:
+    scraper = AsyncPokemonWebScraper(concurrency=concurrency, base_url=f"{server.base_url}/wiki/", limiter=None)
+    # 测试中缩短 5xx 的重试退避
+    scraper.scraper.session.backoff = 0.01
+    return scraper
+
+
+def test_requests_run_concurrently(workdir, mock_server):
+    server = mock_server(species_fixtures(workdir / 'fixtures'), latency=0.3, jitter=0)
+    start = time.perf_counter()
+    results = make_scraper(server, concurrency=6).scrape_all(NAMES)
+    elapsed = time.perf_counter() - start
+
+    assert list(results) == NAMES
+    assert all(info['abilities_normal'] == '茂盛' for info in results.values())
+    # 逐个请求需要 12 × 0.3s，6 个并发约 0.6s
+    assert elapsed < len(NAMES) * 0.3 / 2
+    assert server.stats == {'200': len(NAMES)}
+
+
+def test_retries_on_429_and_5xx(workdir, mock_server):
+    # 开始的 0.5s 内全部返回 429（Retry-After: 1），之后 30% 的请求返回 503
+    server = mock_server(species_fixtures(workdir / 'fixtures'), error_rate=0.3, seed=1,
+                         burst_interval=60, burst_duration=0.5)
+    results = make_scraper(server, concurrency=4).scrape_all(NAMES)
+
+    assert all(info is not None and info['base_exp'] == '64' for info in results.values())
+    assert server.stats['429'] > 0
+    assert server.stats['503'] > 0
+    assert server.stats['200'] == len(NAMES)
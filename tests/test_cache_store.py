@@ -0,0 +1,95 @@
+import json
+import sqlite3
+
+from utils.cache_store import CacheStore
+from utils.pipeline import FetchExtractPipeline
+from utils.tiered_cache import TieredCache
+
+
+def test_write_is_committed_immediately(tmp_path):
+    path = tmp_path / 'cache.sqlite3'
+    first = CacheStore(path)
+    first.set('names', 'Pikachu', '皮卡丘')
+
+    # 另一个连接能立即读到，也能立即写入，不会因为第一个连接占着写锁而等待
+    second = sqlite3.connect(str(path), timeout=0)
+    assert second.execute('SELECT value FROM entries WHERE key = ?', ('Pikachu',)).fetchone() == ('"皮卡丘"',)
+    second.execute("INSERT INTO entries VALUES ('names', 'Eevee', '\"伊布\"', 0)")
+    second.commit()
+    second.close()
+
+    assert first.get('names', 'Eevee') == '伊布'
+    first.close()
+
+
+def test_batch_commits_at_end_of_block(tmp_path):
+    path = tmp_path / 'cache.sqlite3'
+    store = CacheStore(path)
+    other = sqlite3.connect(str(path), timeout=0)
+    with store.batch():
+        store.set('names', 'Mew', '梦幻')
+        store.set('names', 'Mewtwo', '超梦')
+        assert other.execute('SELECT COUNT(*) FROM entries').fetchone() == (0,)
+    assert other.execute('SELECT COUNT(*) FROM entries').fetchone() == (2,)
+    other.close()
+    store.close()
+    store.close()
+
+
+def test_import_json_in_batch_commits_once(tmp_path):
+    path = tmp_path / 'cache.sqlite3'
+    store = CacheStore(path)
+    other = sqlite3.connect(str(path), timeout=0)
+    for name in ('abilities', 'items'):
+        (tmp_path / f'{name}.json').write_text(json.dumps({f'{name}-1': '一', f'{name}-2': '二'}), encoding='utf-8')
+    with store.batch():
+        store.import_json('abilities', tmp_path / 'abilities.json')
+        store.import_json('items', tmp_path / 'items.json')
+        assert other.execute('SELECT COUNT(*) FROM entries').fetchone() == (0,)
+    assert other.execute('SELECT COUNT(*) FROM entries').fetchone() == (4,)
+    other.close()
+    store.close()
+
+
+def test_pipeline_writes_ready_results_in_batches(tmp_path):
+    store = CacheStore(tmp_path / 'cache.sqlite3')
+    cache = TieredCache(store.namespace('descriptions'))
+    batches = []
+
+    def batch():
+        batches.append(0)
+        return cache.batch()
+
+    def write(key, value):
+        # 写入发生在 batch() 块内，块结束前不提交
+        assert store._batch_depth == 1
+        cache[key] = value
+
+    keys = [f'key{index}' for index in range(20)]
+    FetchExtractPipeline(lambda key: key, str.upper, write, processes=0, batch=batch).run(keys)
+    assert {key: cache[key] for key in keys} == {key: key.upper() for key in keys}
+    assert 1 <= len(batches) <= len(keys)
+    assert not store._conn.in_transaction
+    store.close()
+
+
+def test_tiered_cache_iter_and_len_skip_expired(tmp_path):
+    store = CacheStore(tmp_path / 'cache.sqlite3')
+    cache = TieredCache(store.namespace('descriptions'), ttl=100, negative_ttl=10)
+    cache['fresh'] = '新'
+    cache.mark_missing('missing')
+    cache['old'] = '旧'
+    cache.mark_missing('old_missing')
+    # 直接改数据库中的更新时间，模拟过期的正常条目和负缓存
+    store._conn.execute("UPDATE entries SET updated_at = updated_at - 50 WHERE key IN ('old_missing')")
+    store._conn.execute("UPDATE entries SET updated_at = updated_at - 500 WHERE key = 'old'")
+    store._conn.commit()
+    cache._memory.clear()
+
+    stats = dict(cache.stats)
+    assert list(cache) == ['fresh', 'missing']
+    assert len(cache) == 2
+    assert cache.stats == stats
+    assert all(key in cache for key in cache)
+    assert 'old' not in cache and 'old_missing' not in cache
+    store.close()
@@ -0,0 +1,12 @@
+from utils.dataset_index import to_id
+
+
+def test_to_id_matches_showdown():
+    assert to_id('10,000,000 Volt Thunderbolt') == '10000000voltthunderbolt'
+    assert to_id("Farfetch’d") == 'farfetchd'
+    assert to_id('Mr. Mime-Galar') == 'mrmimegalar'
+
+
+def test_to_id_strips_accents():
+    assert to_id('Flabébé') == 'flabebe'
+    assert to_id('Pokémon') == 'pokemon'
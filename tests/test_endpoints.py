@@ -0,0 +1,50 @@
+"""POKEMON_WIKI_HOST / POKEMON_SHOWDOWN_HOST 在导入时读取，所以在子进程中设置后导入各模块"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCRIPT = '''
+import json
+from utils import HttpClient
+from utils.endpoints import SHOWDOWN_POKEMON_URL, WIKI_API_URL, WIKI_BASE_URL
+from utils.page_fetcher import PageFetchService
+from utils.wiki_title_resolver import WikiTitleResolver
+from pokemon_web_scraper import PokemonWebScraper
+
+session = HttpClient(limiter=None)
+result = {
+    'wiki_base_url': WIKI_BASE_URL,
+    'api_url': WikiTitleResolver().api_url,
+    'scraper_url': PokemonWebScraper(session=session).page_url('Bulbasaur'),
+    'fetcher_url': PageFetchService(session).wiki_url('Mewtwo'),
+    'page_status': PageFetchService(session).wiki_page('Mewtwo').status,
+    'abilities': PokemonWebScraper(session=session).scrape_once('Bulbasaur')['abilities_normal'],
+    'showdown_status': session.get(SHOWDOWN_POKEMON_URL + 'pikachu').status_code,
+}
+print(json.dumps(result, ensure_ascii=False))
+'''
+
+
+def test_hosts_from_environment(workdir, mock_server):
+    server = mock_server()
+    env = dict(os.environ,
+               PYTHONPATH=os.pathsep.join([str(ROOT / 'src'), str(ROOT / 'src' / 'scrapers' / 'pokemon')]),
+               POKEMON_WIKI_HOST=f"{server.base_url}/", POKEMON_SHOWDOWN_HOST=server.base_url)
+    completed = subprocess.run([sys.executable, '-c', SCRIPT], cwd=workdir, env=env, capture_output=True,
+                               text=True, encoding='utf-8', timeout=60)
+    assert completed.returncode == 0, completed.stderr
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    assert result['wiki_base_url'] == f"{server.base_url}/wiki/"
+    assert result['api_url'] == f"{server.base_url}/api.php"
+    assert result['scraper_url'] == f"{server.base_url}/wiki/Bulbasaur"
+    assert result['fetcher_url'] == f"{server.base_url}/wiki/Mewtwo"
+    assert result['page_status'] == 200
+    assert result['abilities'] == '茂盛'
+    assert result['showdown_status'] == 200
+    # 所有请求都发到了模拟服务
+    assert server.stats == {'200': 3}
@@ -0,0 +1,29 @@
+from item_description_scraper import END_HEADLINES, START_HEADLINES, extract_item_description, find_item_description
+from utils.html_parser import parse_html, slice_section
+
+PAGE = '''<html><body><div id="content"><div class="mw-parser-output">
+<p>剩饭是道具。</p>
+<h2><span class="mw-headline" id="效果">效果</span></h2>
+<p>携带后每回合回复HP。</p>
+<h3><span class="mw-headline" id="描述">描述</span></h3>
+<p>more</p>
+{end}</div></div>
+<div id="catlinks">分类：道具</div>
+<div id="footer">本页面最后修订于</div>
+</body></html>'''
+
+END_SECTION = '<h2><span class="mw-headline" id="获得方式">获得方式</span></h2>\n<p>商店</p>\n'
+
+
+def test_section_between_headlines():
+    text = PAGE.format(end=END_SECTION)
+    section = slice_section(text, START_HEADLINES, END_HEADLINES)
+    assert '携带后每回合回复HP。' in section and '获得方式' not in section
+    assert extract_item_description(text) == find_item_description(parse_html(text)) == '携带后每回合回复HP。 描述 more'
+
+
+def test_no_end_headline_parses_whole_page():
+    # 没有结束小标题时不截取，否则正文之后的分类和页脚会混进描述
+    text = PAGE.format(end='')
+    assert slice_section(text, START_HEADLINES, END_HEADLINES) is None
+    assert extract_item_description(text) == find_item_description(parse_html(text)) == '携带后每回合回复HP。 描述 more'
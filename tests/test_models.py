@@ -0,0 +1,22 @@
+from utils.models import Species, build_models
+
+
+def test_malformed_record_is_skipped():
+    records = {
+        'bulbasaur': {'num': 1, 'name': 'Bulbasaur', 'baseStats': {'hp': 45, 'atk': 49, 'def': 49,
+                                                                  'spa': 65, 'spd': 65, 'spe': 45}},
+        'broken': {'num': 'x', 'name': 'Broken'},
+        'ivysaur': {'num': 2, 'name': 'Ivysaur'},
+    }
+    species = build_models(Species, records)
+    assert [s.name for s in species] == ['Bulbasaur', 'Ivysaur']
+    assert species[0].bst == 318
+
+
+def test_missing_stats_stay_none():
+    species = Species.from_record('partial', {'num': 3, 'name': 'Partial', 'baseStats': {'hp': 80, 'atk': 82}})
+    assert species.stat('hp') == 80
+    assert species.stat('spe') is None
+    assert not species.has_all_stats
+    assert species.bst is None
+    assert Species.from_record('none', {'num': 4, 'name': 'NoStats'}).stats is None
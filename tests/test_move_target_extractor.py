@@ -0,0 +1,48 @@
+import json
+from pathlib import Path
+
+from openpyxl import Workbook, load_workbook
+
+from processors.move.move_target_extractor import MoveTargetExtractor
+
+DATA_FILE = Path(__file__).resolve().parent.parent / 'data' / 'moves.ts'
+
+
+def test_non_scalar_field_is_written_as_json(tmp_path):
+    excel_file = tmp_path / 'move_data.xlsx'
+    wb = Workbook()
+    ws = wb.active
+    ws.append(['技能名称（英文）', '优先度'])
+    ws.append(['Absorb', 0])
+    wb.save(excel_file)
+
+    extractor = MoveTargetExtractor()
+    extractor.excel_file = str(excel_file)
+    extractor.data_file = str(DATA_FILE)
+    extractor.update_excel_with_field('flags', '技能标志', '优先度')
+    extractor.update_excel_with_field('target', '技能目标', '优先度')
+
+    ws = load_workbook(excel_file).active
+    header = [cell.value for cell in ws[1]]
+    row = dict(zip(header, (cell.value for cell in ws[2])))
+    assert row['技能目标'] == 'normal'
+    assert json.loads(row['技能标志']) == extractor.get_move_attribute('Absorb', 'flags')
+    assert json.loads(row['技能标志'])['heal'] == 1
+
+
+def test_only_changed_rows_are_updated(tmp_path):
+    excel_file = tmp_path / 'move_data.xlsx'
+    wb = Workbook()
+    ws = wb.active
+    ws.append(['技能名称（英文）', '优先度', '技能目标'])
+    ws.append(['Absorb', 0, '旧值'])
+    ws.append(['Acid', 0, '旧值'])
+    wb.save(excel_file)
+
+    extractor = MoveTargetExtractor()
+    extractor.excel_file = str(excel_file)
+    extractor.data_file = str(DATA_FILE)
+    extractor.update_excel_with_target(only_names={'Acid'})
+
+    ws = load_workbook(excel_file).active
+    assert [row[2].value for row in ws.iter_rows(min_row=2)] == ['旧值', 'allAdjacentFoes']
@@ -0,0 +1,27 @@
+import threading
+
+from utils.page_store import PageStore
+
+
+def test_threads_store_identical_pages(tmp_path):
+    store = PageStore(tmp_path)
+    content = '<html>同一个页面</html>'.encode('utf-8') * 10000
+    barrier = threading.Barrier(8)
+    errors = []
+
+    def put(index: int):
+        barrier.wait()
+        try:
+            store.put(f'http://127.0.0.1/wiki/Page{index}', content)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=put, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert all(store.get(f'http://127.0.0.1/wiki/Page{index}').content == content for index in range(8))
+    assert not list(tmp_path.rglob('*.tmp'))
@@ -0,0 +1,30 @@
+import types
+
+from utils import patterns
+from utils.patterns import PatternRegistry
+from utils.ts_parser import parse_ts_export
+
+
+def test_timed_finditer_stays_lazy():
+    registry = PatternRegistry(timing=True)
+    digits = registry.register('digits', r'\d+')
+    matches = digits.finditer('a1 b22 c333')
+    assert isinstance(matches, types.GeneratorType)
+    assert next(matches).group() == '1'
+    assert [m.group() for m in matches] == ['22', '333']
+    assert digits.calls == 1
+    assert digits.elapsed_ns > 0
+
+
+def test_parser_tokens_are_timed_when_enabled():
+    patterns.PATTERNS.set_timing(True)
+    patterns.PATTERNS.reset()
+    try:
+        parse_ts_export('export const Pokedex = {bulbasaur: {num: 1, name: "Bulbasaur", types: ["Grass"]}};')
+        calls = {name: count for name, count, _ in patterns.PATTERNS.stats()}
+    finally:
+        patterns.PATTERNS.set_timing(False)
+        patterns.PATTERNS.reset()
+    assert calls['ts.key'] > 0
+    assert calls['ts.whitespace'] > 0
+    assert calls['ts.string'] > 0
@@ -0,0 +1,120 @@
+"""debug/fixtures.json 中的物种页面：PokemonInfobox 的结果与原来逐项查找的 _get_* 方法相同"""
+from pathlib import Path
+
+import pytest
+
+from baseline_pokemon_page import extract_baseline
+from utils.html_parser import parse_html
+from utils.mock_server import RECORDED_DIR_NAME, FixtureSet
+from utils.pokemon_infobox import PokemonInfobox, match_form, split_form_name
+
+FIXTURE_DIR = Path(__file__).resolve().parent.parent / 'debug'
+WIKI_DIR = FIXTURE_DIR / 'wiki'
+
+
+def wiki_fixtures():
+    """fixtures.json 中返回 200 的 wiki 页面：[(键, 文件)]"""
+    fixtures = FixtureSet(FIXTURE_DIR)
+    return [(key, entry['file']) for key, entry in sorted(fixtures.entries.items())
+            if key.startswith('/wiki/') and entry.get('status', 200) == 200]
+
+
+def load_fixture(file: str) -> str:
+    return (FIXTURE_DIR / file).read_text(encoding='utf-8')
+
+# 原来的 _get_* 方法在这两个页面上的结果
+BASELINE = {
+    'Bulbasaur': {
+        'category_cn': '种子', 'abilities_normal': '茂盛', 'ability_hidden': '叶绿素', 'catch_rate': '5.9%',
+        'base_exp': '64', 'ev_yield': {'HP': 0, '攻击': 0, '防御': 0, '特攻': 1, '特防': 0, '速度': 0},
+        'egg_groups': '蛋组怪兽组植物组', 'egg_cycles': '20周期（5140步）', 'gender_ratio': '雌性 12.5%',
+        'pokedex_numbers': {'关都': '0001', '城都': '0226', '卡洛斯': '0080'},
+    },
+    'Mewtwo': {
+        'category_cn': '基因', 'abilities_normal': '压迫感', 'ability_hidden': '紧张感', 'catch_rate': '0.4%',
+        'base_exp': '340', 'ev_yield': {'HP': 0, '攻击': 0, '防御': 0, '特攻': 3, '特防': 0, '速度': 0},
+        'egg_groups': '蛋组未发现组', 'egg_cycles': '120周期（30855步）', 'gender_ratio': '',
+        'pokedex_numbers': {'关都': '0150'},
+    },
+}
+
+
+def load_page(name: str) -> str:
+    return (WIKI_DIR / f'{name}.html').read_text(encoding='utf-8')
+
+
+def test_fields_match_baseline():
+    for name, expected in BASELINE.items():
+        assert PokemonInfobox(parse_html(load_page(name))).fields() == expected, name
+
+
+@pytest.mark.parametrize('key, file', wiki_fixtures())
+def test_same_output_as_baseline_extractor(key, file):
+    html = load_fixture(file)
+    expected = extract_baseline(html)
+    assert expected is not None, f"{key} 不是物种页面"
+    assert PokemonInfobox(parse_html(html)).fields() == expected
+
+
+REGION_CELL = '<td class="bgl-草 roundyleft" width="45%"><b>关都</b></td>'
+# 新写法与原来的写法做法不同的地方：隐藏特性取标记之前最近的链接，图鉴编号按地区单元格查找
+MARKUP_VARIANTS = {
+    'footnote_before_hidden_mark': ('叶绿素</a><small>', '叶绿素</a><sup><a href="#cite-1">[1]</a></sup><small>'),
+    'region_cell_without_name': (REGION_CELL, '<td class="bgl-草 roundyleft" width="45%">全国</td>'
+                                              '<td class="bd-草 roundyright bgwhite">#0001</td></tr><tr>' + REGION_CELL),
+    'region_not_listed': (REGION_CELL, '<td class="bgl-草 roundyleft" width="45%"><b>全国</b></td>'
+                                       '<td class="bd-草 roundyright bgwhite">#0001</td></tr><tr>' + REGION_CELL),
+    'number_without_hash': ('#0226', '0226'),
+}
+
+
+@pytest.mark.parametrize('old, new', MARKUP_VARIANTS.values(), ids=list(MARKUP_VARIANTS))
+def test_markup_variants_match_baseline(old, new):
+    html = load_page('Bulbasaur')
+    assert old in html
+    html = html.replace(old, new, 1)
+    assert PokemonInfobox(parse_html(html)).fields() == extract_baseline(html)
+
+
+def test_recorded_species_page_matches_baseline():
+    # 用 PYTHONPATH=src python -m utils.mock_server record https://wiki.52poke.com/wiki/<名称> 录制
+    recorded = [(key, file) for key, file in wiki_fixtures() if file.startswith(RECORDED_DIR_NAME)]
+    if not recorded:
+        pytest.skip("debug/fixtures.json 中还没有录制的 52poke 物种页面")
+    for key, file in recorded:
+        html = load_fixture(file)
+        assert PokemonInfobox(parse_html(html)).fields() == extract_baseline(html), key
+
+
+def test_missing_egg_groups_is_none():
+    # 与原来的 _get_egg_groups 相同，页面上没有蛋组时为 None
+    html = load_page('Bulbasaur').replace('蛋组', '')
+    assert PokemonInfobox(parse_html(html)).fields()['egg_groups'] is None
+
+
+def test_forms_on_one_page_get_their_own_fields():
+    soup = parse_html(load_page('Mewtwo'))
+    labels = PokemonInfobox(soup).form_labels()
+    assert labels == {'form1': '超梦', 'form2': '超级超梦Ｘ', 'form3': '超级超梦Ｙ'}
+    assert match_form(labels, split_form_name('Mewtwo-Mega-X')[1]) == 'form2'
+
+    base = PokemonInfobox(soup).fields()
+    mega_x = PokemonInfobox(soup, 'form2').fields()
+    mega_y = PokemonInfobox(soup, 'form3').fields()
+    assert (base['abilities_normal'], base['ability_hidden'], base['base_exp']) == ('压迫感', '紧张感', '340')
+    assert (mega_x['abilities_normal'], mega_x['ability_hidden'], mega_x['base_exp']) == ('不屈之心', '', '351')
+    assert (mega_y['abilities_normal'], mega_y['ability_hidden'], mega_y['base_exp']) == ('不眠', '', '351')
+    # 第一个形态就是基础物种本身；各形态共用的项不受影响
+    assert PokemonInfobox(soup, 'form1').fields() == base
+    assert mega_x['category_cn'] == mega_y['category_cn'] == base['category_cn']
+
+
+def test_extract_species_info_splits_forms():
+    from pokemon_web_scraper import extract_species_info
+
+    results = extract_species_info((load_page('Mewtwo'), ['Mewtwo', 'Mewtwo-Mega-X', 'Mewtwo-Mega-Y', 'Mewtwo-Gmax']))
+    assert results['Mewtwo'] == BASELINE['Mewtwo']
+    assert results['Mewtwo-Mega-X']['abilities_normal'] == '不屈之心'
+    assert results['Mewtwo-Mega-Y']['abilities_normal'] == '不眠'
+    # 页面中没有的形态为 None，由调用方请求形态自己的页面
+    assert results['Mewtwo-Gmax'] is None
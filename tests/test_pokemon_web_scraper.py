@@ -0,0 +1,17 @@
+from pokemon_web_scraper import PokemonWebScraper
+from utils import HttpClient
+
+
+def test_forms_share_one_request_to_base_page(workdir, mock_server):
+    server = mock_server()
+    scraper = PokemonWebScraper(f"{server.base_url}/wiki/", HttpClient(limiter=None))
+
+    mega_x = scraper.scrape_pokemon_info('Mewtwo-Mega-X')
+    mega_y = scraper.scrape_pokemon_info('Mewtwo-Mega-Y')
+    base = scraper.scrape_pokemon_info('Mewtwo')
+
+    assert (mega_x['abilities_normal'], mega_y['abilities_normal'], base['abilities_normal']) == ('不屈之心', '不眠', '压迫感')
+    assert mega_x['base_exp'] == mega_y['base_exp'] == '351'
+    assert base['base_exp'] == '340'
+    # 三个名称只请求了一次超梦的页面
+    assert server.stats == {'200': 1}
@@ -0,0 +1,25 @@
+from utils.models import Species
+from utils.stat_matrix import BaseStatMatrix
+
+
+def _species(key, num, name, stats):
+    base = dict(zip(('hp', 'atk', 'def', 'spa', 'spd', 'spe'), stats))
+    return Species.from_record(key, {'num': num, 'name': name, 'baseStats': base})
+
+
+def test_percentile_and_rank():
+    matrix = BaseStatMatrix.from_species([
+        _species('a', 1, 'A', (50, 50, 50, 50, 50, 100)),
+        _species('b', 2, 'B', (50, 50, 50, 50, 50, 80)),
+        _species('c', 3, 'C', (50, 50, 50, 50, 50, 100)),
+    ])
+    assert list(matrix.rank('spe')) == [1, 3, 1]
+    assert list(matrix.percentile('spe').round(1)) == [100.0, 33.3, 100.0]
+
+
+def test_empty_matrix_gives_empty_arrays():
+    matrix = BaseStatMatrix.from_species([])
+    assert len(matrix) == 0
+    assert matrix.percentile('spe').shape == (0,)
+    assert matrix.rank('spe').shape == (0,)
+    assert len(matrix.top_k({'spe': 1.0})) == 0
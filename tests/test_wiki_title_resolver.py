@@ -0,0 +1,73 @@
+import json
+
+import requests
+
+from utils import HttpClient
+from utils.mock_server import FixtureSet
+from utils.wiki_title_resolver import WikiTitleResolver
+
+# 58 个会重定向到中文页面的名称，一个需要规范化大小写的名称，一个不存在的页面
+NAMES = [f'Name{index}' for index in range(58)] + ['overgrow', 'No Such Page']
+TITLES = {**{f'Name{index}': f'名称{index}（特性）' for index in range(58)}, 'overgrow': '茂盛（特性）'}
+
+
+def api_response(titles) -> dict:
+    """按 MediaWiki query 接口（formatversion=2）的格式生成响应"""
+    query = {'normalized': [], 'redirects': [], 'pages': []}
+    for title in titles:
+        if title == 'overgrow':
+            query['normalized'].append({'from': 'overgrow', 'to': 'Overgrow'})
+            query['redirects'].append({'from': 'Overgrow', 'to': TITLES[title]})
+            query['pages'].append({'pageid': 1, 'ns': 0, 'title': TITLES[title]})
+        elif title in TITLES:
+            query['redirects'].append({'from': title, 'to': TITLES[title]})
+            query['pages'].append({'pageid': 100 + len(query['pages']), 'ns': 0, 'title': TITLES[title]})
+        else:
+            query['pages'].append({'ns': 0, 'title': title, 'missing': True})
+    return {'batchcomplete': True, 'query': query}
+
+
+def api_fixtures(root, api_url: str) -> FixtureSet:
+    """录制两个批次（50 + 10 个标题）的 api.php 响应，URL 与 WikiTitleResolver 发出的请求相同"""
+    fixtures = FixtureSet(root)
+    for start in (0, 50):
+        titles = NAMES[start:start + 50]
+        params = {'action': 'query', 'titles': '|'.join(titles), 'redirects': 1, 'converttitles': 1,
+                  'format': 'json', 'formatversion': 2}
+        url = requests.Request('GET', api_url, params=params).prepare().url
+        body = json.dumps(api_response(titles), ensure_ascii=False).encode('utf-8')
+        fixtures.add(url, body, content_type='application/json; charset=utf-8')
+    return fixtures
+
+
+def start_resolver(workdir, mock_server):
+    # 服务启动后才知道端口，先用任意主机录制：fixture_key 与主机无关
+    server = mock_server(api_fixtures(workdir / 'fixtures', 'http://127.0.0.1/api.php'))
+    return server, WikiTitleResolver(f"{server.base_url}/api.php", HttpClient(limiter=None))
+
+
+def test_resolve_in_batches_of_50(workdir, mock_server):
+    server, resolver = start_resolver(workdir, mock_server)
+    resolved = resolver.resolve(NAMES)
+
+    assert resolver.requests_sent == 2
+    assert server.stats == {'200': 2}
+    assert resolved['Name0'] == '名称0（特性）'
+    assert resolved['Name57'] == '名称57（特性）'
+    # 规范化之后再跟随重定向
+    assert resolved['overgrow'] == '茂盛（特性）'
+    assert resolved['No Such Page'] is None
+
+
+def test_fill_cache_skips_missing_titles(workdir, mock_server):
+    server, resolver = start_resolver(workdir, mock_server)
+    cache = {}
+
+    assert resolver.fill_cache(cache, NAMES) == len(NAMES) - 1
+    assert cache['overgrow'] == '茂盛'
+    assert cache['Name3'] == '名称3'
+    # 不存在的页面不写入，由调用方逐页查询
+    assert 'No Such Page' not in cache
+    # 已经缓存的名称不再查询
+    assert resolver.fill_cache(cache, NAMES[:10]) == 0
+    assert server.stats == {'200': 2}